@@ -8,15 +8,31 @@ Created on Tue Nov 19 09:56:28 2024
 from streamlit_option_menu import option_menu
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import numpy as np
-from fpdf import FPDF
-
-# Função para salvar o gráfico como imagem
-def save_image(fig, file_name):
-    fig.write_image(file_name, format="png")
+import cache_disco
+from dataset import Dataset
+from derivados import calcular
+from graficos import (grafico_consumo_produto, grafico_consumo_produto_periodo, grafico_consumo_receita,
+                      grafico_pizza_producao, grafico_producao_receita, grafico_produtos_lote,
+                      grafico_semana_hora, grafico_variacao_dosagem)
+from ingestao import carregar_dados
+from relatorio import gerar_relatorio
+from tabelas import ESTILOS_BORDAS, fora_da_faixa, tabela_paginada
+
+# Pipeline de carga memorizado entre reruns; chave é o hash do conteúdo dos arquivos
+@st.cache_data(ttl=3600, max_entries=8, show_spinner=False)
+def carregar_dados_memoizado(chave, _arquivos):
+    # Arquivos já processados anteriormente são recuperados do cache em disco
+    em_cache = cache_disco.ler(chave)
+    if em_cache is not None:
+        return em_cache
+    
+    df, dosadores, avisos = carregar_dados(_arquivos)
+    
+    # Somente envios sem erros são gravados, para que os avisos por arquivo se repitam
+    # (mensagens informativas, como duplicatas descartadas, são guardadas junto com os dados)
+    if df is not None and all(tipo == "info" for tipo, _ in avisos):
+        cache_disco.salvar(chave, df, dosadores, avisos)
+    return df, dosadores, avisos
 
 
 # Configuração inicial do app
@@ -26,9 +42,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Lista inicial para armazenar os dosadores válidos
-dosadores = []
-
 # Adicionando o logotipo da empresa centralizado com colunas
 st.sidebar.image("logoMomesso.png", width=255)
 
@@ -67,6 +80,13 @@ if st.session_state["menu"] == "Carregar Dados":
     st.header("Carregar Dados")
     st.markdown("---")
     
+    # Substituir os dados da sessão ou acrescentar novas exportações aos já carregados
+    modo_carga = st.radio(
+        "Modo de carga",
+        ["Substituir dados carregados", "Anexar aos dados carregados"],
+        horizontal=True
+    )
+    
     # Carregar múltiplos arquivos
     uploaded_files = st.file_uploader(
         "Envie seus arquivos CSV ou Excel", 
@@ -77,307 +97,78 @@ if st.session_state["menu"] == "Carregar Dados":
     # Cria um placeholder
     placeholder = st.empty()
     
-    # Dicionário de mapeamento para padronização de colunas
-    colunas_padronizadas = {
-        "Date": "data",
-        "Time": "hora_fim",
-        "Hora Inicial": "hora_ini",
-        "Hora Final": "hora_fim",
-        "Lote": "lote",
-        "Espécie": "especie",
-        "Especie": "especie",
-        "Categoria":"categoria",
-        "Cultivar": "cultivar",
-        "Peneira":"peneira",
-        "Ensaque":"ensaque",
-        "Operador":"operador",
-        "Observação": "observacao",
-        "Observacao": "observacao",
-        "Peso_Mil_Sementes": "pms",
-        "Peso de Mil Sementes": "pms",
-        "Qtd Batelada": "num_bat",
-        "Núm. Batelada": "num_bat",
-        "Núm. Bateladas": "num_bat",
-        "Receita": "receita",
-        "Receita Selecionada": "receita",
-        "Tratamento Solicitado (Kg)": "sp_total", 
-        "Sementes Tratadas (Kg)": "pv_total",
-        "Qtd Batelada": "num_bat", 
-        "SP Batelada (Kg)": "sp_bat", 
-        "PV Batelada (Kg)": "pv_bat",
-        "Tempo_Ciclo": "tmp_ciclo",
-        "Tempo de Ciclo": "tmp_ciclo",
-        "Tempo_Mistura": "tmp_mist",
-        "Tempo de Mistura": "tmp_mist",
-        "Tempo_Descarga": "tmp_desc",
-        "Tempo de Descarga": "tmp_desc"     
-    }
-    
     if uploaded_files:
-        dfs = []  # Lista para armazenar os DataFrames carregados
-        
-        placeholder.info("Processando arquivo, aguarde!")
-        
-        for uploaded_file in uploaded_files:
-            try:
-                # Verifica o tipo do arquivo e carrega
-                if uploaded_file.name.endswith(".csv"):
-                    df_load = pd.read_csv(uploaded_file)
-                elif uploaded_file.name.endswith(".xlsx"):
-                    df_load = pd.read_excel(uploaded_file)
+        arquivos = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+        chave = cache_disco.chave_arquivos(arquivos)
+        chaves_arquivos = [cache_disco.chave_arquivo(nome, conteudo) for nome, conteudo in arquivos]
+        
+        # Os mesmos arquivos já estão carregados na sessão: nada a reprocessar neste rerun
+        dataset = st.session_state.get("dataset")
+        anexar = modo_carga == "Anexar aos dados carregados" and dataset is not None
+        if anexar:
+            # O seletor mantém os arquivos enviados antes: só os que ainda não fazem parte dos dados são lidos
+            novos = [i for i, chave_arquivo in enumerate(chaves_arquivos) if chave_arquivo not in dataset.envios]
+            pendente = bool(novos)
+        else:
+            novos = list(range(len(arquivos)))
+            pendente = dataset is None or dataset.chave != chave
+        
+        if pendente:
+            placeholder.info("Processando arquivo, aguarde!")
+            
+            # No modo de anexar, somente os arquivos novos passam pela normalização e pela
+            # verificação de duplicatas contra os dados já carregados
+            arquivos_novos = [arquivos[i] for i in novos]
+            chaves_novas = [chaves_arquivos[i] for i in novos]
+            df, dosadores, avisos = carregar_dados_memoizado(cache_disco.chave_arquivos(arquivos_novos), arquivos_novos)
+            
+            if df is not None:
+                if anexar:
+                    dataset, repetidas = dataset.anexar(df, dosadores, chaves_novas)
+                    if repetidas:
+                        avisos = avisos + [("info", f"{repetidas} bateladas já carregadas anteriormente foram ignoradas.")]
                 else:
-                    st.warning(f"O arquivo {uploaded_file.name} não é um CSV ou Excel válido.")
-                    continue  # Ignora arquivos inválidos
-                                
-                # Renomear colunas com base no mapeamento
-                df_load.rename(columns=colunas_padronizadas, inplace=True)
-                
-                # Ajustar 'hora_fim' para extrair somente o horário
-                df_load["hora_fim"] = df_load["hora_fim"].dt.components.apply(
-                    lambda x: f"{x['hours']:02}:{x['minutes']:02}:{x['seconds']:02}", axis=1
-                )
-
-                # Verificar e converter colunas essenciais para o tipo correto
-                if "data" in df_load.columns:
-                    df_load["data"] = pd.to_datetime(df_load["data"], errors="coerce")
-                if "hora_ini" in df_load.columns:
-                    df_load["hora_ini"] = pd.to_datetime(df_load["hora_ini"], format="%H:%M:%S", errors="coerce")
-                if "hora_fim" in df_load.columns:
-                    df_load["hora_fim"] = pd.to_datetime(df_load["hora_fim"], format="%H:%M:%S", errors="coerce")
-
-                dfs.append(df_load)  # Adiciona o DataFrame processado à lista
-                
-            except Exception as e:
-                st.error(f"Erro ao processar o arquivo {uploaded_file.name}: {e}")
+                    dataset = Dataset(df, dosadores, chave, tuple(chaves_arquivos))
+                # Publicar os dados finalizados para as demais páginas
+                st.session_state["dataset"] = dataset
+            st.session_state["avisos_carga"] = avisos
+        
+        # Mensagens por arquivo, na ordem de envio
+        for tipo, mensagem in st.session_state.get("avisos_carga", []):
+            if tipo == "erro":
+                st.error(mensagem)
+            elif tipo == "info":
+                st.info(mensagem)
+            else:
+                st.warning(mensagem)
         
-        # Combinar todos os DataFrames
-        if dfs:
-            df = pd.concat(dfs, ignore_index=True)  
-
-            # Salvar no session_state
-            st.session_state["df"] = df
-            st.session_state['dosadores'] = dosadores
-            
+        dataset = st.session_state.get("dataset")
+        if dataset is not None and all(chave_arquivo in dataset.envios for chave_arquivo in chaves_arquivos):
             st.write("Número de arquivos carregados:", len(uploaded_files))
             
-            # Loop para verificar as colunas de SP Receita para ED01 a ED10
-            for i in range(1, 11):  # ED01 a ED10
-                # Lista de possíveis nomes de colunas para SP Receita EDxx
-                nome_colunas_sp = {
-                    f"SP Receita - ED{str(i).zfill(2)} (L)",
-                    f"SP Receita ED{str(i).zfill(2)}",
-                    f"SP Receita - ED{str(i).zfill(2)}",
-                }
-                # Verifica se alguma dessas colunas está no DataFrame
-                colunas_presentes = [col for col in nome_colunas_sp if col in df.columns]
-                if colunas_presentes:
-                    for coluna in colunas_presentes:
-                        # Renomeia para um padrão e adiciona à lista de dosadores
-                        df.rename(columns={coluna: f"SP Receita ED{str(i).zfill(2)}"}, inplace=True)
-                        if df[f"SP Receita ED{str(i).zfill(2)}"].sum() > 0:
-                            dosadores.append(f"ED{str(i).zfill(2)}")
-            # Loop para verificar as colunas de DP para DP01 a DP04
-            for i in range(1, 5):  # DP01 a DP04
-                # Lista de possíveis nomes de colunas para DPxx
-                nome_colunas_dp = {
-                    f"SP Receita - DP{str(i).zfill(2)} (Kg)",
-                    f"SP Receita DP{str(i).zfill(2)}",
-                    f"SP Receita - DP{str(i).zfill(2)}",
-                }
-                # Verifica se alguma dessas colunas está no DataFrame
-                colunas_presentes = [col for col in nome_colunas_dp if col in df.columns]
-                if colunas_presentes:
-                    for coluna in colunas_presentes:
-                        # Renomeia para um padrão e adiciona à lista de dosadores
-                        df.rename(columns={coluna: f"SP Receita DP{str(i).zfill(2)}"}, inplace=True)
-                        if df[f"SP Receita DP{str(i).zfill(2)}"].sum() > 0:
-                            dosadores.append(f"DP{str(i).zfill(2)}")
-
-            # Renomear colunas para dosadores válidos
-            for idx, dosador in enumerate(dosadores, start=1):
-                # Prefixos originais e novos nomes para cada tipo de coluna
-                colunas_renomear = {
-                    f"SP Receita - {dosador} (L)" if "ED" in dosador else f"SP Receita - {dosador} (Kg)": f"sp_rec{str(idx).zfill(2)}",
-                    f"SP Receita {dosador}" if "ED" in dosador else f"SP Receita {dosador}": f"sp_rec{str(idx).zfill(2)}",
-                    f"SP Receita - {dosador}" if "ED" in dosador else f"SP Receita - {dosador}": f"sp_rec{str(idx).zfill(2)}",
-                    #f"SP Receita - {dosador} (L)" if "ED" in dosador else f"SP Receita - {dosador} (Kg)": f"sp_rec{str(idx).zfill(2)}",
-                    f"SP Dosagem {dosador}" if "ED" in dosador else f"SP Dosagem {dosador}": f"sp_dos{str(idx).zfill(2)}",
-                    f"SP Dosagem - {dosador}" if "ED" in dosador else f"SP Dosagem - {dosador}": f"sp_dos{str(idx).zfill(2)}",
-                    f"SP Dosagem - {dosador} (L)" if "ED" in dosador else f"SP Dosagem - {dosador} (Kg)": f"sp_dos{str(idx).zfill(2)}",
-                    #f"PV Dosagem - {dosador} (L)" if "ED" in dosador else f"PV Dosagem - {dosador} (Kg)": f"pv_dos{str(idx).zfill(2)}",
-                    f"PV Dosagem {dosador}" if "ED" in dosador else f"PV Dosagem {dosador}": f"pv_dos{str(idx).zfill(2)}",
-                    f"PV Dosagem - {dosador}" if "ED" in dosador else f"PV Dosagem - {dosador}": f"pv_dos{str(idx).zfill(2)}",
-                    f"PV Dosagem - {dosador} (L)" if "ED" in dosador else f"PV Dosagem - {dosador} (Kg)": f"pv_dos{str(idx).zfill(2)}",
-                    f"Erro Dosagem - {dosador} (%)": f"erro_dos{str(idx).zfill(2)}",
-                    f"Erro Dosagem {dosador}": f"erro_dos{str(idx).zfill(2)}",
-                    f"Produto {dosador}": f"nome_prod{str(idx).zfill(2)}",
-                    f"Densidade {dosador}": f"dens_prod{str(idx).zfill(2)}",
-                    f"Densidade - {dosador}": f"dens_prod{str(idx).zfill(2)}",
-                    f"Unid medida {dosador}": f"unid_med{str(idx).zfill(2)}",
-                    f"Unid. Medida - {dosador}": f"unid_med{str(idx).zfill(2)}",
-                    f"Unid_Sementes_{dosador}": f"unid_med{str(idx).zfill(2)}"
-                }
-                # Verificar e renomear as colunas existentes no DataFrame
-                for nome_original, novo_nome in colunas_renomear.items():
-                    if nome_original in df.columns:
-                        df.rename(columns={nome_original: novo_nome}, inplace=True)
-                df[f"nome_prod{str(idx).zfill(2)}"] = df[f"nome_prod{str(idx).zfill(2)}"].astype("str")
-                df[f"sp_rec{str(idx).zfill(2)}"] = df[f"sp_rec{str(idx).zfill(2)}"].astype("float")
-                df[f"pv_dos{str(idx).zfill(2)}"] = df[f"pv_dos{str(idx).zfill(2)}"].astype("float")
-                df[f"erro_dos{str(idx).zfill(2)}"] = df[f"erro_dos{str(idx).zfill(2)}"].astype("float")    
-                df["hora_ini"] = pd.to_datetime(df["hora_ini"], format='%H:%M:%S')
-                df["hora_fim"] = pd.to_datetime(df["hora_fim"], format='%H:%M:%S')
-            
-            # Converter 'data' para o tipo datetime
-            df["data"] = pd.to_datetime(df["data"])
-                
-            # Atualizar as colunas hora_ini e hora_fim com as respectivas datas
-            df["hora_ini"] = df.apply(lambda row: row["hora_ini"].replace(year=row["data"].year,
-                                                                        month=row["data"].month,
-                                                                        day=row["data"].day), axis=1)
-            df["hora_fim"] = df.apply(lambda row: row["hora_fim"].replace(year=row["data"].year,
-                                                                        month=row["data"].month,
-                                                                        day=row["data"].day), axis=1)
-
-            # Ajustar hora_ini se hora_fim for menor
-            df["hora_ini"] = df.apply(
-                lambda row: row["hora_ini"] - pd.Timedelta(days=1) if row["hora_fim"] < row["hora_ini"] else row["hora_ini"],
-                axis=1
-            )
-            
-            # Alterar o tipo das colunas
-            df["lote"] = df["lote"].astype("str")
-            df["especie"] = df["especie"].astype("str")
-            df["categoria"] = df["categoria"].astype("str")
-            df["cultivar"] = df["cultivar"].astype("str")
-            df["peneira"] = df["peneira"].astype("str")
-            df["ensaque"] = df["ensaque"].astype("str")
-            df["operador"] = df["operador"].astype("str")
-            df["observacao"] = df["observacao"].astype("str")
-            df["receita"] = df["receita"].astype("str")
-            df["sp_total"] = df["sp_total"].astype(float)
-            df["pv_total"] = df["pv_total"].astype(float)
-            df["num_bat"] = df["num_bat"].astype(int)
-            df["sp_bat"] = df["sp_bat"].astype(float)
-            df["pv_bat"] = df["pv_bat"].astype(float)
-            df["pms"] = df["pms"].astype(float)    
-                 
-            # Iterar sobre os dosadores válidos e criar as colunas sp_dosXX
-            for idx, dosador in enumerate(dosadores, start=1):
-                # Nome das colunas relevantes
-                sp_rec_col = f"sp_rec{str(idx).zfill(2)}"
-                pv_dos_col = f"pv_dos{str(idx).zfill(2)}"
-                erro_dos_col = f"erro_dos{str(idx).zfill(2)}"
-                sp_dos_col = f"sp_dos{str(idx).zfill(2)}"
-                    
-                df[f"nome_prod{str(idx).zfill(2)}"] = df[f"nome_prod{str(idx).zfill(2)}"].astype("str")
-                df[sp_rec_col] = df[sp_rec_col].astype("float")
-                df[pv_dos_col] = df[pv_dos_col].astype("float")
-                df[erro_dos_col] = df[erro_dos_col].astype("float")
-                
-                    
-                # Verificar se as colunas necessárias existem no DataFrame
-                if sp_rec_col in df.columns and pv_dos_col in df.columns and erro_dos_col in df.columns:
-                    # Transforma a dosagem para ml se estiver em litros
-                    
-                    # Multiplicar valores de sp_rec_col por 1000 se estiverem entre 0 e 5
-                    if df[sp_rec_col].between(0, 5).any():
-                        df.loc[df[sp_rec_col].between(0, 5), sp_rec_col] *= 1000
-                    
-                    # Multiplicar valores de pv_dos_col por 1000 se estiverem entre 0 e 5
-                    if df[pv_dos_col].between(0, 5).any():
-                        df.loc[df[pv_dos_col].between(0, 5), pv_dos_col] *= 1000
-                    
-                    # Verificar se a coluna sp_dos_col existe; se não, criar com valores baseados em "pv_bat" e "sp_rec_col"
-                    if sp_dos_col not in df.columns:
-                        df[sp_dos_col] = df["pv_bat"] / 100 * df[sp_rec_col]
-                    
-                    # Verificar se valores de pv_dos_col estão fora do intervalo de 80%-120% de sp_dos_col
-                    # Caso estejam fora, substituir pelos valores de sp_dos_col
-                    if not df[pv_dos_col].between(df[sp_dos_col] * 0.8, df[sp_dos_col] * 1.2).all():
-                        df.loc[~df[pv_dos_col].between(df[sp_dos_col] * 0.8, df[sp_dos_col] * 1.2), pv_dos_col] = df[sp_dos_col]
-                                               
-                    # Garantir que a coluna 'erro_dos_col' seja numérica e substituir valores não numéricos por NaN
-                    df[erro_dos_col] = pd.to_numeric(df[erro_dos_col], errors='coerce')
-                    
-                    # Substituir NaN e Inf por 0
-                    df[erro_dos_col] = df[erro_dos_col].replace([np.inf, -np.inf, np.nan], 0)
-                    
-                    # Multiplicar pv_dos_col pelo ajuste, caso erro_dos_col esteja entre -10 e 10
-                    df.loc[df[erro_dos_col].between(-20, 20), pv_dos_col] *= (
-                        1 + df.loc[df[erro_dos_col].between(-20, 20), erro_dos_col] / 100
-                    )
-                    
-            # Criando uma nova coluna com a soma dos consumos
-            df["total_sp"] = df[[f"sp_dos{str(idx).zfill(2)}" for idx in range(1, len(dosadores)+1)]].sum(axis=1)
-                
-            # Criando uma nova coluna com a soma dos consumos
-            df["total_consumo"] = df[[f"pv_dos{str(idx).zfill(2)}" for idx in range(1, len(dosadores)+1)]].sum(axis=1)
-                
-            # Criando uma nova coluna com o tempo de ciclo
-            df['tempo_ciclo'] = (df['hora_fim'] - df['hora_ini']).dt.total_seconds()
-            
-            # Remover duplicatas com base em todas as colunas
-            df = df.drop_duplicates().reset_index(drop=True)   
-            # st.text(df.shape)
-            # st.dataframe(df)
+            # Qualidade dos dados: quantas linhas cada regra de correção alterou por dosador
+            if not dataset.correcoes.empty:
+                with st.expander("Correções aplicadas na dosagem", expanded=False):
+                    st.dataframe(dataset.correcoes)
+            # st.text(dataset.df.shape)
+            # st.dataframe(dataset.df)
             
             placeholder.success("Arquivo carregado com sucesso!")
             
         else:
+            placeholder.empty()
             st.warning("Nenhum arquivo válido foi carregado ou processado.")
     
 # Consumo
 elif st.session_state["menu"] == "Consumo":
     st.header("Consumo")
-    if 'dosadores' in  st.session_state:
-        dosadores = st.session_state['dosadores']
-    if 'df' in st.session_state:  # Verifica se o arquivo foi carregado
-        df = st.session_state['df']
-        
-        df_consumo = df.groupby('receita').agg({'total_consumo': 'sum', 'pv_bat': 'sum'}).reset_index()
-        df_consumo.rename(columns={'receita':'Receita', 'total_consumo': 'Consumo', 'pv_bat': 'Produção'}, inplace=True)
-        df_consumo['Consumo'] = df_consumo['Consumo'] / 1000
-        df_consumo['Produção'] = df_consumo['Produção'] / 1000
-        df_consumo = df_consumo.sort_values(by="Consumo", ascending=False)
+    if 'dataset' in st.session_state:  # Verifica se o arquivo foi carregado
+        dataset = st.session_state['dataset']
         
-        # Criando o gráfico de pizza
-        fig = px.pie(
-            df_consumo,
-            names="Receita",
-            values="Consumo",
-            title="Consumo por Receita",
-            color_discrete_sequence=px.colors.sequential.Oranges,
-            hole=0.3  # Gráfico do tipo donut
-            )
-        # Personalizando o conteúdo exibido ao passar o mouse
-        fig.update_traces(
-            textinfo='label+percent',  # Exibe rótulos e porcentagens
-            textfont_size=10,
-            hovertemplate=(
-                'Receita: %{label}<br>'  # Nome da receita
-                'Consumo: %{value:.2f} L<br>'  # Consumo com 2 casas decimais
-                'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
-            )
-        )
-        # Layout do gráfico
-        fig.update_layout(
-            title_x=0.4,  # Centraliza o título
-            font=dict(size=14)
-            )
+        df_consumo = calcular(dataset, "consumo_por_receita")
         
-        # Gerar o HTML da tabela estilizada
-        html_tb_cons_rec = (
-            df_consumo.style
-            .format({"Consumo": "{:.2f} L", "Produção": "{:.2f} Ton"})  # Formatação com 2 casas decimais
-            .set_table_styles([            # Estilos gerais da tabela
-                {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
-                {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
-                {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]}  # Fundo alternado
-            ])
-            .hide(axis='index')   # Remover o índice
-            .to_html()  # Converter para HTML
-        )
+        # Gráfico de pizza do consumo por receita
+        fig = grafico_consumo_receita(df_consumo)
         
         st.markdown("---")
         col1, col2 = st.columns([2, 1], gap="large")  # Ajustar proporções das colunas e espaço
@@ -389,6 +180,12 @@ elif st.session_state["menu"] == "Consumo":
             # fig.write_image("grafico_pizza.png")
             # print ("imagem OK")
         with col2:
+            # HTML da página visível da tabela estilizada
+            html_tb_cons_rec = tabela_paginada(
+                df_consumo,
+                "consumo_receita",
+                formatos={"Consumo": "{:.2f} L", "Produção": "{:.2f} Ton"},  # Formatação com 2 casas decimais
+            )
             st.markdown(f"""
                 <div style="
                     display: flex;
@@ -403,96 +200,29 @@ elif st.session_state["menu"] == "Consumo":
                     {html_tb_cons_rec}
             """, unsafe_allow_html=True)
             
-        # Criar um DataFrame contendo os nomes dos produtos e a soma do consumo
-        def criar_df_somatorio(df, dosadores):
-            # Lista para armazenar os dados agregados
-            dados_agregados = []
-            # print("Após a definição, dosadores:", dosadores)
-            # Iterar sobre os dosadores válidos
-            for idx, dosador in enumerate(dosadores, start=1):
-                # Definir os nomes das colunas relevantes
-                nome_col = f"nome_prod{str(idx).zfill(2)}"
-                pv_dos_col = f"pv_dos{str(idx).zfill(2)}"
-        
-                # Verificar se ambas as colunas existem
-                if nome_col in df.columns and pv_dos_col in df.columns:
-                    # Agrupar por produto e somar o consumo
-                    df_agrupado = df.groupby(nome_col).agg({pv_dos_col: "sum"}).reset_index()
-                    df_agrupado.rename(columns={nome_col: "Produto", pv_dos_col: "Consumo"}, inplace=True)
-        
-                    # Adicionar os dados ao conjunto final
-                    dados_agregados.append(df_agrupado)
-        
-            # Verificar se há dados para concatenar
-            if not dados_agregados:
-                st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
-                return pd.DataFrame(columns=["Produto", "Consumo"])  # Retornar DataFrame vazio
-        
-            # Concatenar todos os DataFrames em um único DataFrame
-            df_resultado = pd.concat(dados_agregados, ignore_index=True)
-        
-            # Agrupar novamente para consolidar os valores de consumo para o mesmo produto
-            df_resultado = df_resultado.groupby("Produto").agg({"Consumo": "sum"}).reset_index()
+        # Consumo por produto (somas das matrizes de dosagem, sem produtos zerados)
+        if dataset.matrizes.vazia:
+            st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
+        df_somatorio = calcular(dataset, "consumo_por_produto")
         
-            return df_resultado
-        
-        df_somatorio = criar_df_somatorio(df, dosadores)
-        
-        df_somatorio = df_somatorio.dropna()  # Remove todas as linhas com NaN em qualquer coluna
-        df_somatorio = df_somatorio[df_somatorio['Consumo'] != 0]  # Filtra linhas onde Consumo é diferente de 0
-        df_somatorio['Consumo'] = df_somatorio['Consumo'] / 1000
-        df_somatorio = df_somatorio.sort_values(by="Consumo", ascending=True)
-        
-        # Criação do gráfico de barras horizontais
-        fig1 = px.bar(
-            df_somatorio,
-            y="Produto",  # Coluna para o eixo y (nomes dos produtos)
-            x="Consumo",  # Coluna para o eixo x (valores de consumo)
-            title="Consumo por Produto",
-            orientation="h",  # Gráfico de barras horizontais
-            color="Consumo",  # A cor das barras será baseada no consumo
-            color_continuous_scale=px.colors.sequential.Oranges  # Paleta de cores laranja
-        )
-        
-        # Adicionando rótulos com valores nas barras
-        fig1.update_traces(
-            texttemplate='%{x:.0f}',  # Exibe os valores no final das barras
-            textposition='outside',  # Coloca os valores fora das barras
-            textfont_size=10
-        )
-        # Exibir o valor do consumo com até 2 casas decimais ao passar o mouse sobre a barra
-        fig1.update_traces(
-            hovertemplate='Produto: %{y}<br>Consumo: %{x:.2f} L'  # Exibe o valor do consumo com 2 casas decimais
-        )
-        
-        # Layout do gráfico
-        fig1.update_layout(
-            title_x=0.4,  # Centraliza o título
-            font=dict(size=14)
-        )
+        # Gráfico de barras do consumo por produto
+        fig1 = grafico_consumo_produto(df_somatorio)
         
         df_somatorio = df_somatorio.sort_values(by="Consumo", ascending=False)
         # Adicionar a linha com a somatória total
         total_consumo = df_somatorio["Consumo"].sum()
         
-        # Gerar o HTML da tabela estilizada
-        html_tb_cons_prod = (
-            df_somatorio.style
-            .format({"Consumo": "{:.2f} L"})  # Formatação com 2 casas decimais
-            .set_table_styles([            # Estilos gerais da tabela
-                {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
-                {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
-                {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]}  # Fundo alternado
-            ])
-            .hide(axis='index')   # Remover o índice
-            .to_html()  # Converter para HTML
-        )
-
         col1, col2 = st.columns([3, 1], gap="large")  # Ajustar proporções das colunas e espaço
         with col1:
             st.plotly_chart(fig1, use_container_width=True)
                       
         with col2:
+            # HTML da página visível da tabela estilizada
+            html_tb_cons_prod = tabela_paginada(
+                df_somatorio,
+                "consumo_produto",
+                formatos={"Consumo": "{:.2f} L"},  # Formatação com 2 casas decimais
+            )
             st.markdown(f"""
                 <div style="
                     display: flex;
@@ -513,40 +243,6 @@ elif st.session_state["menu"] == "Consumo":
                 </p>
             """, unsafe_allow_html=True)
         
-        # Função para criar o PDF com o gráfico
-        def create_pdf(image_file, pdf_file):
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-            pdf.cell(200, 10, txt="Relatório de Gráficos", ln=True, align='C')
-
-        
-            # Adicionar a imagem ao PDF
-            pdf.image(image_file, x=10, y=30, w=180)  # Ajuste as dimensões conforme necessário
-            pdf.output(pdf_file)
-            print(f"PDF {pdf_file} criado com sucesso!")
-
-        # Botão para exportar gráfico em PDF
-        if st.button("Exportar Gráfico em PDF"):
-            image_file = "grafico_pizza.png"
-            pdf_file = "relatorio_grafico.pdf"
-            
-            # Salvar gráfico como imagem
-            save_image(fig, image_file)
-            
-            # Criar o PDF
-            create_pdf(image_file, pdf_file)
-            
-            # Oferecer download no Streamlit
-            with open(pdf_file, "rb") as f:
-                st.download_button(
-                    label="Baixar PDF",
-                    data=f,
-                    file_name=pdf_file,
-                    mime="application/pdf"
-                )
-
-
         # def criar_grafico_matplotlib(df):
         #     fig, ax = plt.subplots(figsize=(8, 6))
         #     df = df.sort_values(by="Consumo", ascending=True)
@@ -625,8 +321,9 @@ elif st.session_state["menu"] == "Consumo":
 # Período
 elif st.session_state["menu"] == "Período":
     st.header("Período")
-    if 'df' in st.session_state:  # Verifica se o arquivo foi carregado
-        df = st.session_state['df']
+    if 'dataset' in st.session_state:  # Verifica se o arquivo foi carregado
+        dataset = st.session_state['dataset']
+        df = dataset.df
         # Verifique se as colunas de data e hora existem no seu DataFrame
         if 'hora_ini' in df.columns and 'hora_fim' in df.columns:
             
@@ -646,19 +343,20 @@ elif st.session_state["menu"] == "Período":
             periodo_inicio = pd.to_datetime(f"{periodo_inicio_date} {periodo_inicio_time}")
             periodo_fim = pd.to_datetime(f"{periodo_fim_date} {periodo_fim_time}")
             
-            # Filtrar os dados entre o período selecionado
-            df_filtrado = df[(df['hora_ini'] >= periodo_inicio) & (df['hora_fim'] <= periodo_fim)]
-            
+            # Período selecionado (filtro dos dados derivados)
+            filtro = dict(inicio=periodo_inicio, fim=periodo_fim)
+            st.session_state["filtro_periodo"] = filtro  # Usado pelo relatório em PDF
             # Calcular valores exibidos no relatório
-            tempo_total = df_filtrado['tempo_ciclo'].sum()
-            producao = (df_filtrado['pv_bat'].sum()/1000)
+            resumo = calcular(dataset, "resumo_periodo", **filtro)
+            tempo_total = resumo['tempo_total']
+            producao = (resumo['producao']/1000)
             if tempo_total > 0:
                 produtividade = round(producao / (tempo_total / 3600), 2)  # Em Ton/h
             else:
                 produtividade = 0.0
-            num_lotes = df_filtrado['lote'].nunique()
-            num_receitas = df_filtrado['receita'].nunique()
-            num_bateladas = len(df_filtrado)
+            num_lotes = resumo['num_lotes']
+            num_receitas = resumo['num_receitas']
+            num_bateladas = resumo['num_bateladas']
             
             # Formatar as datas e horas
             periodo_inicio_formatado = periodo_inicio.strftime('%H:%M:%S / %d-%m-%Y')
@@ -672,8 +370,8 @@ elif st.session_state["menu"] == "Período":
             # Formatando no formato horas:minutos:segundos
             tempo_total_formatado = f"{int(horas):02}:{int(minutos):02}:{int(segundos):02}"
             
-            media_bat = df_filtrado['pv_bat'].mean()
-            tempo_med_bat = df_filtrado['tempo_ciclo'].mean()
+            media_bat = resumo['media_bat']
+            tempo_med_bat = resumo['tempo_med_bat']
  
             st.markdown("---")
             st.markdown("### Informações do Período")
@@ -699,81 +397,23 @@ elif st.session_state["menu"] == "Período":
             st.markdown("---")       
             st.markdown("### Resumo do Período")
             
-            # Agrupando os dados por lote e Receita
-            df_agrupado = df_filtrado.groupby(["lote", "receita"]).agg(
-                hora_inicio=("hora_ini", "min"),
-                hora_final=("hora_fim", "max"),
-                sementes_tratadas=("pv_bat", "sum"),
-                num_bateladas=("lote", "size"),
-                qtd_necessaria=("total_sp", "sum"),
-                qtd_dosada=("total_consumo", "sum")
-            ).reset_index()
-
-            # Convertendo as unidades para toneladas (divisão por 1000)
-            df_agrupado["sementes_tratadas"] = df_agrupado["sementes_tratadas"] / 1000
-            df_agrupado["qtd_necessaria"] = df_agrupado["qtd_necessaria"] / 1000
-            df_agrupado["qtd_dosada"] = df_agrupado["qtd_dosada"] / 1000
-
-            # Calculando Variação de Dosagem (%)
-            df_agrupado["variacao_dosagem"] = ((df_agrupado["qtd_dosada"] / df_agrupado["qtd_necessaria"]) - 1) * 100
-            
-            # Formatando os valores com 2 casas decimais
-            df_agrupado["sementes_tratadas"] = df_agrupado["sementes_tratadas"].map("{:.2f}".format)
-            df_agrupado["qtd_necessaria"] = df_agrupado["qtd_necessaria"].map("{:.2f}".format)
-            df_agrupado["qtd_dosada"] = df_agrupado["qtd_dosada"].map("{:.2f}".format)
-            df_agrupado["variacao_dosagem"] = df_agrupado["variacao_dosagem"].map("{:.3f}".format)
-
-            # Formatando as colunas de hora
-            df_agrupado["hora_inicio"] = pd.to_datetime(df_agrupado["hora_inicio"]).dt.strftime("%d-%m-%Y / %H:%M:%S")
-            df_agrupado["hora_final"] = pd.to_datetime(df_agrupado["hora_final"]).dt.strftime("%H:%M:%S")
-
-            # Reordenando as colunas
-            df_agrupado = df_agrupado[[
-                "hora_inicio", "hora_final", "lote", "receita",
-                "sementes_tratadas", "num_bateladas",
-                "qtd_necessaria", "qtd_dosada", "variacao_dosagem"
-            ]]
-
-            # Renomeando colunas para exibição
-            df_agrupado.rename(columns={
-                "hora_inicio": "Início",
-                "hora_final": "Fim",
-                "lote": "Lote",
-                "receita": "Receita",
-                "sementes_tratadas": "Qtd. Tratada",
-                "num_bateladas": "Núm. Bateladas",
-                "qtd_necessaria": "Qtd. Necessária",
-                "qtd_dosada": "Qtd. Dosada",
-                "variacao_dosagem": "Variação Dosagem"
-            }, inplace=True)
-
-            # Ordenando pela coluna Início
-            df_agrupado.sort_values(by="Início", inplace=True)
-            
-            # Garantir que a coluna 'Variação Dosagem' seja numérica
-            df_agrupado['Variação Dosagem'] = pd.to_numeric(df_agrupado['Variação Dosagem'], errors='coerce')
-            df_agrupado['Qtd. Tratada'] = pd.to_numeric(df_agrupado['Qtd. Tratada'], errors='coerce')
-            
-            # Definir uma função para aplicar o estilo com base na condição
-            def colorir_linhas(row):
-                if row['Variação Dosagem'] < -5 or row['Variação Dosagem'] > 5:
-                    return ['background-color: lightsalmon'] * len(row)  # Aplica fundo vermelho a toda a linha
-                else:
-                    return [''] * len(row)  # Nenhum estilo, linha mantém o estilo original
-            # Gerar o HTML da tabela estilizada
-            html_tb_agrupado = (
-                df_agrupado.style
-                .apply(colorir_linhas, axis=1)  # Aplica a função de colorir as linhas
-                .format({"Qtd. Tratada": "{:.2f} Ton","Variação Dosagem": "{:.3f} %"})  # Formatação com 2 casas decimais
-                .set_table_styles([  # Estilos gerais da tabela
-                    {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
-                    {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
-                    {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]},  # Fundo alternado
-                    {"selector": "table", "props": [("border-collapse", "collapse"), ("width", "100%")]},  # Colapsar bordas
-                    {"selector": "td, th", "props": [("border", "1px solid #ddd"), ("padding", "8px")]},  # Adicionar bordas e padding
-                ])
-                .hide(axis='index')  # Remover o índice
-                .to_html()  # Converter para HTML
+            # Resumo por lote e receita do período
+            df_agrupado = calcular(dataset, "lotes_periodo", **filtro)
+            
+            # HTML da página visível da tabela, destacando os lotes com variação de dosagem fora de ±5%
+            html_tb_agrupado = tabela_paginada(
+                df_agrupado,
+                "resumo_periodo",
+                formatos={
+                    "Início": "{:%d-%m-%Y / %H:%M:%S}",
+                    "Fim": "{:%H:%M:%S}",
+                    "Qtd. Tratada": "{:.2f} Ton",
+                    "Qtd. Necessária": "{:.2f}",
+                    "Qtd. Dosada": "{:.2f}",
+                    "Variação Dosagem": "{:.3f} %",
+                },
+                estilos=ESTILOS_BORDAS,
+                destaque=fora_da_faixa(df_agrupado['Variação Dosagem'])
             )
             
             # Exibindo a tabela estilizada no Streamlit
@@ -792,64 +432,14 @@ elif st.session_state["menu"] == "Período":
             """, unsafe_allow_html=True)
             
            
-            # Garantir que 'Variação Dosagem' seja numérico
-            df_agrupado['Variação Dosagem'] = pd.to_numeric(df_agrupado['Variação Dosagem'], errors='coerce')
 
-            # Criando o gráfico de linha
-            plt.figure(figsize=(10, 2))
-            
-            # Plotando a linha de variação de dosagem
-            plt.plot(df_agrupado['Início'], df_agrupado['Variação Dosagem'], color='darkorange', linewidth=2)
-            
-            # Adicionando círculos em cada amostragem
-            plt.scatter(df_agrupado['Início'], df_agrupado['Variação Dosagem'], color='darkorange', zorder=5)
-
-            # Adicionando linhas pivot
-            plt.axhline(y=5, color='lightcoral', linestyle='--', linewidth=1)
-            plt.axhline(y=-5, color='lightcoral', linestyle='--', linewidth=1)
-            
-            # Definindo limites dinâmicos do eixo Y
-            min_dosagem = df_agrupado['Variação Dosagem'].min()
-            max_dosagem = df_agrupado['Variação Dosagem'].max()
-            
-            # Ajustando o limite inferior e superior do eixo Y
-            if min_dosagem < -5.5:
-                y_min = min_dosagem - 3
-            else:
-                y_min = -5.5
-            
-            if max_dosagem > 5.5:
-                y_max = max_dosagem + 3
-            else:
-                y_max = 5.5
-            
-            # Ajustando o limite do eixo Y com base nos valores calculados
-            plt.ylim(y_min, y_max)
-            # Ajustando o título e os rótulos dos eixos
-            #plt.title('Variação de Dosagem por lote', fontsize=10, loc='center')
-            #plt.xlabel('Período', fontsize=10)
-            #plt.ylabel('Variação', fontsize=10)
-            
-            # Ocultando os valores do eixo X e Y
-            plt.xticks([])  # Remove os valores do eixo X
-            plt.yticks([])  # Define as marcas do eixo Y entre -5 e 5
-            
-            # Adicionando uma linha central em 0
-            plt.axhline(y=0, color='lightgrey', linewidth=1)
-            
-            # Exibindo o gráfico sem borda em volta
-            plt.gca().spines['top'].set_visible(False)
-            plt.gca().spines['right'].set_visible(False)
-            plt.gca().spines['left'].set_visible(False)
-            plt.gca().spines['bottom'].set_visible(False)
-            
+            # Gráfico da variação de dosagem por lote (faixas de ±5% e lotes fora da faixa)
+            fig = grafico_variacao_dosagem(df_agrupado)
             
             # Exibindo o gráfico
             st.markdown("---")       
             st.markdown("### Variação de Dosagem")
-            plt.grid(True, axis='x', linestyle='--', alpha=0.6)
-            plt.tight_layout()
-            st.pyplot(plt)
+            st.plotly_chart(fig, use_container_width=True)
            
         else:
             st.warning("As colunas 'Data' e/ou 'Hora' não foram encontradas no DataFrame.")
@@ -859,25 +449,28 @@ elif st.session_state["menu"] == "Período":
 # lote
 elif st.session_state["menu"] == "Lote":
     st.header("Lote")
-    if 'dosadores' in  st.session_state:
-        dosadores = st.session_state['dosadores']
-    if 'df' in st.session_state:  # Verifica se o arquivo foi carregado
-        df = st.session_state['df']
+    if 'dataset' in st.session_state:  # Verifica se o arquivo foi carregado
+        dataset = st.session_state['dataset']
         
         # Criando colunas de seleção para lote e Receita
         col1, col2 = st.columns(2)
         
+        # Índice lote -> receita -> bateladas, montado uma vez por conjunto de dados
+        indice = dataset.indice_lotes
+        
         with col1:
-            col_nome = st.selectbox("Selecione o lote", df['lote'].unique())
+            col_nome = st.selectbox("Selecione o lote", indice.lotes)
         
         # Filtrando as receitas com base no lote selecionado
-        receitas_filtradas = df[df['lote'] == col_nome]['receita'].unique()
+        receitas_filtradas = indice.receitas(col_nome)
         
         with col2:
             col_valor = st.selectbox("Selecione a Receita", receitas_filtradas)
         
-        # Filtrar o DataFrame original com base nas escolhas do usuário
-        df_filtrado = df[(df['lote'] == col_nome) & (df['receita'] == col_valor)]
+        # Bateladas do lote/receita escolhidos (filtro dos dados derivados)
+        filtro = dict(lote=col_nome, receita=col_valor)
+        st.session_state["filtro_lote"] = filtro  # Usado pelo relatório em PDF
+        df_filtrado = calcular(dataset, "bateladas_lote", **filtro)
         
         if not df_filtrado.empty:
             # Exibir os cartões com informações principais
@@ -895,17 +488,18 @@ elif st.session_state["menu"] == "Lote":
             col6.metric("Cultivar", df_filtrado['cultivar'].iloc[0])
 
             # Calculando e exibindo o resumo
-            data_inicio = df_filtrado['hora_ini'].min()
-            data_fim = df_filtrado['hora_fim'].max()
-            tempo_total = df_filtrado['tempo_ciclo'].sum()
-            producao = (df_filtrado['pv_bat'].sum()/1000)
+            resumo = calcular(dataset, "resumo_lote", **filtro)
+            data_inicio = resumo['inicio']
+            data_fim = resumo['fim']
+            tempo_total = resumo['tempo_total']
+            producao = (resumo['producao']/1000)
             if tempo_total > 0:
                 produtividade = round(producao / (tempo_total / 3600), 2)  # Em Ton/h
             else:
                 produtividade = 0.0
-            num_bateladas = len(df_filtrado)
-            media_bat = df_filtrado['pv_bat'].mean()
-            tempo_med_bat = df_filtrado['tempo_ciclo'].mean()
+            num_bateladas = resumo['num_bateladas']
+            media_bat = resumo['media_bat']
+            tempo_med_bat = resumo['tempo_med_bat']
             tempo_corrido = data_fim - data_inicio
 
             # Obtendo dias, horas, minutos e segundos
@@ -954,121 +548,32 @@ elif st.session_state["menu"] == "Lote":
 
             
 
-            def criar_df_somatorio(df_filtrado, dosadores):
-                # Calcular a somatória da coluna 'pv_bat' no DataFrame filtrado
-                soma_pv_bat = df_filtrado["pv_bat"].sum()
-                
-                # Verificar se a somatória é válida (não zero para evitar divisão por zero)
-                if soma_pv_bat == 0:
-                    st.warning("A quantidade de sementes tratadas é zero. Não é possível calcular a Receita.")
-                    return pd.DataFrame(columns=["Produto", "Necessário", "Total Dosado", "Receita", "Dose", "Variação"])
-
-                # Lista para armazenar os dados agregados
-                dados_agregados = []
-                
-                # Iterar sobre os dosadores válidos
-                for idx, dosador in enumerate(dosadores, start=1):
-                    # Definir os nomes das colunas relevantes
-                    nome_col = f"nome_prod{str(idx).zfill(2)}"
-                    sp_dos_col = f"sp_dos{str(idx).zfill(2)}"
-                    pv_dos_col = f"pv_dos{str(idx).zfill(2)}"
-            
-                    # Verificar se ambas as colunas existem
-                    if nome_col in df.columns and sp_dos_col in df.columns and pv_dos_col in df.columns:
-                        # Agrupar por produto e somar o consumo
-                        df_agrupado = df_filtrado.groupby(nome_col).agg({
-                            sp_dos_col: ["sum"],  # Soma e média para SP dosagem
-                            pv_dos_col: ["sum"]  # Soma e média para PV dosagem
-                        }).reset_index()
-                                                
-                        # Ajustar os nomes das colunas
-                        df_agrupado.columns = ["Produto", "Necessário", "Total Dosado"]
-                        
-                        # Adicionar os dados ao conjunto final
-                        dados_agregados.append(df_agrupado)
-            
-                # Verificar se há dados para concatenar
-                if not dados_agregados:
-                    st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
-                    return pd.DataFrame(columns=["Produto", "Necessário", "Total Dosado", "Receita", "Dose", "Variação"])
-
-                # Concatenar todos os DataFrames em um único DataFrame
-                df_resultado = pd.concat(dados_agregados, ignore_index=True)
-            
-                # Consolidar os valores de consumo para o mesmo produto
-                df_resultado = df_resultado.groupby("Produto").agg({
-                    "Necessário": "sum",
-                    "Total Dosado": "sum",
-                }).reset_index()
-                
-                # Adicionar a coluna de Variação
-                df_resultado["Receita"] = (df_resultado["Necessário"] / soma_pv_bat)*100
-                df_resultado["Dose"] = (df_resultado["Total Dosado"] / soma_pv_bat)*100
-                df_resultado["Variação"] = ((df_resultado["Total Dosado"] / df_resultado["Necessário"])-1)*100
-
-                return df_resultado
-            
-            df_somatorio = criar_df_somatorio(df_filtrado, dosadores)
-            
-            df_somatorio = df_somatorio.dropna()  # Remove todas as linhas com NaN em qualquer coluna
-            df_somatorio = df_somatorio[df_somatorio['Necessário'] != 0]  # Filtra linhas onde Consumo é diferente de 0
-            df_somatorio['Necessário'] = df_somatorio['Necessário'] / 1000
-            df_somatorio['Total Dosado'] = df_somatorio['Total Dosado'] / 1000
-            df_somatorio = df_somatorio.sort_values(by="Necessário", ascending=True)
+            # Necessário, dosado, receita, dose e variação por produto do lote/receita
+            if resumo['producao'] == 0:
+                st.warning("A quantidade de sementes tratadas é zero. Não é possível calcular a Receita.")
+            elif dataset.matrizes.vazia:
+                st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
+            df_somatorio = calcular(dataset, "produtos_lote", **filtro)
             
             
             #sp receita, pv dosagem ml/100 kg, variação
             
             
-            # Criando o gráfico de barras verticais
-            fig1 = px.bar(
-                df_somatorio,
-                x="Produto",  # Coluna para o eixo x
-                y=["Necessário", "Total Dosado"],  # Colunas para o eixo y
-                title="Consumo por Produto",
-                barmode="group",  # Barras agrupadas para comparar as variáveis
-                labels={"value": "Volume (L)", "variable": "Tipo"},  # Personalizar os rótulos dos eixos
-                color_discrete_map={"Total Dosado": "darkorange", "Necessário": "peachpuff"}  # Definir as cores para as categorias
-            )
-            
-            # Adicionando rótulos com valores nas barras
-            fig1.update_traces(
-                texttemplate='%{y:.3f}',  # Exibe os valores no final das barras
-                textposition='outside',  # Coloca os valores fora das barras
-                textfont_size=10
-            )
-            # Exibir o valor do consumo com até 2 casas decimais ao passar o mouse sobre a barra
-            fig1.update_traces(
-                hovertemplate='Produto: %{x}<br>Volume (L): %{y:.3f}'  # Exibe o valor do consumo com 2 casas decimais
-            )
-            
-            # Layout do gráfico
-            fig1.update_layout(
-                title_x=0.4,  # Centraliza o título
-                xaxis_title="Produto",  # Rótulo do eixo x
-                yaxis_title="Volume (L)",  # Rótulo do eixo y
-                font=dict(size=14),  # Configuração de fonte
-                legend_title_text="Volume Dosado"  # Título da legenda
-            )
+            # Gráfico de barras do necessário x dosado por produto
+            fig1 = grafico_produtos_lote(df_somatorio)
             
             # Adicionar a linha com a somatória total
             total_consumo = df_somatorio["Total Dosado"].sum()
             dose_media = df_somatorio["Dose"].sum()
             
-            # Gerar o HTML da tabela estilizada
-            html_tb_cons_prod = (
-                df_somatorio.style
-                .format({"Necessário": "{:.3f} L", "Total Dosado": "{:.3f} L", "Receita": "{:.1f} ml/100Kg", "Dose": "{:.1f} ml/100Kg", "Variação": "{:.3f} %"})  # Formatação com 2 casas decimais
-                .set_table_styles([            # Estilos gerais da tabela
-                    {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
-                    {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
-                    {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]}  # Fundo alternado
-                ])
-                .hide(axis='index')   # Remover o índice
-                .to_html()  # Converter para HTML
-            )
-
             st.plotly_chart(fig1, use_container_width=True)
+            
+            # HTML da página visível da tabela estilizada
+            html_tb_cons_prod = tabela_paginada(
+                df_somatorio,
+                "produtos_lote",
+                formatos={"Necessário": "{:.3f} L", "Total Dosado": "{:.3f} L", "Receita": "{:.1f} ml/100Kg", "Dose": "{:.1f} ml/100Kg", "Variação": "{:.3f} %"},
+            )
             st.markdown(f"""
                 <div style="
                     display: flex;
@@ -1104,6 +609,25 @@ elif st.session_state["menu"] == "Lote":
 
         else:
             st.warning("Nenhum dado encontrado para as seleções.")
+        
+        # Tabela do lote para todos os lotes/receitas, calculada de uma vez e exportada em um arquivo
+        st.markdown("---")
+        st.markdown("### Todos os Lotes")
+        formato = st.radio("Formato do arquivo", ["Excel", "Parquet"], horizontal=True)
+        if st.button("Exportar todos os lotes"):
+            if formato == "Excel":
+                arquivo = calcular(dataset, "planilha_todos_lotes")
+                nome, mime = "lotes.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            else:
+                arquivo = calcular(dataset, "parquet_todos_lotes")
+                nome, mime = "lotes.parquet", "application/octet-stream"
+            st.download_button(
+                label="Baixar arquivo",
+                data=arquivo,
+                file_name=nome,
+                mime=mime,
+                on_click="ignore"
+            )
             
     else:
         st.warning("Por favor, carregue um arquivo primeiro.")
@@ -1111,10 +635,9 @@ elif st.session_state["menu"] == "Lote":
 # Produção
 elif st.session_state["menu"] == "Produção":
     st.header("Dashboard Produção")
-    if 'dosadores' in  st.session_state:
-        dosadores = st.session_state['dosadores']
-    if 'df' in st.session_state:  # Verifica se o arquivo foi carregado
-        df = st.session_state['df']
+    if 'dataset' in st.session_state:  # Verifica se o arquivo foi carregado
+        dataset = st.session_state['dataset']
+        df = dataset.df
         # Verifique se as colunas de data e hora existem no seu DataFrame
         if 'hora_ini' in df.columns and 'hora_fim' in df.columns:
             with st.expander("Filtrar por Data", expanded=False):  # Pode ajustar 'expanded' para True ou False    
@@ -1136,18 +659,20 @@ elif st.session_state["menu"] == "Produção":
             periodo_fim = pd.to_datetime(f"{periodo_fim_date} {periodo_fim_time}")
             
             # Filtrar os dados entre o período selecionado
-            df_filtrado = df[(df['hora_ini'] >= periodo_inicio) & (df['hora_fim'] <= periodo_fim)]
+            filtro = dict(inicio=periodo_inicio, fim=periodo_fim)
+            st.session_state["filtro_periodo"] = filtro  # Usado pelo relatório em PDF
             
             # Calcular valores exibidos no relatório
-            tempo_total = df_filtrado['tempo_ciclo'].sum()
-            producao = (df_filtrado['pv_bat'].sum()/1000)
+            resumo = calcular(dataset, "resumo_periodo", **filtro)
+            tempo_total = resumo['tempo_total']
+            producao = (resumo['producao']/1000)
             if tempo_total > 0:
                 produtividade = round(producao / (tempo_total / 3600), 2)  # Em Ton/h
             else:
                 produtividade = 0.0
-            num_lotes = df_filtrado['lote'].nunique()
-            num_receitas = df_filtrado['receita'].nunique()
-            num_bateladas = len(df_filtrado)
+            num_lotes = resumo['num_lotes']
+            num_receitas = resumo['num_receitas']
+            num_bateladas = resumo['num_bateladas']
             
             # Formatar as datas e horas
             periodo_inicio_formatado = periodo_inicio.strftime('%d-%m-%Y')
@@ -1167,8 +692,8 @@ elif st.session_state["menu"] == "Produção":
                 </p>
             """, unsafe_allow_html=True)
             
-            media_bat = df_filtrado['pv_bat'].mean()
-            tempo_med_bat = df_filtrado['tempo_ciclo'].mean()
+            media_bat = resumo['media_bat']
+            tempo_med_bat = resumo['tempo_med_bat']
  
             st.markdown("---")
                 
@@ -1231,148 +756,20 @@ elif st.session_state["menu"] == "Produção":
 
             st.markdown("---")       
             
-            df_filtrado['pv_bat']=df_filtrado['pv_bat']/1000
-            
-            # Criando o gráfico de pizza Produção x Operador
-            fig = px.pie(
-                df_filtrado,
-                names="operador",
-                values="pv_bat",
-                title="Produção x Operador",
-                color_discrete_sequence=px.colors.sequential.Oranges,
-                hole=0.3  # Gráfico do tipo donut
-                )
-            # Personalizando o conteúdo exibido ao passar o mouse
-            fig.update_traces(
-                textinfo='label+percent',  # Exibe rótulos e porcentagens
-                textfont_size=10,
-                hovertemplate=(
-                    'Operador: %{label}<br>'  # Nome da receita
-                    'Produção: %{value:.2f} Ton<br>'  # Consumo com 2 casas decimais
-                    'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
-                )
-            )
-            # Layout do gráfico
-            fig.update_layout(
-                title_x=0.2,  # Centraliza o título
-                font=dict(size=14)
-                )
-            
-           
-            
-            # Criando o gráfico de pizza Produção x Ensaque
-            fig1 = px.pie(
-                df_filtrado,
-                names="ensaque",
-                values="pv_bat",
-                title="Produção x Ensaque",
-                color_discrete_sequence=px.colors.sequential.Oranges,
-                hole=0.3  # Gráfico do tipo donut
-                )
-            # Personalizando o conteúdo exibido ao passar o mouse
-            fig1.update_traces(
-                textinfo='label+percent',  # Exibe rótulos e porcentagens
-                textfont_size=10,
-                hovertemplate=(
-                    'Ensaque: %{label}<br>'  # Nome da receita
-                    'Produção: %{value:.2f} Ton<br>'  # Consumo com 2 casas decimais
-                    'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
-                )
-            )
-            # Layout do gráfico
-            fig1.update_layout(
-                title_x=0.2,  # Centraliza o título
-                font=dict(size=14)
-                )
-            
-            # Criando o gráfico de pizza Produção x especie
-            fig2 = px.pie(
-                df_filtrado,
-                names="especie",
-                values="pv_bat",
-                title="Produção x Espécie",
-                color_discrete_sequence=px.colors.sequential.Oranges,
-                hole=0.3  # Gráfico do tipo donut
-                )
-            # Personalizando o conteúdo exibido ao passar o mouse
-            fig2.update_traces(
-                textinfo='label+percent',  # Exibe rótulos e porcentagens
-                textfont_size=10,
-                hovertemplate=(
-                    'especie: %{label}<br>'  # Nome da receita
-                    'Produção: %{value:.2f} Ton<br>'  # Consumo com 2 casas decimais
-                    'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
-                )
-            )
-            # Layout do gráfico
-            fig2.update_layout(
-                title_x=0.2,  # Centraliza o título
-                font=dict(size=14)
-                )
-            
-            # Criando o gráfico de pizza Produção x Peneira
-            fig3 = px.pie(
-                df_filtrado,
-                names="peneira",
-                values="pv_bat",
-                title="Produção x Peneira",
-                color_discrete_sequence=px.colors.sequential.Oranges,
-                hole=0.3  # Gráfico do tipo donut
-                )
-            # Personalizando o conteúdo exibido ao passar o mouse
-            fig3.update_traces(
-                textinfo='label+percent',  # Exibe rótulos e porcentagens
-                textfont_size=10,
-                hovertemplate=(
-                    'Peneira: %{label}<br>'  # Nome da receita
-                    'Produção: %{value:.2f} Ton<br>'  # Consumo com 2 casas decimais
-                    'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
-                )
-            )
-            # Layout do gráfico
-            fig3.update_layout(
-                title_x=0.2,  # Centraliza o título
-                font=dict(size=14)
-                )
-            
-            # Soma dos valores de produção por receita
-            df_filtrado_agrupado = df_filtrado.groupby("receita", as_index=False)["pv_bat"].sum()
+            # Produção em Ton por operador, ensaque, espécie, peneira e receita (uma única agregação)
+            producao = calcular(dataset, "producao_por_dimensao", **filtro)
             
-            # Classificando os dados em ordem crescente pela coluna 'pv_bat' (Produção)
-            df_filtrado_agrupado = df_filtrado_agrupado.sort_values(by="pv_bat", ascending=True)
-
-            # Criar uma lista de tons de laranja
-            orange_scale = px.colors.sequential.Oranges
+            # Gráficos de pizza da produção por operador, ensaque, espécie e peneira
+            fig = grafico_pizza_producao(producao["operador"], "operador", "Produção x Operador", "Operador")
+            fig1 = grafico_pizza_producao(producao["ensaque"], "ensaque", "Produção x Ensaque", "Ensaque")
+            fig2 = grafico_pizza_producao(producao["especie"], "especie", "Produção x Espécie", "especie")
+            fig3 = grafico_pizza_producao(producao["peneira"], "peneira", "Produção x Peneira", "Peneira")
             
-            # Mapeando as receitas para tons de laranja
-            unique_receitas = df_filtrado_agrupado["receita"].unique()
-            color_map = {receita: orange_scale[i % len(orange_scale)] for i, receita in enumerate(unique_receitas)}
+            # Soma dos valores de produção por receita, em ordem crescente
+            df_filtrado_agrupado = calcular(dataset, "producao_por_receita", **filtro)
 
-            # Criação do gráfico de barras verticais com tons de laranja por receita
-            fig4 = px.bar(
-                df_filtrado_agrupado,
-                x="receita",  # Eixo X será a Receita
-                y="pv_bat",  # Eixo Y será a soma da Produção
-                title="Produção x Receita",
-                color="receita",  # As cores serão baseadas na Receita
-                color_discrete_map=color_map  # Mapeamento de cores sequenciais
-            )
-            
-            # Adicionando rótulos com valores nas barras
-            fig4.update_traces(
-                texttemplate='%{y:.2f}',  # Exibe os valores com 2 casas decimais no topo das barras
-                textposition='outside',  # Coloca os rótulos fora das barras
-                hovertemplate='Receita: %{x}<br>Produção: %{y:.2f} Ton'  # Personaliza o texto ao passar o mouse
-            )
-            
-            # Layout do gráfico
-            fig4.update_layout(
-                title_x=0.3,  # Centraliza o título
-                font=dict(size=14),
-                xaxis_title="receita",  # Título do eixo X
-                yaxis_title="Produção",  # Altera o título do eixo Y
-                margin=dict(t=30)  # Aumenta a margem superior para dar mais espaço para os rótulos
-            )
+            # Gráfico de barras da produção por receita
+            fig4 = grafico_producao_receita(df_filtrado_agrupado)
 
             col1, col2, col3 = st.columns(3)  
 
@@ -1391,145 +788,39 @@ elif st.session_state["menu"] == "Produção":
                 st.plotly_chart(fig4, use_container_width=True)
                 
             #Grafico de calor de produção por dias da semana
-            # Extração de hora e dia da semana
-            df_filtrado['hora'] = df['hora_fim'].dt.hour
-            df_filtrado['dia_semana'] = df['hora_fim'].dt.weekday  # 0 = segunda-feira, 1 = terça-feira, ...
+            # Produção por dia da semana e hora (pela hora de término ou repartida pelo intervalo de cada batelada)
+            dividir = st.checkbox("Distribuir a produção de cada batelada pelas horas do seu intervalo")
+            df_semana_hora = calcular(dataset, "producao_semana_hora_intervalos" if dividir else "producao_semana_hora", **filtro)
             
-            # Agrupar os dados por hora e dia da semana para somar a produção
-            df_week = df_filtrado.groupby(['dia_semana', 'hora']).agg({'pv_bat': 'sum'}).reset_index()
-            
-            # Obter valores mínimo e máximo de hora
-            hora_min = df_week['hora'].min()
-            hora_max = df_week['hora'].max()
-
-            # Preencher os valores ausentes com zero para garantir que todas as combinações de hora e dia apareçam
-            dias_semana = list(range(7))  # 0 = segunda-feira, ..., 6 = domingo
-            horas_do_dia = list(range(hora_min, hora_max + 1))  # De hora_min até hora_max (incluindo o último valor)
-            
-            # Criar uma multi-index que contém todas as combinações possíveis de dia_semana e hora
-            df_completo = pd.MultiIndex.from_product([dias_semana, horas_do_dia], names=['dia_semana', 'hora'])
-            
-            # Reindexar para garantir que todas as combinações de dia e hora apareçam, preenchendo com 0 caso faltem dados
-            df_week_completo = df_week.set_index(['dia_semana', 'hora']).reindex(df_completo, fill_value=0).reset_index()
-            
-            # Criar o gráfico de heatmap usando Plotly
-            fig6 = go.Figure(data=go.Heatmap(
-                z=df_week_completo['pv_bat'],  # Valores de produção
-                x=df_week_completo['dia_semana'],  # Dias da semana (0 = segunda-feira, ..., 6 = domingo)
-                y=df_week_completo['hora'],  # Horas do dia (hora_min até hora_max)
-                colorscale='Oranges',  # Escala de cores em tons de laranja
-                hovertemplate='<b>Dia da Semana:</b> %{x}<br><b>Hora:</b> %{y}:00<br><b>Produção:</b> %{z:.2f} Ton<extra></extra>',  # Customizar o texto ao passar o mouse
-                showscale=False  # Remover a barra lateral de graduação de cor
-            ))
-            
-            # Ajuste do layout
-            fig6.update_layout(
-                xaxis=dict(tickmode='array', tickvals=list(range(7)), ticktext=["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]),  # Marcar os dias da semana
-                yaxis=dict(tickmode='array', tickvals=list(range(hora_min, hora_max + 1)), ticktext=[f"{i}:00" for i in range(hora_min, hora_max + 1)]),  # Mostrar apenas as horas no intervalo
-                title="Produção em Horas x Dias da Semana",
-                title_x=0.37,  # Centraliza o título
-                font=dict(size=14),
-                xaxis_title="Dia da Semana",
-                yaxis_title="Hora do Dia",
-                plot_bgcolor='white',  # Fundo branco do gráfico
-                paper_bgcolor='white',  # Fundo branco da área externa do gráfico
-            )
+            # Mapa de calor da produção por hora x dia da semana
+            fig6 = grafico_semana_hora(df_semana_hora)
             
             # Exibir o gráfico no Streamlit
             st.plotly_chart(fig6, use_container_width=True)
             
             #Grafico de consumo
-            # Criar um DataFrame contendo os nomes dos produtos e a soma do consumo
-            def criar_df_somatorio(df_filtrado, dosadores):
-                # Lista para armazenar os dados agregados
-                dados_agregados = []
-                # print("Após a definição, dosadores:", dosadores)
-                # Iterar sobre os dosadores válidos
-                for idx, dosador in enumerate(dosadores, start=1):
-                    # Definir os nomes das colunas relevantes
-                    nome_col = f"nome_prod{str(idx).zfill(2)}"
-                    pv_dos_col = f"pv_dos{str(idx).zfill(2)}"
-            
-                    # Verificar se ambas as colunas existem
-                    if nome_col in df_filtrado.columns and pv_dos_col in df_filtrado.columns:
-                        # Agrupar por produto e somar o consumo
-                        df_agrupado = df_filtrado.groupby(nome_col).agg({pv_dos_col: "sum"}).reset_index()
-                        df_agrupado.rename(columns={nome_col: "Produto", pv_dos_col: "Consumo"}, inplace=True)
-            
-                        # Adicionar os dados ao conjunto final
-                        dados_agregados.append(df_agrupado)
-            
-                # Verificar se há dados para concatenar
-                if not dados_agregados:
-                    st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
-                    return pd.DataFrame(columns=["Produto", "Consumo"])  # Retornar DataFrame vazio
-            
-                # Concatenar todos os DataFrames em um único DataFrame
-                df_resultado = pd.concat(dados_agregados, ignore_index=True)
-            
-                # Agrupar novamente para consolidar os valores de consumo para o mesmo produto
-                df_resultado = df_resultado.groupby("Produto").agg({"Consumo": "sum"}).reset_index()
-            
-                return df_resultado
-            
-            df_somatorio = criar_df_somatorio(df_filtrado, dosadores)
-            
-            df_somatorio = df_somatorio.dropna()  # Remove todas as linhas com NaN em qualquer coluna
-            df_somatorio = df_somatorio[df_somatorio['Consumo'] != 0]  # Filtra linhas onde Consumo é diferente de 0
-            df_somatorio['Consumo'] = df_somatorio['Consumo'] / 1000
-            df_somatorio = df_somatorio.sort_values(by="Consumo", ascending=True)
-            
-            # Mapeamento de cores para os produtos
-            unique_produtos = df_somatorio["Produto"].unique()
-            color_map1 = {produto: orange_scale[i % len(orange_scale)] for i, produto in enumerate(unique_produtos)}
-            
-            # Criação do gráfico de barras verticais
-            fig5 = px.bar(
-                df_somatorio,
-                x="Produto",  # Eixo X será o nome do Produto
-                y="Consumo",  # Eixo Y será o consumo
-                title="Consumo x Produto",
-                color="Produto",  # A cor será baseada no Produto
-                color_discrete_map=color_map1  # Mapeamento de cores
-            )
-            
-            # Adicionando rótulos com valores nas barras
-            fig5.update_traces(
-                texttemplate='%{y:.2f}',  # Exibe os valores com 2 casas decimais no topo das barras
-                textposition='outside',  # Coloca os rótulos fora das barras
-                hovertemplate='Receita: %{x}<br>Produção: %{y:.2f} Ton'  # Personaliza o texto ao passar o mouse
-            )
+            # Consumo por produto das bateladas do período
+            if dataset.matrizes.vazia:
+                st.warning("Nenhum dosador válido foi encontrado no arquivo carregado.")
+            df_somatorio = calcular(dataset, "consumo_por_produto_periodo", **filtro)
             
-            # Layout do gráfico
-            fig5.update_layout(
-                title_x=0.3,  # Centraliza o título
-                font=dict(size=14),
-                xaxis_title="Receita",  # Título do eixo X
-                yaxis_title="Produção",  # Altera o título do eixo Y
-                margin=dict(t=30)  # Aumenta a margem superior para dar mais espaço para os rótulos
-            )
+            # Gráfico de barras do consumo por produto
+            fig5 = grafico_consumo_produto_periodo(df_somatorio)
        
             df_somatorio = df_somatorio.sort_values(by="Consumo", ascending=True)
             # Adicionar a linha com a somatória total
             total_consumo = df_somatorio["Consumo"].sum()
             
-            # Gerar o HTML da tabela estilizada
-            html_tb_cons_prod = (
-                df_somatorio.style
-                .format({"Consumo": "{:.2f} L"})  # Formatação com 2 casas decimais
-                .set_table_styles([            # Estilos gerais da tabela
-                    {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
-                    {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
-                    {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]}  # Fundo alternado
-                ])
-                .hide(axis='index')   # Remover o índice
-                .to_html()  # Converter para HTML
-            )
-           
             col1, col2 = st.columns([3, 1], gap="large")  # Ajustar proporções das colunas e espaço
             with col1:
                 st.plotly_chart(fig5, use_container_width=True)
             with col2:
+                # HTML da página visível da tabela estilizada
+                html_tb_cons_prod = tabela_paginada(
+                    df_somatorio,
+                    "consumo_produto_periodo",
+                    formatos={"Consumo": "{:.2f} L"},  # Formatação com 2 casas decimais
+                )
                 st.markdown(f"""
                     <div style="
                         display: flex;
@@ -1551,102 +842,11 @@ elif st.session_state["menu"] == "Produção":
                 """, unsafe_allow_html=True)
             
             
-            # Agrupando os dados por lote e Receita
-            df_agrupado = df_filtrado.groupby(["lote", "receita"]).agg(
-                hora_inicio=("hora_ini", "min"),
-                hora_final=("hora_fim", "max"),
-                sementes_tratadas=("pv_bat", "sum"),
-                num_bateladas=("lote", "size"),
-                qtd_necessaria=("total_sp", "sum"),
-                qtd_dosada=("total_consumo", "sum")
-            ).reset_index()
-
-            # Convertendo as unidades para toneladas (divisão por 1000)
-            df_agrupado["sementes_tratadas"] = df_agrupado["sementes_tratadas"] / 1000
-            df_agrupado["qtd_necessaria"] = df_agrupado["qtd_necessaria"] / 1000
-            df_agrupado["qtd_dosada"] = df_agrupado["qtd_dosada"] / 1000
-
-            # Calculando Variação de Dosagem (%)
-            df_agrupado["variacao_dosagem"] = ((df_agrupado["qtd_dosada"] / df_agrupado["qtd_necessaria"]) - 1) * 100
-            
-            # Formatando os valores com 2 casas decimais
-            df_agrupado["sementes_tratadas"] = df_agrupado["sementes_tratadas"].map("{:.2f}".format)
-            df_agrupado["qtd_necessaria"] = df_agrupado["qtd_necessaria"].map("{:.2f}".format)
-            df_agrupado["qtd_dosada"] = df_agrupado["qtd_dosada"].map("{:.2f}".format)
-            df_agrupado["variacao_dosagem"] = df_agrupado["variacao_dosagem"].map("{:.3f}".format)
-
-            # Formatando as colunas de hora
-            df_agrupado["hora_inicio"] = pd.to_datetime(df_agrupado["hora_inicio"]).dt.strftime("%d-%m-%Y / %H:%M:%S")
-            df_agrupado["hora_final"] = pd.to_datetime(df_agrupado["hora_final"]).dt.strftime("%H:%M:%S")
-
-            # Reordenando as colunas
-            df_agrupado = df_agrupado[[
-                "hora_inicio", "hora_final", "lote", "receita",
-                "sementes_tratadas", "num_bateladas",
-                "qtd_necessaria", "qtd_dosada", "variacao_dosagem"
-            ]]
-
-            # Renomeando colunas para exibição
-            df_agrupado.rename(columns={
-                "hora_inicio": "Início",
-                "hora_final": "Fim",
-                "sementes_tratadas": "Qtd. Tratada",
-                "num_bateladas": "Núm. Bateladas",
-                "qtd_necessaria": "Qtd. Necessária",
-                "qtd_dosada": "Qtd. Dosada",
-                "variacao_dosagem": "Variação Dosagem"
-            }, inplace=True)
-
-            # Ordenando pela coluna Início
-            df_agrupado.sort_values(by="Início", inplace=True)
-
-            # Garantir que 'Variação Dosagem' seja numérico
-            df_agrupado['Variação Dosagem'] = pd.to_numeric(df_agrupado['Variação Dosagem'], errors='coerce')
-
-            # Criando o gráfico de linha
-            plt.figure(figsize=(10, 2))
-            
-            # Plotando a linha de variação de dosagem
-            plt.plot(df_agrupado['Início'], df_agrupado['Variação Dosagem'], color='darkorange', linewidth=2)
-            
-            # Adicionando círculos em cada amostragem
-            plt.scatter(df_agrupado['Início'], df_agrupado['Variação Dosagem'], color='darkorange', zorder=5)
+            # Resumo por lote e receita do período (o mesmo da página Período)
+            df_agrupado = calcular(dataset, "lotes_periodo", **filtro)
 
-            # Adicionando linhas pivot
-            plt.axhline(y=5, color='lightcoral', linestyle='--', linewidth=1)
-            plt.axhline(y=-5, color='lightcoral', linestyle='--', linewidth=1)
-            
-            # Definindo limites dinâmicos do eixo Y
-            min_dosagem = df_agrupado['Variação Dosagem'].min()
-            max_dosagem = df_agrupado['Variação Dosagem'].max()
-            
-            # Ajustando o limite inferior e superior do eixo Y
-            if min_dosagem < -5.5:
-                y_min = min_dosagem - 3
-            else:
-                y_min = -5.5
-            
-            if max_dosagem > 5.5:
-                y_max = max_dosagem + 3
-            else:
-                y_max = 5.5
-            
-            # Ajustando o limite do eixo Y com base nos valores calculados
-            plt.ylim(y_min, y_max)
- 
-            # Ocultando os valores do eixo X e Y
-            plt.xticks([])  # Remove os valores do eixo X
-            plt.yticks([])  # Define as marcas do eixo Y entre -5 e 5
-            
-            # Adicionando uma linha central em 0
-            plt.axhline(y=0, color='lightgrey', linewidth=1)
-            
-            # Exibindo o gráfico sem borda em volta
-            plt.gca().spines['top'].set_visible(False)
-            plt.gca().spines['right'].set_visible(False)
-            plt.gca().spines['left'].set_visible(False)
-            plt.gca().spines['bottom'].set_visible(False)
-            
+            # Gráfico da variação de dosagem por lote (faixas de ±5% e lotes fora da faixa)
+            fig = grafico_variacao_dosagem(df_agrupado)
             
             # Exibindo o gráfico
             st.markdown("---")       
@@ -1655,11 +855,34 @@ elif st.session_state["menu"] == "Produção":
                     Variação de Dosagem
                 </p>
             """, unsafe_allow_html=True)
-            plt.grid(True, axis='x', linestyle='--', alpha=0.6)
-            plt.tight_layout()
-            st.pyplot(plt)
+            st.plotly_chart(fig, use_container_width=True)
              
         else:
             st.warning("As colunas 'Data' e/ou 'Hora' não foram encontradas no DataFrame.")
     else:
-        st.warning("Por favor, carregue um arquivo primeiro.")
\ No newline at end of file
+        st.warning("Por favor, carregue um arquivo primeiro.")
+
+
+# Relatório em PDF com os gráficos de todas as páginas, usando os últimos filtros escolhidos
+# (sem filtro de período, todo o intervalo dos dados; o lote entra se já foi selecionado)
+if 'dataset' in st.session_state:
+    with st.sidebar:
+        if st.button("Exportar Relatório em PDF"):
+            dataset = st.session_state['dataset']
+            periodo = st.session_state.get("filtro_periodo") or dict(
+                inicio=dataset.df['hora_ini'].min().normalize(),
+                fim=dataset.df['hora_fim'].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+            )
+            try:
+                with st.spinner("Gerando relatório..."):
+                    pdf = gerar_relatorio(dataset, **periodo, **st.session_state.get("filtro_lote", {}))
+            except Exception as erro:
+                st.error(f"Não foi possível gerar o relatório: {erro}")
+            else:
+                st.download_button(
+                    label="Baixar PDF",
+                    data=pdf,
+                    file_name="relatorio.pdf",
+                    mime="application/pdf",
+                    on_click="ignore"
+                )
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: acrescentar uma exportação nova reprocessando tudo x modo de anexar.
+
+Uso: python benchmarks/bench_anexar.py [linhas_historico] [linhas_novas]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from ingestao import normalizar_arquivo, processar_dados
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    linhas_historico = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    linhas_novas = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    # Exportação em ordem cronológica: o histórico é o início e o envio novo é o fim,
+    # com 10% das bateladas novas repetindo o fim do histórico
+    bruto = gerar_exportacao(linhas_historico + linhas_novas, lotes_sequenciais=True)
+    bruto = bruto.iloc[(pd.to_datetime(bruto["Date"]) + bruto["Time"]).argsort()].reset_index(drop=True)
+    repetidas = linhas_novas // 10
+    historico = bruto.iloc[:linhas_historico]
+    novo = bruto.iloc[linhas_historico - repetidas:]
+
+    df, dosadores = processar_dados(normalizar_arquivo(historico.copy()))
+    dataset = Dataset(df, dosadores, "historico", ("historico",))
+    dataset.consolidado_dia  # Consolidados já calculados, como após usar as páginas
+
+    t_completo, (df_completo, _) = cronometrar(
+        lambda: processar_dados(normalizar_arquivo(pd.concat([historico, novo], ignore_index=True))))
+    t_completo_consolidado, _ = cronometrar(lambda: Dataset(df_completo).consolidado_dia)
+
+    def anexar():
+        df_novo, dosadores_novos = processar_dados(normalizar_arquivo(novo.copy()))
+        return dataset.anexar(df_novo, dosadores_novos, ["novo"])
+
+    t_anexar, (anexado, descartadas) = cronometrar(anexar)
+    assert descartadas == repetidas and len(anexado) == len(df_completo)
+
+    print(f"{linhas_historico} bateladas no histórico + {linhas_novas} novas ({descartadas} repetidas)")
+    print(f"reprocessar tudo: {(t_completo + t_completo_consolidado) * 1000:8.0f} ms")
+    print(f"anexar:           {t_anexar * 1000:8.0f} ms")
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: tempo de processamento em função do número de canais de dosagem (ED/DP).
+
+Uso: python benchmarks/bench_canais.py [linhas]
+"""
+
+import sys
+import time
+import warnings
+
+from dados_sinteticos import gerar_exportacao
+from ingestao import normalizar_arquivo, processar_dados
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    warnings.simplefilter("error")  # Falha se o DataFrame ficar fragmentado
+    print(f"{linhas} bateladas")
+    print(f"{'canais':>8} {'colunas':>8} {'tempo (s)':>10} {'ms/canal':>9}")
+    for n_ed, n_dp in ((10, 4), (20, 8), (40, 16), (60, 24)):
+        df = normalizar_arquivo(gerar_exportacao(linhas, n_ed=n_ed, n_dp=n_dp))
+        inicio = time.perf_counter()
+        _, dosadores = processar_dados(df)
+        tempo = time.perf_counter() - inicio
+        assert len(dosadores) == n_ed + n_dp
+        print(f"{len(dosadores):>8} {df.shape[1]:>8} {tempo:>10.2f} {tempo / len(dosadores) * 1000:>9.1f}")
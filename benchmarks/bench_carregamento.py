@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: leitura de vários arquivos .xlsx (sequencial x pool de processos compartilhado).
+
+A primeira medição de cada número de processos inclui a criação do pool; a segunda
+reaproveita o pool, como os envios seguintes no servidor.
+
+Uso: python benchmarks/bench_carregamento.py [num_arquivos] [linhas_por_arquivo]
+"""
+
+import os
+import sys
+import time
+
+from dados_sinteticos import gerar_xlsx
+from ingestao import carregar_arquivos
+
+if __name__ == "__main__":
+    num_arquivos = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    linhas = int(sys.argv[2]) if len(sys.argv) > 2 else 1_500
+    arquivos = [(f"exportacao_{i:02d}.xlsx", gerar_xlsx(linhas, seed=i)) for i in range(num_arquivos)]
+    print(f"{num_arquivos} arquivos x {linhas} linhas, {os.cpu_count()} CPUs")
+
+    base = None
+    for workers in (1, 2, 4, None):
+        for envio in ("novo pool", "reaproveitado") if workers != 1 else ("sequencial",):
+            inicio = time.perf_counter()
+            resultados = carregar_arquivos(arquivos, max_workers=workers)
+            tempo = time.perf_counter() - inicio
+            assert all(erro is None for _, _, erro in resultados)
+            assert [nome for nome, _, _ in resultados] == [nome for nome, _ in arquivos]
+            base = base or tempo
+            print(f"workers={str(workers or 'padrão'):>6} ({envio:<13}): {tempo:7.2f} s  ({base / tempo:.1f}x)")
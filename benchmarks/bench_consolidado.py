@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: KPIs do período a partir das bateladas x consolidado por hora/dia.
+
+Uso: python benchmarks/bench_consolidado.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from consolidacao import resumir_bateladas
+from dataset import Dataset
+from ingestao import normalizar_arquivo, processar_dados
+
+
+# Cálculo anterior: filtro por máscaras e agregações sobre as bateladas
+def resumo_mascaras(df, inicio, fim):
+    return resumir_bateladas(df[(df["hora_ini"] >= inicio) & (df["hora_fim"] <= fim)])
+
+
+def cronometrar(func, repeticoes=10):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas, lotes_sequenciais=True)))
+    dataset = Dataset(df, dosadores)
+
+    t_hora, _ = cronometrar(lambda: dataset.consolidado_hora, repeticoes=1)
+    t_dia, _ = cronometrar(lambda: dataset.consolidado_dia, repeticoes=1)
+    print(f"{linhas} bateladas -> {len(dataset.consolidado_hora.tabela)} linhas por hora "
+          f"({t_hora * 1000:.0f} ms), {len(dataset.consolidado_dia.tabela)} por dia ({t_dia * 1000:.0f} ms)")
+
+    dia = df["hora_ini"].min().normalize()
+    fim_dia = pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    consultas = {
+        "1 dia": (dia + pd.Timedelta(days=30), dia + pd.Timedelta(days=30) + fim_dia),
+        "1 mês": (dia + pd.Timedelta(days=30), dia + pd.Timedelta(days=59) + fim_dia),
+        "6 horas": (dia + pd.Timedelta(days=30, hours=6), dia + pd.Timedelta(days=30, hours=12) - pd.Timedelta(seconds=1)),
+        "não alinhado": (dia + pd.Timedelta(days=30, minutes=17), dia + pd.Timedelta(days=45, minutes=3)),
+    }
+
+    print(f"{'período':<14} {'máscaras (ms)':>14} {'consolidado (ms)':>17}")
+    for nome, (inicio, fim) in consultas.items():
+        t_mascaras, esperado = cronometrar(lambda: resumo_mascaras(df, inicio, fim))
+        t_consolidado, obtido = cronometrar(lambda: dataset.resumo_periodo(inicio, fim))
+        for chave, valor in esperado.items():
+            assert np.isclose(valor, obtido[chave], equal_nan=True), (nome, chave)
+        print(f"{nome:<14} {t_mascaras * 1000:>14.2f} {t_consolidado * 1000:>17.2f}")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: correções de dosagem com laço por dosador x matrizes (bateladas x dosadores).
+
+Uso: python benchmarks/bench_correcao.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from ingestao import corrigir_dosagem, montar_timestamps, normalizar_arquivo, padronizar_dosadores
+
+
+# Implementação anterior: quatro etapas por dosador, cada uma com suas máscaras
+def corrigir_dosagem_laco(df, dosadores):
+    novas_sp_dos = {}
+    for idx, _ in enumerate(dosadores, start=1):
+        sp_rec_col = f"sp_rec{str(idx).zfill(2)}"
+        pv_dos_col = f"pv_dos{str(idx).zfill(2)}"
+        erro_dos_col = f"erro_dos{str(idx).zfill(2)}"
+        sp_dos_col = f"sp_dos{str(idx).zfill(2)}"
+        if sp_rec_col in df.columns and pv_dos_col in df.columns and erro_dos_col in df.columns:
+            if df[sp_rec_col].between(0, 5).any():
+                df.loc[df[sp_rec_col].between(0, 5), sp_rec_col] *= 1000
+            if df[pv_dos_col].between(0, 5).any():
+                df.loc[df[pv_dos_col].between(0, 5), pv_dos_col] *= 1000
+            if sp_dos_col in df.columns:
+                sp_dos = df[sp_dos_col]
+            else:
+                sp_dos = novas_sp_dos[sp_dos_col] = df["pv_bat"] / 100 * df[sp_rec_col]
+            if not df[pv_dos_col].between(sp_dos * 0.8, sp_dos * 1.2).all():
+                df.loc[~df[pv_dos_col].between(sp_dos * 0.8, sp_dos * 1.2), pv_dos_col] = sp_dos
+            df[erro_dos_col] = pd.to_numeric(df[erro_dos_col], errors='coerce')
+            df[erro_dos_col] = df[erro_dos_col].replace([np.inf, -np.inf, np.nan], 0)
+            df.loc[df[erro_dos_col].between(-20, 20), pv_dos_col] *= (
+                1 + df.loc[df[erro_dos_col].between(-20, 20), erro_dos_col] / 100
+            )
+    if novas_sp_dos:
+        df = pd.concat([df, pd.DataFrame(novas_sp_dos)], axis=1)
+    return df
+
+
+def cronometrar(func, df, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        resultado = func(copia)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, dosadores = padronizar_dosadores(normalizar_arquivo(gerar_exportacao(linhas)))
+    df = montar_timestamps(df)
+
+    t_laco, esperado = cronometrar(lambda copia: corrigir_dosagem_laco(copia, dosadores), df)
+    t_matriz, (obtido, contadores) = cronometrar(lambda copia: corrigir_dosagem(copia, dosadores), df)
+    pd.testing.assert_frame_equal(esperado, obtido)
+
+    print(f"{linhas} bateladas, {len(dosadores)} dosadores")
+    print(f"laço por dosador: {t_laco * 1000:8.0f} ms")
+    print(f"matrizes:         {t_matriz * 1000:8.0f} ms")
+    print()
+    print(pd.DataFrame.from_dict(contadores, orient="index"))
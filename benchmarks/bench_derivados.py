@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: dados derivados de cada página na primeira execução x nas execuções seguintes
+(mesmo filtro, resultados memorizados no grafo de derivados.py).
+
+Uso: python benchmarks/bench_derivados.py [linhas]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from derivados import calcular
+from ingestao import normalizar_arquivo, processar_dados
+
+# Nós usados por cada página
+PAGINAS = {
+    "Consumo": ["consumo_por_receita", "consumo_por_produto"],
+    "Período": ["resumo_periodo", "lotes_periodo"],
+    "Lote": ["bateladas_lote", "resumo_lote", "produtos_lote"],
+    "Produção": ["bateladas_periodo", "resumo_periodo", "producao_por_receita", "producao_semana_hora",
+                 "consumo_por_produto_periodo", "lotes_periodo"],
+}
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    func()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas, lotes_sequenciais=True)))
+    dataset = Dataset(df, dosadores)
+    dataset.matrizes  # Montadas uma vez por conjunto de dados, fora da medição
+
+    lote, receita = df[["lote", "receita"]].iloc[len(df) // 2]
+    filtro = dict(
+        inicio=df["hora_ini"].min().normalize(),
+        fim=df["hora_fim"].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1),
+        lote=lote, receita=receita,
+    )
+
+    print(f"{linhas} bateladas")
+    print(f"{'página':<10} {'primeira (ms)':>14} {'seguintes (ms)':>15}")
+    for pagina, nos in PAGINAS.items():
+        tempos = [cronometrar(lambda: [calcular(dataset, nome, **filtro) for nome in nos]) for _ in range(3)]
+        print(f"{pagina:<10} {tempos[0] * 1000:>14.1f} {min(tempos[1:]) * 1000:>15.3f}")
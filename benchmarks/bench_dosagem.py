@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: somatórios por produto com laços por dosador x tabela longa x matrizes de dosagem.
+
+Uso: python benchmarks/bench_dosagem.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao
+from dosagem import montar_tabela_dosagem
+from ingestao import normalizar_arquivo, processar_dados
+from matrizes import montar_matrizes
+
+
+# Soma por produto agrupando a tabela longa (linhas canal a canal: a de (c, b) é c * n + b)
+def somar_por_produto_longa(tabela, bateladas, n_canais):
+    if bateladas is not None:
+        n = len(tabela) // n_canais
+        tabela = tabela.take((np.arange(n_canais)[:, None] * n + np.asarray(bateladas)[None, :]).ravel())
+    return tabela.groupby("produto", observed=True)[["sp_dos", "pv_dos"]].sum().reset_index()
+
+
+# Implementação anterior: um groupby por nome_prodXX, concatenação e novo groupby por produto
+def somar_por_produto_lacos(df, dosadores):
+    dados_agregados = []
+    for idx, _ in enumerate(dosadores, start=1):
+        sufixo = str(idx).zfill(2)
+        nome_col, sp_dos_col, pv_dos_col = f"nome_prod{sufixo}", f"sp_dos{sufixo}", f"pv_dos{sufixo}"
+        if nome_col in df.columns and sp_dos_col in df.columns and pv_dos_col in df.columns:
+            df_agrupado = df.groupby(nome_col, observed=True).agg({sp_dos_col: "sum", pv_dos_col: "sum"}).reset_index()
+            df_agrupado.columns = ["Produto", "sp_dos", "pv_dos"]
+            dados_agregados.append(df_agrupado)
+    df_resultado = pd.concat(dados_agregados, ignore_index=True)
+    return df_resultado.groupby("Produto", observed=True).agg({"sp_dos": "sum", "pv_dos": "sum"}).reset_index()
+
+
+def cronometrar(func, repeticoes=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas)))
+
+    t_matrizes, matrizes = cronometrar(lambda: montar_matrizes(df, dosadores), repeticoes=1)
+    t_tabela, tabela = cronometrar(lambda: montar_tabela_dosagem(matrizes), repeticoes=1)
+    print(f"{linhas} bateladas, {len(dosadores)} dosadores: matrizes montadas em {t_matrizes * 1000:.1f} ms, "
+          f"tabela longa com {len(tabela)} linhas em mais {t_tabela * 1000:.1f} ms (uma vez por conjunto de dados)")
+
+    # Seleções equivalentes às das páginas Consumo (tudo), Lote (um lote/receita) e Produção (um período)
+    lote, receita = df[["lote", "receita"]].iloc[0]
+    meio = df["hora_ini"].sort_values().iloc[len(df) // 2]
+    selecoes = {
+        "Consumo": df,
+        "Lote": df[(df["lote"] == lote) & (df["receita"] == receita)],
+        "Produção": df[(df["hora_ini"] >= meio) & (df["hora_fim"] <= meio + pd.Timedelta(days=7))],
+    }
+
+    print(f"{'página':<10} {'bateladas':>10} {'laços (ms)':>12} {'longa (ms)':>12} {'matrizes (ms)':>14}")
+    for nome, df_filtrado in selecoes.items():
+        bateladas = None if df_filtrado is df else df_filtrado.index
+        t_lacos, esperado = cronometrar(lambda: somar_por_produto_lacos(df_filtrado, dosadores))
+        t_longa, obtido_longa = cronometrar(lambda: somar_por_produto_longa(tabela, bateladas, len(dosadores)))
+        t_matrizes, obtido = cronometrar(lambda: matrizes.somar_por_produto(bateladas))
+        assert list(esperado["Produto"].astype(str)) == list(obtido["Produto"].astype(str))
+        assert list(obtido_longa["produto"].astype(str)) == list(obtido["Produto"].astype(str))
+        assert np.allclose(esperado[["sp_dos", "pv_dos"]], obtido[["sp_dos", "pv_dos"]])
+        assert np.allclose(obtido_longa[["sp_dos", "pv_dos"]], obtido[["sp_dos", "pv_dos"]])
+        print(f"{nome:<10} {len(df_filtrado):>10} {t_lacos * 1000:>12.1f} {t_longa * 1000:>12.1f} {t_matrizes * 1000:>14.1f}")
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: remoção de duplicatas comparando todas as colunas x impressão digital da chave natural.
+
+Uso: python benchmarks/bench_duplicatas.py [linhas]
+"""
+
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from ingestao import marcar_duplicatas, normalizar_arquivo, processar_dados
+
+
+def medir(func, df):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = func(df)
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    # Duas exportações com metade das bateladas em comum (mesmo log do CLP baixado duas vezes)
+    bruto = gerar_exportacao(linhas)
+    metade = linhas // 2
+    sobrepostas = pd.concat([bruto, bruto.iloc[metade:]], ignore_index=True)
+    df, _ = processar_dados(normalizar_arquivo(sobrepostas), deduplicar=False)
+    print(f"{len(df)} bateladas ({len(df.columns)} colunas), {linhas - metade} repetidas")
+
+    metodos = {
+        "todas as colunas": lambda df: df.duplicated().to_numpy(),
+        "chave natural": marcar_duplicatas,
+    }
+    print(f"{'método':<18} {'tempo (ms)':>11} {'pico (MB)':>10} {'repetidas':>10}")
+    resultados = []
+    for nome, func in metodos.items():
+        tempo, pico, repetidas = medir(func, df)
+        resultados.append(repetidas)
+        print(f"{nome:<18} {tempo * 1000:>11.0f} {pico / 2**20:>10.1f} {repetidas.sum():>10}")
+    assert (resultados[0] == resultados[1]).all()
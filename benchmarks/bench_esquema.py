@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: memória e agrupamentos com o esquema compacto x colunas de texto/float64.
+
+Uso: python benchmarks/bench_esquema.py [linhas]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao
+from esquema import relatorio_memoria, tipos_esquema
+from ingestao import normalizar_arquivo, processar_dados
+
+
+# Agrupamentos das páginas Período e Produção
+def agrupar_periodo(df):
+    return df.groupby(["lote", "receita"], observed=True).agg(
+        hora_inicio=("hora_ini", "min"),
+        hora_final=("hora_fim", "max"),
+        sementes_tratadas=("pv_bat", "sum"),
+        num_bateladas=("lote", "size"),
+        qtd_necessaria=("total_sp", "sum"),
+        qtd_dosada=("total_consumo", "sum")
+    )
+
+
+def agrupar_producao(df):
+    return [df.groupby(coluna, observed=True)["pv_bat"].sum()
+            for coluna in ("operador", "ensaque", "especie", "peneira", "receita")]
+
+
+def cronometrar(func, df, repeticoes=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func(df)
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    compacto, _ = processar_dados(normalizar_arquivo(gerar_exportacao(linhas)))
+
+    # Mesmo conteúdo com os tipos anteriores (texto como object/str e float64)
+    tipos_anteriores = {coluna: ("str" if tipo == "category" else "float64")
+                        for coluna, tipo in tipos_esquema(compacto.columns).items()}
+    anterior = compacto.astype(tipos_anteriores)
+
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_rows", 200)
+    relatorio = relatorio_memoria(anterior, compacto)
+    print(pd.concat([relatorio.head(15), relatorio.tail(1)]))
+    print()
+    print(f"{linhas} bateladas  {'anterior (ms)':>14} {'compacto (ms)':>14}")
+    for nome, func in (("Período", agrupar_periodo), ("Produção", agrupar_producao)):
+        t_ant = cronometrar(func, anterior) * 1000
+        t_comp = cronometrar(func, compacto) * 1000
+        print(f"{nome:<18} {t_ant:>14.1f} {t_comp:>14.1f}")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: seletores da página Lote (lote, receita e bateladas do par) com varreduras
+do DataFrame x índice lote -> receita -> posições.
+
+Uso: python benchmarks/bench_lotes.py [linhas] [lotes]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from ingestao import normalizar_arquivo, processar_dados
+
+
+# Implementação anterior: unique() para o primeiro seletor e duas máscaras por seleção
+def selecionar_varrendo(df, lote):
+    opcoes = df["lote"].unique()
+    receita = df[df["lote"] == lote]["receita"].unique()[0]
+    return opcoes, df[(df["lote"] == lote) & (df["receita"] == receita)]
+
+
+def selecionar_indice(dataset, lote):
+    indice = dataset.indice_lotes
+    opcoes = indice.lotes
+    receita = indice.receitas(lote)[0]
+    return opcoes, dataset.df.take(indice.posicoes(lote, receita))
+
+
+def latencias(func, selecoes):
+    tempos = []
+    for lote in selecoes:
+        inicio = time.perf_counter()
+        func(lote)
+        tempos.append(time.perf_counter() - inicio)
+    return np.array(tempos) * 1000
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_lotes = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    bruto = gerar_exportacao(linhas)
+    bruto["Lote"] = [f"L{i % n_lotes:05d}" for i in range(linhas)]
+    df, dosadores = processar_dados(normalizar_arquivo(bruto))
+    dataset = Dataset(df, dosadores)
+
+    inicio = time.perf_counter()
+    dataset.indice_lotes
+    t_indice = time.perf_counter() - inicio
+    print(f"{linhas} bateladas, {len(dataset.indice_lotes.lotes)} lotes: "
+          f"índice montado em {t_indice * 1000:.0f} ms (uma vez por conjunto de dados)")
+
+    # Sequência de cliques em lotes aleatórios (cada um é uma nova execução da página)
+    rng = np.random.default_rng(0)
+    selecoes = rng.choice(dataset.indice_lotes.lotes, size=50)
+    for lote in selecoes[:5]:
+        _, esperado = selecionar_varrendo(df, lote)
+        _, obtido = selecionar_indice(dataset, lote)
+        assert esperado.index.equals(obtido.index)
+
+    print(f"{'seletores':<12} {'mediana (ms)':>13} {'p95 (ms)':>9}")
+    for nome, func in (("varredura", lambda lote: selecionar_varrendo(df, lote)),
+                       ("índice", lambda lote: selecionar_indice(dataset, lote))):
+        tempos = latencias(func, selecoes)
+        print(f"{nome:<12} {np.median(tempos):>13.2f} {np.percentile(tempos, 95):>9.2f}")
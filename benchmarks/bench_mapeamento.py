@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: identificação/renomeação dos dosadores (laços por EDxx/DPxx x tabela de mapeamento).
+
+Uso: python benchmarks/bench_mapeamento.py [linhas]
+"""
+
+import sys
+import time
+
+from dados_sinteticos import gerar_exportacao
+from ingestao import normalizar_arquivo, padronizar_dosadores
+
+
+# Implementação anterior: um rename por coluna e conversões repetidas por dosador
+def padronizar_dosadores_lacos(df):
+    dosadores = []
+    for prefixo, faixa, unidade in (("ED", range(1, 11), "L"), ("DP", range(1, 5), "Kg")):
+        for i in faixa:
+            canal = f"{prefixo}{str(i).zfill(2)}"
+            nome_colunas_sp = {f"SP Receita - {canal} ({unidade})", f"SP Receita {canal}", f"SP Receita - {canal}"}
+            for coluna in [col for col in nome_colunas_sp if col in df.columns]:
+                df.rename(columns={coluna: f"SP Receita {canal}"}, inplace=True)
+                if df[f"SP Receita {canal}"].sum() > 0:
+                    dosadores.append(canal)
+
+    for idx, dosador in enumerate(dosadores, start=1):
+        unidade = "L" if "ED" in dosador else "Kg"
+        sufixo = str(idx).zfill(2)
+        colunas_renomear = {
+            f"SP Receita - {dosador} ({unidade})": f"sp_rec{sufixo}",
+            f"SP Receita {dosador}": f"sp_rec{sufixo}",
+            f"SP Receita - {dosador}": f"sp_rec{sufixo}",
+            f"SP Dosagem {dosador}": f"sp_dos{sufixo}",
+            f"SP Dosagem - {dosador}": f"sp_dos{sufixo}",
+            f"SP Dosagem - {dosador} ({unidade})": f"sp_dos{sufixo}",
+            f"PV Dosagem {dosador}": f"pv_dos{sufixo}",
+            f"PV Dosagem - {dosador}": f"pv_dos{sufixo}",
+            f"PV Dosagem - {dosador} ({unidade})": f"pv_dos{sufixo}",
+            f"Erro Dosagem - {dosador} (%)": f"erro_dos{sufixo}",
+            f"Erro Dosagem {dosador}": f"erro_dos{sufixo}",
+            f"Produto {dosador}": f"nome_prod{sufixo}",
+            f"Densidade {dosador}": f"dens_prod{sufixo}",
+            f"Densidade - {dosador}": f"dens_prod{sufixo}",
+            f"Unid medida {dosador}": f"unid_med{sufixo}",
+            f"Unid. Medida - {dosador}": f"unid_med{sufixo}",
+            f"Unid_Sementes_{dosador}": f"unid_med{sufixo}"
+        }
+        for nome_original, novo_nome in colunas_renomear.items():
+            if nome_original in df.columns:
+                df.rename(columns={nome_original: novo_nome}, inplace=True)
+        df[f"nome_prod{sufixo}"] = df[f"nome_prod{sufixo}"].astype("str")
+        df[f"sp_rec{sufixo}"] = df[f"sp_rec{sufixo}"].astype("float")
+        df[f"pv_dos{sufixo}"] = df[f"pv_dos{sufixo}"].astype("float")
+        df[f"erro_dos{sufixo}"] = df[f"erro_dos{sufixo}"].astype("float")
+    return df, dosadores
+
+
+def cronometrar(func, df, repeticoes=3):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func(df.copy())
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = normalizar_arquivo(gerar_exportacao(linhas, n_ed=10, n_dp=4))
+    print(f"{linhas} bateladas, {df.shape[1]} colunas, 14 dosadores")
+
+    t_lacos, (esperado, dos_esperados) = cronometrar(padronizar_dosadores_lacos, df)
+    t_tabela, (obtido, dos_obtidos) = cronometrar(padronizar_dosadores, df)
+    assert dos_esperados == dos_obtidos
+    colunas = [coluna for coluna in obtido.columns if coluna[-2:].isdigit()]
+    assert esperado[colunas].equals(obtido[colunas])
+    print(f"laços:   {t_lacos * 1000:8.1f} ms")
+    print(f"tabela:  {t_tabela * 1000:8.1f} ms  ({t_lacos / t_tabela:.1f}x)")
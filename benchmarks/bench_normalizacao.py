@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: normalização de horários por arquivo (round-trip por texto x timedelta direto).
+
+Uso: python benchmarks/bench_normalizacao.py
+"""
+
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao
+from ingestao import COLUNAS_PADRONIZADAS, normalizar_arquivo
+
+
+# Implementação anterior: componentes -> texto -> datetime
+def normalizar_arquivo_texto(df_load):
+    df_load.rename(columns=COLUNAS_PADRONIZADAS, inplace=True)
+    df_load["hora_fim"] = df_load["hora_fim"].dt.components.apply(
+        lambda x: f"{x['hours']:02}:{x['minutes']:02}:{x['seconds']:02}", axis=1
+    )
+    if "data" in df_load.columns:
+        df_load["data"] = pd.to_datetime(df_load["data"], errors="coerce")
+    if "hora_ini" in df_load.columns:
+        df_load["hora_ini"] = pd.to_datetime(df_load["hora_ini"], format="%H:%M:%S", errors="coerce")
+    if "hora_fim" in df_load.columns:
+        df_load["hora_fim"] = pd.to_datetime(df_load["hora_fim"], format="%H:%M:%S", errors="coerce")
+    return df_load
+
+
+def cronometrar(func, df):
+    inicio = time.perf_counter()
+    resultado = func(df.copy())
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    print(f"{'linhas':>10} {'texto (s)':>12} {'timedelta (s)':>15} {'ganho':>8}")
+    for n in (5_000, 50_000, 200_000):
+        df = gerar_exportacao(n, n_ed=2, n_dp=0)
+        t_texto, esperado = cronometrar(normalizar_arquivo_texto, df)
+        t_td, obtido = cronometrar(normalizar_arquivo, df)
+        for coluna in ("hora_ini", "hora_fim"):
+            offset = esperado[coluna] - esperado[coluna].dt.normalize()
+            pd.testing.assert_series_equal(offset, obtido[coluna], check_dtype=False)
+        print(f"{n:>10} {t_texto:>12.3f} {t_td:>15.4f} {t_texto / t_td:>7.0f}x")
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: filtro por período com máscaras booleanas x busca binária em hora_ini ordenado.
+
+Uso: python benchmarks/bench_periodo.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_horarios
+from dataset import Dataset
+from ingestao import montar_timestamps
+
+
+# Filtro anterior das páginas Período e Produção
+def filtrar_mascaras(df, inicio, fim):
+    return df[(df["hora_ini"] >= inicio) & (df["hora_fim"] <= fim)]
+
+
+def cronometrar(func, repeticoes=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = montar_timestamps(gerar_horarios(linhas))
+    rng = np.random.default_rng(1)
+    df["pv_bat"] = rng.uniform(500, 2000, linhas)
+    df = df.sort_values("hora_ini", kind="stable").reset_index(drop=True)
+    dataset = Dataset(df)
+
+    primeiro = df["hora_ini"].iloc[0].normalize()
+    consultas = {
+        "1 dia": (primeiro + pd.Timedelta(days=60), primeiro + pd.Timedelta(days=61)),
+        "1 semana": (primeiro + pd.Timedelta(days=60), primeiro + pd.Timedelta(days=67)),
+        "1 mês": (primeiro + pd.Timedelta(days=30), primeiro + pd.Timedelta(days=60)),
+        "tudo": (primeiro, df["hora_fim"].max()),
+    }
+
+    print(f"{linhas} bateladas")
+    print(f"{'período':<10} {'bateladas':>10} {'máscaras (ms)':>14} {'busca binária (ms)':>19}")
+    for nome, (inicio, fim) in consultas.items():
+        t_mascaras, esperado = cronometrar(lambda: filtrar_mascaras(df, inicio, fim))
+        t_busca, obtido = cronometrar(lambda: dataset.periodo(inicio, fim))
+        assert esperado.index.equals(obtido.index)
+        print(f"{nome:<10} {len(obtido):>10} {t_mascaras * 1000:>14.2f} {t_busca * 1000:>19.2f}")
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: gráficos da página Produção (quatro pizzas e barras por receita) montados
+das bateladas do período x das somas por dimensão de uma única agregação.
+
+Uso: python benchmarks/bench_producao.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from derivados import calcular
+from graficos import grafico_pizza_producao, grafico_producao_receita
+from ingestao import normalizar_arquivo, processar_dados
+
+DIMENSOES = ["operador", "ensaque", "especie", "peneira"]
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+# Implementação anterior: pizzas sobre as bateladas (agregadas pelo Plotly) e groupby por receita
+def graficos_bateladas(df_filtrado):
+    df_producao = df_filtrado.assign(pv_bat=df_filtrado["pv_bat"] / 1000)
+    figuras = [grafico_pizza_producao(df_producao, dimensao, dimensao, dimensao) for dimensao in DIMENSOES]
+    por_receita = df_producao.groupby("receita", as_index=False, observed=True)["pv_bat"].sum()
+    return figuras + [grafico_producao_receita(por_receita.sort_values(by="pv_bat"))]
+
+
+def graficos_agregados(dataset, filtro):
+    producao = calcular(dataset, "producao_por_dimensao", **filtro)
+    figuras = [grafico_pizza_producao(producao[dimensao], dimensao, dimensao, dimensao) for dimensao in DIMENSOES]
+    return figuras + [grafico_producao_receita(calcular(dataset, "producao_por_receita", **filtro))]
+
+
+# Soma por rótulo de cada gráfico (as pizzas das bateladas repetem rótulos)
+def somas(figuras):
+    return [
+        pd.Series(np.concatenate([t.values if t.type == "pie" else t.y for t in fig.data]),
+                  index=np.concatenate([t.labels if t.type == "pie" else t.x for t in fig.data]).astype(str))
+        .groupby(level=0).sum()
+        for fig in figuras
+    ]
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas)))
+    dataset = Dataset(df, dosadores)
+    dataset.consolidado_dia  # Montado uma vez por conjunto de dados, fora da medição
+    inicio = df["hora_ini"].min().normalize()
+    fim = df["hora_fim"].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+
+    print(f"{linhas} bateladas")
+    print(f"{'gráficos':<32} {'tempo (ms)':>10} {'JSON (KB)':>10}")
+    # Período alinhado a dias (consolidado) e período com horas quebradas (bateladas)
+    for nome, filtro in (("dias inteiros", dict(inicio=inicio, fim=fim)),
+                         ("horas quebradas", dict(inicio=inicio + pd.Timedelta(minutes=7), fim=fim))):
+        df_filtrado = dataset.periodo(**filtro)
+        t_bateladas, esperado = cronometrar(lambda: [fig.to_json() for fig in graficos_bateladas(df_filtrado)])
+        t_agregado, obtido = cronometrar(lambda: [fig.to_json() for fig in graficos_agregados(dataset, filtro)])
+        for a, b in zip(somas(graficos_bateladas(df_filtrado)), somas(graficos_agregados(dataset, filtro))):
+            assert np.allclose(a, b.reindex(a.index))
+        print(f"{'bateladas, ' + nome:<32} {t_bateladas * 1000:>10.0f} {sum(map(len, esperado)) / 2**10:>10.0f}")
+        print(f"{'agregados, ' + nome:<32} {t_agregado * 1000:>10.0f} {sum(map(len, obtido)) / 2**10:>10.0f}")
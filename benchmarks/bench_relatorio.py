@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: imagens do relatório em PDF com um Kaleido novo por gráfico (fig.write_image)
+x o renderizador mantido aberto de relatorio.py (primeiro relatório e seguintes).
+
+Requer o Chrome usado pelo Kaleido (kaleido_get_chrome).
+
+Uso: python benchmarks/bench_relatorio.py [linhas]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from ingestao import normalizar_arquivo, processar_dados
+from relatorio import LARGURA, ALTURA, gerar_relatorio, renderizador, secoes_relatorio
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas)))
+    dataset = Dataset(df, dosadores)
+    inicio = df["hora_ini"].min().normalize()
+    fim = df["hora_fim"].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    lote, receita = df[["lote", "receita"]].iloc[0]
+
+    figuras = [fig for _, figs in secoes_relatorio(dataset, inicio, fim, lote, receita) for fig in figs]
+    print(f"{len(figuras)} gráficos no relatório")
+
+    t_avulso, _ = cronometrar(lambda: [fig.to_image(format="png", width=LARGURA, height=ALTURA) for fig in figuras])
+    t_primeiro, _ = cronometrar(lambda: renderizador.png(figuras))
+    t_seguinte, pdf = cronometrar(lambda: gerar_relatorio(dataset, inicio, fim, lote, receita))
+
+    print(f"Kaleido por gráfico:             {t_avulso * 1000:8.0f} ms")
+    print(f"renderizador (inicia o Chrome):  {t_primeiro * 1000:8.0f} ms")
+    print(f"relatório seguinte (PDF pronto): {t_seguinte * 1000:8.0f} ms  {len(pdf) / 2**10:.0f} KB")
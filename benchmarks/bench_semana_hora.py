@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: mapa de calor de produção por dia da semana x hora com groupby + reindex
+sobre as bateladas x bincount 7 x 24 (consolidado por hora, bateladas e intervalos repartidos).
+
+Uso: python benchmarks/bench_semana_hora.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from consolidacao import somar_semana_hora, somar_semana_hora_bateladas
+from dataset import Dataset
+from ingestao import normalizar_arquivo, processar_dados
+
+
+def cronometrar(func, repeticoes=5):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - inicio) / repeticoes, resultado
+
+
+# Implementação anterior: groupby por (dia, hora) e reindex no produto completo
+def semana_hora_groupby(df_filtrado):
+    df_week = pd.DataFrame({
+        "dia_semana": df_filtrado["hora_fim"].dt.weekday,
+        "hora": df_filtrado["hora_fim"].dt.hour,
+        "pv_bat": df_filtrado["pv_bat"] / 1000,
+    }).groupby(["dia_semana", "hora"]).agg({"pv_bat": "sum"}).reset_index()
+    hora_min = df_week["hora"].min()
+    hora_max = df_week["hora"].max()
+    df_completo = pd.MultiIndex.from_product([range(7), range(hora_min, hora_max + 1)], names=["dia_semana", "hora"])
+    return df_week.set_index(["dia_semana", "hora"]).reindex(df_completo, fill_value=0).reset_index()
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas)))
+    dataset = Dataset(df, dosadores)
+    dataset.consolidado_hora  # Montado uma vez por conjunto de dados, fora da medição
+    inicio = df["hora_ini"].min().normalize()
+    fim = df["hora_fim"].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    df_filtrado = dataset.periodo(inicio, fim)
+
+    t_groupby, esperado = cronometrar(lambda: semana_hora_groupby(df_filtrado))
+    t_consolidado, (producao, _) = cronometrar(lambda: somar_semana_hora(dataset.consolidado_hora, inicio, fim))
+    t_bateladas, _ = cronometrar(lambda: somar_semana_hora_bateladas(df_filtrado))
+    t_intervalos, (repartida, _) = cronometrar(lambda: somar_semana_hora_bateladas(df_filtrado, dividir=True))
+
+    obtido = producao[esperado["dia_semana"], esperado["hora"]] / 1000
+    assert np.allclose(esperado["pv_bat"], obtido)
+    assert np.isclose(repartida.sum(), producao.sum())
+
+    print(f"{linhas} bateladas, {len(dataset.consolidado_hora.tabela)} linhas no consolidado por hora")
+    print(f"groupby + reindex:        {t_groupby * 1000:8.1f} ms")
+    print(f"bincount (consolidado):   {t_consolidado * 1000:8.1f} ms")
+    print(f"bincount (bateladas):     {t_bateladas * 1000:8.1f} ms")
+    print(f"bincount (intervalos):    {t_intervalos * 1000:8.1f} ms")
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Resumo do Período de uma safra inteira (todos os lotes do arquivo) enviado
+inteiro ao navegador x só a página visível (busca e ordenação feitas no servidor).
+
+Uso: python benchmarks/bench_tabelas.py [linhas]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from derivados import calcular
+from ingestao import normalizar_arquivo, processar_dados
+from tabelas import ESTILOS_BORDAS, LINHAS_POR_PAGINA, fora_da_faixa, posicoes_tabela, tabela_html
+
+FORMATOS = {
+    "Início": "{:%d-%m-%Y / %H:%M:%S}",
+    "Fim": "{:%H:%M:%S}",
+    "Qtd. Tratada": "{:.2f} Ton",
+    "Qtd. Necessária": "{:.2f}",
+    "Qtd. Dosada": "{:.2f}",
+    "Variação Dosagem": "{:.3f} %",
+}
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+# Página visível como em tabela_paginada: posições buscadas/ordenadas e só as linhas da página
+def pagina(df, destaque, busca="", ordenar_por=None):
+    posicoes = posicoes_tabela(df, busca, ordenar_por, crescente=False)[:LINHAS_POR_PAGINA]
+    return tabela_html(df.take(posicoes), "resumo_periodo", FORMATOS, ESTILOS_BORDAS, destaque[posicoes])
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas, lotes_sequenciais=True)))
+    dataset = Dataset(df, dosadores)
+    inicio = df["hora_ini"].min().normalize()
+    fim = df["hora_fim"].max().normalize() + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    df_agrupado = calcular(dataset, "lotes_periodo", inicio=inicio, fim=fim)
+    destaque = fora_da_faixa(df_agrupado["Variação Dosagem"])
+    print(f"{linhas} bateladas, {len(df_agrupado)} linhas na tabela")
+
+    print(f"{'tabela':<28} {'tempo (ms)':>10} {'HTML (KB)':>10}")
+    for nome, func in (
+        ("inteira", lambda: tabela_html(df_agrupado, "resumo_periodo", FORMATOS, ESTILOS_BORDAS, destaque)),
+        ("página", lambda: pagina(df_agrupado, destaque)),
+        ("página ordenada", lambda: pagina(df_agrupado, destaque, ordenar_por="Variação Dosagem")),
+        ("página com busca", lambda: pagina(df_agrupado, destaque, busca="rec 01")),
+    ):
+        tempo, html = cronometrar(func)
+        print(f"{nome:<28} {tempo * 1000:>10.1f} {len(html.encode()) / 2**10:>10.1f}")
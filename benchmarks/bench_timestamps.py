@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: montagem dos timestamps de início/fim (df.apply linha a linha x vetorizado).
+
+Uso: python benchmarks/bench_timestamps.py
+"""
+
+import time
+
+import pandas as pd
+
+from dados_sinteticos import gerar_horarios
+from ingestao import montar_timestamps
+
+
+# Implementação anterior, com um df.apply por etapa
+def montar_timestamps_apply(df):
+    df["data"] = pd.to_datetime(df["data"])
+    df["hora_ini"] = df.apply(lambda row: row["hora_ini"].replace(year=row["data"].year,
+                                                                month=row["data"].month,
+                                                                day=row["data"].day), axis=1)
+    df["hora_fim"] = df.apply(lambda row: row["hora_fim"].replace(year=row["data"].year,
+                                                                month=row["data"].month,
+                                                                day=row["data"].day), axis=1)
+    df["hora_ini"] = df.apply(
+        lambda row: row["hora_ini"] - pd.Timedelta(days=1) if row["hora_fim"] < row["hora_ini"] else row["hora_ini"],
+        axis=1
+    )
+    return df
+
+
+def cronometrar(func, df):
+    inicio = time.perf_counter()
+    resultado = func(df.copy())
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    print(f"{'linhas':>10} {'apply (s)':>12} {'vetorizado (s)':>15} {'ganho':>8}")
+    for n in (1_000, 10_000, 100_000, 300_000):
+        df = gerar_horarios(n)
+        t_apply, esperado = cronometrar(montar_timestamps_apply, df)
+        t_vet, obtido = cronometrar(montar_timestamps, df)
+        pd.testing.assert_frame_equal(esperado, obtido, check_dtype=False)
+        print(f"{n:>10} {t_apply:>12.3f} {t_vet:>15.4f} {t_apply / t_vet:>7.0f}x")
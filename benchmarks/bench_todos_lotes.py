@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: tabela do lote para todos os pares (lote, receita) calculando lote a lote
+(como clicar em cada um na página Lote) x uma única passagem agrupada, e exportação.
+
+Uso: python benchmarks/bench_todos_lotes.py [linhas]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao  # Deve vir antes dos módulos do app (ajusta o sys.path)
+from dataset import Dataset
+from derivados import produtos_lote
+from ingestao import normalizar_arquivo, processar_dados
+from lotes import exportar_parquet, exportar_planilha, somar_produtos_por_lote
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+# Tabela da página Lote de cada par (lote, receita), com o par identificado nas colunas Lote e Tratamento
+def lote_a_lote(dataset):
+    indice = dataset.indice_lotes
+    return [
+        produtos_lote(dataset, dataset.df.take(indice.posicoes(lote, receita))).assign(Lote=lote, Tratamento=receita)
+        for lote in indice.lotes for receita in indice.receitas(lote)
+    ]
+
+
+# Tabelas indexadas por (lote, receita, produto) para comparar valores sem depender da ordem dos empates
+def comparavel(tabela):
+    tabela = tabela.astype({"Lote": str, "Tratamento": str, "Produto": str})
+    return tabela.set_index(["Lote", "Tratamento", "Produto"]).sort_index()
+
+
+# Confere que a passagem agrupada tem os mesmos produtos e valores que o cálculo lote a lote
+def conferir(tabelas, tabela):
+    esperado = comparavel(pd.concat(tabelas, ignore_index=True))
+    obtido = comparavel(tabela)[esperado.columns]
+    assert esperado.index.equals(obtido.index)
+    assert np.allclose(esperado.to_numpy(dtype="float64"), obtido.to_numpy(dtype="float64"))
+
+
+if __name__ == "__main__":
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(linhas, lotes_sequenciais=True)))
+    dataset = Dataset(df, dosadores)
+    dataset.matrizes, dataset.indice_lotes  # Montados uma vez por conjunto de dados, fora da medição
+    pv_bat = df["pv_bat"].to_numpy(dtype="float64")
+
+    t_lotes, tabelas = cronometrar(lambda: lote_a_lote(dataset))
+    t_agrupado, tabela = cronometrar(lambda: somar_produtos_por_lote(dataset.indice_lotes, dataset.matrizes, pv_bat))
+    conferir(tabelas, tabela)
+    t_planilha, planilha = cronometrar(lambda: exportar_planilha(tabela))
+    t_parquet, parquet = cronometrar(lambda: exportar_parquet(tabela))
+
+    print(f"{linhas} bateladas, {len(dataset.indice_lotes.pares)} pares (lote, receita), {len(tabela)} linhas")
+    print(f"lote a lote:        {t_lotes * 1000:8.0f} ms")
+    print(f"passagem agrupada:  {t_agrupado * 1000:8.0f} ms")
+    print(f"planilha (Excel):   {t_planilha * 1000:8.0f} ms  {len(planilha) / 2**20:6.1f} MB")
+    print(f"Parquet:            {t_parquet * 1000:8.0f} ms  {len(parquet) / 2**20:6.1f} MB")
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: gráfico de variação de dosagem de um período longo com todos os lotes
+x linha reduzida aos mínimos/máximos (graficos.reduzir_min_max) e todos os lotes fora da faixa.
+
+Uso: python benchmarks/bench_variacao.py [lotes]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import dados_sinteticos  # noqa: F401  Deve vir antes dos módulos do app (ajusta o sys.path)
+from graficos import grafico_variacao_dosagem
+
+
+def cronometrar(func):
+    inicio = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    lotes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    df_agrupado = pd.DataFrame({
+        "Início": pd.date_range("2024-01-01", periods=lotes, freq="15min"),
+        "Lote": [f"L{i:06d}" for i in range(lotes)],
+        "Receita": "REC 01",
+        "Variação Dosagem": rng.normal(0, 2, lotes),
+    })
+
+    print(f"{lotes} lotes, {int((df_agrupado['Variação Dosagem'].abs() > 5).sum())} fora da faixa")
+    print(f"{'série':<12} {'tempo (ms)':>10} {'JSON (KB)':>10} {'pontos':>8}")
+    for nome, pontos in (("inteira", lotes), ("reduzida", None)):
+        args = (df_agrupado,) if pontos is None else (df_agrupado, pontos)
+        tempo, fig = cronometrar(lambda: grafico_variacao_dosagem(*args).to_json())
+        n = sum(len(trace.x) for trace in grafico_variacao_dosagem(*args).data)
+        print(f"{nome:<12} {tempo * 1000:>10.0f} {len(fig) / 2**10:>10.0f} {n:>8}")
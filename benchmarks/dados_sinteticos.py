@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Geração de registros sintéticos de bateladas para os benchmarks.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Permite importar os módulos do app a partir da pasta benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Bateladas com data e horários no formato em que chegam após a leitura do arquivo
+def gerar_horarios(n, seed=0):
+    rng = np.random.default_rng(seed)
+    dias = pd.Timestamp("2024-11-01") + pd.to_timedelta(rng.integers(0, 120, n), unit="D")
+    fim = rng.integers(0, 86400, n)
+    duracao = rng.integers(60, 900, n)
+    ini = (fim - duracao) % 86400
+    return pd.DataFrame({
+        "data": dias,
+        "hora_ini": pd.to_datetime(pd.to_timedelta(ini, unit="s").astype(str).str[-8:], format="%H:%M:%S"),
+        "hora_fim": pd.to_datetime(pd.to_timedelta(fim, unit="s").astype(str).str[-8:], format="%H:%M:%S"),
+    })
+
+
+# Exportação de bateladas como retornada por pd.read_excel (nomes originais das colunas)
+# Com lotes_sequenciais=True cada lote ocupa bateladas consecutivas no tempo e tem
+# receita, espécie, peneira, ensaque e operador fixos, como em uma produção real
+def gerar_exportacao(n, n_ed=10, n_dp=4, seed=0, lotes_sequenciais=False):
+    rng = np.random.default_rng(seed)
+    horarios = gerar_horarios(n, seed)
+    lotes = np.array([f"L{i:05d}" for i in range(max(n // 40, 1))])
+    receitas = np.array([f"REC {i:02d}" for i in range(25)])
+    produtos = np.array([f"PRODUTO {i:02d}" for i in range(40)])
+    pv_bat = rng.normal(500, 20, n).round(1)
+
+    df = pd.DataFrame({
+        "Date": horarios["data"],
+        "Time": pd.to_timedelta(horarios["hora_fim"].dt.strftime("%H:%M:%S")),
+        "Hora Inicial": horarios["hora_ini"].dt.strftime("%H:%M:%S"),
+        "Lote": rng.choice(lotes, n),
+        "Espécie": rng.choice(["SOJA", "MILHO", "TRIGO"], n),
+        "Categoria": rng.choice(["C1", "C2", "S1", "S2"], n),
+        "Cultivar": rng.choice([f"CULT {i}" for i in range(30)], n),
+        "Peneira": rng.choice(["5.5", "6.0", "6.5", "7.0"], n),
+        "Ensaque": rng.choice(["BIG BAG", "SACARIA 40KG", "GRANEL"], n),
+        "Operador": rng.choice(["ANA", "BRUNO", "CARLOS", "DANIELA"], n),
+        "Observação": rng.choice(["", "", "", "TROCA DE LOTE", "PARADA"], n),
+        "Peso de Mil Sementes": rng.normal(160, 10, n).round(1),
+        "Núm. Batelada": rng.integers(1, 200, n),
+        "Receita Selecionada": rng.choice(receitas, n),
+        "Tratamento Solicitado (Kg)": pv_bat * 40,
+        "Sementes Tratadas (Kg)": pv_bat * 38,
+        "SP Batelada (Kg)": np.full(n, 500.0),
+        "PV Batelada (Kg)": pv_bat,
+        "Tempo de Ciclo": rng.integers(60, 900, n),
+    })
+    canais = [(f"ED{i:02d}", "L") for i in range(1, n_ed + 1)] + [(f"DP{i:02d}", "Kg") for i in range(1, n_dp + 1)]
+    colunas = {}
+    for dosador, unid in canais:
+        sp_rec = rng.uniform(0.05, 1.5, n).round(3)
+        sp_dos = (pv_bat / 100 * sp_rec).round(3)
+        erro = rng.normal(0, 3, n).round(2)
+        colunas[f"SP Receita - {dosador} ({unid})"] = sp_rec
+        colunas[f"SP Dosagem - {dosador} ({unid})"] = sp_dos
+        colunas[f"PV Dosagem - {dosador} ({unid})"] = (sp_dos * (1 + erro / 100)).round(3)
+        colunas[f"Erro Dosagem - {dosador} (%)"] = erro
+        colunas[f"Produto {dosador}"] = rng.choice(produtos, n)
+        colunas[f"Densidade {dosador}"] = np.full(n, 1.0)
+        colunas[f"Unid medida {dosador}"] = np.full(n, unid)
+    df = pd.concat([df, pd.DataFrame(colunas)], axis=1)
+
+    if lotes_sequenciais:
+        ordem = np.argsort((horarios["data"] + (horarios["hora_fim"] - horarios["hora_fim"].dt.normalize())).to_numpy())
+        lote_da_batelada = np.empty(n, dtype=np.int64)
+        lote_da_batelada[ordem] = np.arange(n) * len(lotes) // n
+        df["Lote"] = lotes[lote_da_batelada]
+        for coluna in ("Espécie", "Peneira", "Ensaque", "Operador", "Receita Selecionada"):
+            df[coluna] = rng.choice(df[coluna].unique(), len(lotes))[lote_da_batelada]
+    return df
+
+
+# Conteúdo .xlsx de uma exportação, com a coluna Time no formato de duração do CLP
+def gerar_xlsx(n, n_ed=10, n_dp=4, seed=0):
+    import io
+    import openpyxl
+
+    buffer = io.BytesIO()
+    gerar_exportacao(n, n_ed, n_dp, seed).to_excel(buffer, index=False)
+    wb = openpyxl.load_workbook(io.BytesIO(buffer.getvalue()))
+    for celula in wb.active["B"][1:]:
+        celula.number_format = "[h]:mm:ss"
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
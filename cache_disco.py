@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Cache em disco (Parquet) dos dados de bateladas já processados.
+
+A chave de cada entrada é o hash do conteúdo dos arquivos enviados; as
+entradas ficam em uma pasta por versão das regras de normalização, de modo
+que qualquer mudança no mapeamento de colunas invalida o cache anterior.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from mapeamento import versao_mapeamento
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Sem pyarrow o cache fica desativado
+    pa = None
+
+# Incrementar sempre que a lógica de normalização/correção mudar
+VERSAO_NORMALIZACAO = 6
+
+# Pasta e tamanho máximo do cache (configuráveis por variáveis de ambiente)
+PASTA_CACHE = os.environ.get("MRB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "mrb_cache"))
+TAMANHO_MAX_CACHE = int(os.environ.get("MRB_CACHE_MAX_MB", 512)) * 1024 * 1024
+
+
+# Versão das regras: número da normalização + hash das tabelas de mapeamento de colunas
+def versao_regras():
+    return f"v{VERSAO_NORMALIZACAO}_{versao_mapeamento()}"
+
+
+# Chave de cache a partir da lista de arquivos enviados (nome, bytes), na ordem de envio
+def chave_arquivos(arquivos):
+    h = hashlib.blake2b(digest_size=20)
+    for nome, conteudo in arquivos:
+        h.update(os.path.splitext(nome)[1].lower().encode("utf-8"))
+        h.update(hashlib.blake2b(conteudo, digest_size=20).digest())
+    return h.hexdigest()
+
+
+# Chave de um único arquivo enviado (extensão + conteúdo, sem o nome), usada para
+# reconhecer no modo de anexar os arquivos que já fazem parte dos dados carregados
+def chave_arquivo(nome, conteudo):
+    return chave_arquivos([(nome, conteudo)])
+
+
+def _pasta_versao():
+    return os.path.join(PASTA_CACHE, versao_regras())
+
+
+# Recupera o DataFrame processado, os dosadores e os avisos da carga; None se não estiver no cache
+def ler(chave):
+    if pa is None:
+        return None
+    caminho = os.path.join(_pasta_versao(), f"{chave}.parquet")
+    try:
+        tabela = pq.read_table(caminho)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    # Atualiza o horário de acesso (base do descarte LRU); falhar aqui não impede a leitura
+    try:
+        os.utime(caminho)
+    except OSError:
+        pass
+    metadados = tabela.schema.metadata
+    dosadores = json.loads(metadados[b"mrb_dosadores"])
+    avisos = [tuple(aviso) for aviso in json.loads(metadados.get(b"mrb_avisos", b"[]"))]
+    return tabela.to_pandas(), dosadores, avisos
+
+
+# Grava o DataFrame processado, os dosadores e os avisos informativos da carga no cache
+def salvar(chave, df, dosadores, avisos=()):
+    if pa is None:
+        return
+    pasta = _pasta_versao()
+    os.makedirs(pasta, exist_ok=True)
+    invalidar(manter=os.path.basename(pasta))
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[b"mrb_dosadores"] = json.dumps(dosadores).encode("utf-8")
+    metadados[b"mrb_avisos"] = json.dumps(list(avisos), ensure_ascii=False).encode("utf-8")
+    tabela = tabela.replace_schema_metadata(metadados)
+
+    # Escreve em arquivo temporário e renomeia, para não expor arquivos incompletos
+    fd, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(tabela, temporario)
+        os.replace(temporario, os.path.join(pasta, f"{chave}.parquet"))
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    descartar_excesso()
+
+
+# Remove as entradas menos usadas até o cache caber em TAMANHO_MAX_CACHE
+def descartar_excesso(tamanho_max=None):
+    tamanho_max = TAMANHO_MAX_CACHE if tamanho_max is None else tamanho_max
+    pasta = _pasta_versao()
+    if not os.path.isdir(pasta):
+        return
+    entradas = []
+    for nome in os.listdir(pasta):
+        if nome.endswith(".parquet"):
+            info = os.stat(os.path.join(pasta, nome))
+            entradas.append((info.st_mtime, info.st_size, nome))
+
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, nome in sorted(entradas):
+        if total <= tamanho_max:
+            break
+        os.remove(os.path.join(pasta, nome))
+        total -= tamanho
+
+
+# Apaga o cache de outras versões das regras (ou todo o cache, se manter=None)
+def invalidar(manter=None):
+    if not os.path.isdir(PASTA_CACHE):
+        return
+    for nome in os.listdir(PASTA_CACHE):
+        if nome != manter:
+            shutil.rmtree(os.path.join(PASTA_CACHE, nome), ignore_errors=True)
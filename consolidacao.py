@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Consolidado (rollup) das bateladas por hora e por dia.
+
+Cada linha agrupa as bateladas com o mesmo início e fim (truncados para a
+hora ou o dia) e as mesmas dimensões (receita, operador, ensaque, espécie,
+peneira), guardando apenas medidas aditivas. Os lotes de cada linha são
+guardados como pares (linha, código do lote), o que permite contar lotes
+distintos de forma exata em qualquer combinação de linhas.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Dimensões do consolidado (além do início e do fim truncados)
+DIMENSOES = ["receita", "operador", "ensaque", "especie", "peneira"]
+
+# Medidas aditivas: nome -> (coluna de origem, agregação)
+MEDIDAS = {
+    "bateladas": ("hora_ini", "size"),
+    "pv_bat_soma": ("pv_bat", "sum"),
+    "pv_bat_qtd": ("pv_bat", "count"),
+    "tempo_ciclo_soma": ("tempo_ciclo", "sum"),
+    "tempo_ciclo_qtd": ("tempo_ciclo", "count"),
+}
+
+UM_SEGUNDO = pd.Timedelta(seconds=1)
+
+
+@dataclass(frozen=True, eq=False)
+class Consolidado:
+    tabela: pd.DataFrame  # inicio, fim, dimensões e medidas, ordenada por inicio
+    lotes: pd.DataFrame  # Pares (linha da tabela, código do lote) sem repetição
+    categorias_lote: pd.Index  # Categorias da coluna lote (os pares guardam o código do lote)
+    grao: str  # "h" (hora) ou "D" (dia)
+
+
+# Agrupa as bateladas por (inicio, fim, dimensões) no grão pedido
+def montar_consolidado(df, grao="h"):
+    chaves = pd.DataFrame({
+        "inicio": df["hora_ini"].dt.floor(grao),
+        "fim": df["hora_fim"].dt.floor(grao),
+    })
+    for dimensao in DIMENSOES:
+        if dimensao in df.columns:
+            chaves[dimensao] = df[dimensao]
+    return _agrupar(chaves, df, df["lote"], grao)
+
+
+# Consolida para o grão diário a partir do consolidado horário (sem voltar às bateladas)
+def agregar_por_dia(consolidado):
+    tabela = consolidado.tabela
+    chaves = tabela.drop(columns=list(MEDIDAS))
+    chaves["inicio"] = chaves["inicio"].dt.floor("D")
+    chaves["fim"] = chaves["fim"].dt.floor("D")
+    return _reagrupar(consolidado, chaves, "D")
+
+
+# Junta dois consolidados do mesmo grão (ex.: histórico + bateladas anexadas) sem voltar às bateladas
+def combinar(consolidado, novo):
+    tabelas = [consolidado.tabela, novo.tabela]
+    for coluna in DIMENSOES:
+        if all(coluna in tabela.columns for tabela in tabelas):
+            uniao = union_categoricals([tabela[coluna].array for tabela in tabelas], sort_categories=True).categories
+            tabelas = [tabela.assign(**{coluna: tabela[coluna].cat.set_categories(uniao)}) for tabela in tabelas]
+    tabela = pd.concat(tabelas, ignore_index=True)
+
+    # Códigos de lote de cada consolidado convertidos para as categorias unidas
+    categorias_lote = consolidado.categorias_lote.union(novo.categorias_lote)
+    pares = pd.concat([
+        pd.DataFrame({
+            "linha": origem.lotes["linha"].to_numpy() + deslocamento,
+            "lote": categorias_lote.get_indexer(origem.categorias_lote)[origem.lotes["lote"].to_numpy()],
+        })
+        for origem, deslocamento in ((consolidado, 0), (novo, len(consolidado.tabela)))
+    ], ignore_index=True)
+
+    juntos = Consolidado(tabela, pares, categorias_lote, consolidado.grao)
+    return _reagrupar(juntos, tabela.drop(columns=list(MEDIDAS)), consolidado.grao)
+
+
+# Resumo (KPIs) das bateladas que começam a partir de inicio e terminam até fim
+# Exige inicio e fim + 1 s alinhados ao grão do consolidado
+def resumir(consolidado, inicio, fim):
+    tabela = consolidado.tabela
+    selecao = ((tabela["inicio"] >= inicio) & (tabela["fim"] < fim + UM_SEGUNDO)).to_numpy()
+    linhas = tabela[selecao]
+
+    pares = consolidado.lotes
+    codigos = pares["lote"].to_numpy()[selecao[pares["linha"].to_numpy()]]
+    presentes = np.zeros(len(consolidado.categorias_lote), dtype=bool)
+    presentes[codigos] = True
+
+    receitas = linhas["receita"].nunique() if "receita" in linhas.columns else 0
+    return _resumo(
+        bateladas=int(linhas["bateladas"].sum()),
+        pv_bat_soma=linhas["pv_bat_soma"].sum(), pv_bat_qtd=linhas["pv_bat_qtd"].sum(),
+        tempo_ciclo_soma=linhas["tempo_ciclo_soma"].sum(), tempo_ciclo_qtd=linhas["tempo_ciclo_qtd"].sum(),
+        lotes=int(presentes.sum()), receitas=receitas,
+    )
+
+
+# Mesmo resumo calculado diretamente das bateladas
+def resumir_bateladas(df):
+    return _resumo(
+        bateladas=len(df),
+        pv_bat_soma=df["pv_bat"].sum(), pv_bat_qtd=df["pv_bat"].count(),
+        tempo_ciclo_soma=df["tempo_ciclo"].sum(), tempo_ciclo_qtd=df["tempo_ciclo"].count(),
+        lotes=df["lote"].nunique(), receitas=df["receita"].nunique(),
+    )
+
+
+# Produção (Kg) por combinação das dimensões, das linhas do período (mesma seleção de resumir)
+def somar_producao(consolidado, inicio, fim):
+    tabela = consolidado.tabela
+    selecao = ((tabela["inicio"] >= inicio) & (tabela["fim"] < fim + UM_SEGUNDO)).to_numpy()
+    return _producao(tabela[selecao], "pv_bat_soma")
+
+
+# Mesma produção calculada diretamente das bateladas
+def somar_producao_bateladas(df):
+    return _producao(df, "pv_bat")
+
+
+# Produção (Kg) e bateladas por dia da semana (0 = segunda-feira) x hora de término (matrizes 7 x 24),
+# das linhas do período (mesma seleção de resumir); exige o consolidado por hora
+def somar_semana_hora(consolidado, inicio, fim):
+    tabela = consolidado.tabela
+    selecao = ((tabela["inicio"] >= inicio) & (tabela["fim"] < fim + UM_SEGUNDO)).to_numpy()
+    linhas = tabela[selecao]
+    return _semana_hora(_horas(linhas["fim"]), linhas["pv_bat_soma"], linhas["bateladas"])
+
+
+# Mesmas matrizes calculadas diretamente das bateladas
+# Com dividir=True a produção de cada batelada é repartida entre as horas do seu intervalo
+# (início a fim), proporcionalmente ao tempo em cada hora, e a batelada conta em cada uma delas
+def somar_semana_hora_bateladas(df, dividir=False):
+    if not dividir:
+        return _semana_hora(_horas(df["hora_fim"]), df["pv_bat"])
+
+    inicio = df["hora_ini"].to_numpy(dtype="datetime64[ns]")
+    fim = df["hora_fim"].to_numpy(dtype="datetime64[ns]")
+    validas = ~(np.isnat(inicio) | np.isnat(fim)) & (fim >= inicio)
+    inicio, fim = inicio[validas], fim[validas]
+    pv_bat = df["pv_bat"].to_numpy(dtype="float64")[validas]
+
+    # Um trecho por hora coberta pela batelada
+    hora_inicio = inicio.astype("datetime64[h]")
+    trechos = (fim.astype("datetime64[h]") - hora_inicio).astype("int64") + 1
+    batelada = np.repeat(np.arange(len(inicio)), trechos)
+    hora = hora_inicio[batelada] + (np.arange(len(batelada)) - np.repeat(np.cumsum(trechos) - trechos, trechos))
+
+    # Fração do intervalo da batelada dentro de cada hora (batelada sem duração: tudo na única hora)
+    dentro = (np.minimum(fim[batelada], hora + np.timedelta64(1, "h")) - np.maximum(inicio[batelada], hora))
+    duracao = (fim - inicio)[batelada].astype("float64")
+    fracao = np.divide(dentro.astype("float64"), duracao, out=np.ones(len(batelada)), where=duracao > 0)
+    return _semana_hora(hora.astype("int64"), pv_bat[batelada] * fracao)
+
+
+# Verifica se o período pode ser respondido pelo consolidado no grão informado
+def alinhado(inicio, fim, grao):
+    return inicio == inicio.floor(grao) and fim + UM_SEGUNDO == (fim + UM_SEGUNDO).floor(grao)
+
+
+def _resumo(bateladas, pv_bat_soma, pv_bat_qtd, tempo_ciclo_soma, tempo_ciclo_qtd, lotes, receitas):
+    return {
+        "num_bateladas": bateladas,
+        "producao": pv_bat_soma,  # Kg
+        "tempo_total": tempo_ciclo_soma,  # s
+        "media_bat": pv_bat_soma / pv_bat_qtd if pv_bat_qtd else np.nan,
+        "tempo_med_bat": tempo_ciclo_soma / tempo_ciclo_qtd if tempo_ciclo_qtd else np.nan,
+        "num_lotes": lotes,
+        "num_receitas": receitas,
+    }
+
+
+def _producao(linhas, coluna):
+    dimensoes = [dimensao for dimensao in DIMENSOES if dimensao in linhas.columns]
+    grupos = linhas.groupby(dimensoes, observed=True, dropna=False, sort=True)[coluna]
+    return grupos.sum().rename("pv_bat").reset_index()
+
+
+# Horas desde 01/01/1970 (uma quinta-feira) de cada instante; NaT vira -1
+def _horas(instantes):
+    horas = instantes.to_numpy(dtype="datetime64[ns]").astype("datetime64[h]")
+    return np.where(np.isnat(horas), -1, horas.astype("int64"))
+
+
+# Soma os pesos e conta as linhas por célula (dia da semana, hora) com um único bincount cada
+def _semana_hora(horas, pesos, contagem=None):
+    horas = np.asarray(horas)
+    validas = horas >= 0
+    celula = (((horas[validas] // 24) + 3) % 7) * 24 + horas[validas] % 24
+    pesos = np.nan_to_num(np.asarray(pesos, dtype="float64")[validas])
+    contagem = None if contagem is None else np.asarray(contagem, dtype="float64")[validas]
+    producao = np.bincount(celula, weights=pesos, minlength=7 * 24).reshape(7, 24)
+    bateladas = np.bincount(celula, weights=contagem, minlength=7 * 24).reshape(7, 24)
+    return producao, bateladas.astype("int64")
+
+
+# Numera os grupos de chaves (em ordem) e devolve (número do grupo de cada linha, chaves de cada grupo)
+def _grupos(chaves):
+    grupos = chaves.groupby(list(chaves.columns), observed=True, dropna=False, sort=True)
+    return grupos.ngroup().to_numpy(), grupos.size().index.to_frame(index=False)
+
+
+def _agrupar(chaves, valores, lotes, grao):
+    linha, tabela = _grupos(chaves)
+    for medida, (coluna, agregacao) in MEDIDAS.items():
+        tabela[medida] = valores[coluna].groupby(linha, sort=True).agg(agregacao).to_numpy()
+
+    codigos = lotes.cat.codes.to_numpy()
+    validos = codigos >= 0
+    pares = pd.DataFrame({"linha": linha[validos], "lote": codigos[validos]})
+    return Consolidado(tabela, pares.drop_duplicates().reset_index(drop=True), lotes.cat.categories, grao)
+
+
+def _reagrupar(consolidado, chaves, grao):
+    linha, tabela = _grupos(chaves)
+    somas = consolidado.tabela[list(MEDIDAS)].groupby(linha, sort=True).sum()
+    for medida in MEDIDAS:
+        tabela[medida] = somas[medida].to_numpy()
+
+    pares = consolidado.lotes
+    pares = pd.DataFrame({"linha": linha[pares["linha"].to_numpy()], "lote": pares["lote"].to_numpy()})
+    return Consolidado(tabela, pares.drop_duplicates().reset_index(drop=True), consolidado.categorias_lote, grao)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Conjunto de dados publicado pela etapa "Carregar Dados" e lido pelas páginas.
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import pandas as pd
+
+from consolidacao import (agregar_por_dia, alinhado, combinar, montar_consolidado, resumir, resumir_bateladas,
+                          somar_producao, somar_producao_bateladas, somar_semana_hora, somar_semana_hora_bateladas)
+from dosagem import montar_tabela_dosagem
+from lotes import montar_indice_lotes
+from matrizes import montar_matrizes
+from ingestao import anexar_dados
+
+
+# Dados de bateladas já finalizados (colunas padronizadas, correções aplicadas e sem duplicatas)
+# As bateladas estão ordenadas por hora_ini, o que permite consultar períodos por busca binária
+@dataclass(frozen=True, eq=False)
+class Dataset:
+    df: pd.DataFrame
+    dosadores: list = field(default_factory=list)
+    chave: str = ""  # Hash do conteúdo dos arquivos que originaram os dados
+    envios: tuple = ()  # Chaves de cada arquivo incluído (cache_disco.chave_arquivo)
+
+    def __len__(self):
+        return len(self.df)
+
+    # Novo conjunto com as bateladas de novos arquivos acrescentadas (df_novo já processado,
+    # chaves_arquivos com a chave de cada arquivo novo)
+    # Consolidados já calculados são atualizados somente com as bateladas novas
+    # Retorna (dataset, número de bateladas repetidas descartadas)
+    def anexar(self, df_novo, dosadores_novos, chaves_arquivos):
+        df, dosadores, novas, repetidas = anexar_dados(self.df, self.dosadores, df_novo, dosadores_novos)
+        chave = hashlib.blake2b((self.chave + "".join(chaves_arquivos)).encode("utf-8"), digest_size=20).hexdigest()
+        dataset = Dataset(df, dosadores, chave, self.envios + tuple(chaves_arquivos))
+
+        if "consolidado_hora" in self.__dict__:
+            novo_hora = montar_consolidado(novas, "h")
+            dataset.__dict__["consolidado_hora"] = combinar(self.consolidado_hora, novo_hora)
+            if "consolidado_dia" in self.__dict__:
+                dataset.__dict__["consolidado_dia"] = combinar(self.consolidado_dia, agregar_por_dia(novo_hora))
+        return dataset, repetidas
+
+    # Linhas alteradas por cada regra de correção de dosagem na carga (dosador x regra)
+    @property
+    def correcoes(self):
+        return pd.DataFrame.from_dict(self.df.attrs.get("correcoes", {}), orient="index")
+
+    # Resultados dos nós de derivados.py já calculados para esta versão dos dados (por nó e filtro)
+    @cached_property
+    def derivados(self):
+        return OrderedDict()
+
+    # Matrizes (bateladas x dosadores) de sp_dos, pv_dos, erro_dos e códigos de produto
+    @cached_property
+    def matrizes(self):
+        return montar_matrizes(self.df, self.dosadores)
+
+    # Tabela longa de dosagem (batelada, canal, produto, sp_dos, pv_dos, erro_dos), vista das matrizes
+    @cached_property
+    def dosagem(self):
+        return montar_tabela_dosagem(self.matrizes)
+
+    # Índice lote -> receita -> posições das bateladas (seletores da página Lote)
+    @cached_property
+    def indice_lotes(self):
+        return montar_indice_lotes(self.df)
+
+    # Bateladas que começam em [inicio, ...] e terminam até fim
+    # Como hora_ini <= hora_fim, só as bateladas com inicio <= hora_ini <= fim podem entrar:
+    # essa janela é localizada por busca binária e hora_fim é verificada apenas dentro dela
+    def periodo(self, inicio, fim):
+        inicios = self.df["hora_ini"]
+        a = inicios.searchsorted(inicio, side="left")
+        b = inicios.searchsorted(fim, side="right")
+        janela = self.df.iloc[a:b]
+        return janela[janela["hora_fim"] <= fim]
+
+    # Consolidados por hora e por dia (medidas aditivas por início, fim e dimensões)
+    @cached_property
+    def consolidado_hora(self):
+        return montar_consolidado(self.df, "h")
+
+    @cached_property
+    def consolidado_dia(self):
+        return agregar_por_dia(self.consolidado_hora)
+
+    # KPIs do período (produção, tempo efetivo, médias, número de bateladas, lotes e receitas)
+    # Períodos alinhados a dias ou horas são respondidos pelo consolidado, sem ler as bateladas
+    def resumo_periodo(self, inicio, fim):
+        if alinhado(inicio, fim, "D"):
+            return resumir(self.consolidado_dia, inicio, fim)
+        if alinhado(inicio, fim, "h"):
+            return resumir(self.consolidado_hora, inicio, fim)
+        return resumir_bateladas(self.periodo(inicio, fim))
+
+    # Produção (Kg) do período por combinação de receita, operador, ensaque, espécie e peneira
+    # Também respondida pelo consolidado quando o período está alinhado a dias ou horas
+    def producao_periodo(self, inicio, fim):
+        if alinhado(inicio, fim, "D"):
+            return somar_producao(self.consolidado_dia, inicio, fim)
+        if alinhado(inicio, fim, "h"):
+            return somar_producao(self.consolidado_hora, inicio, fim)
+        return somar_producao_bateladas(self.periodo(inicio, fim))
+
+    # Produção (Kg) e bateladas do período por dia da semana x hora (matrizes 7 x 24)
+    # Sem dividir os intervalos, períodos alinhados a horas são respondidos pelo consolidado por hora
+    def producao_semana_hora(self, inicio, fim, dividir=False):
+        if not dividir and alinhado(inicio, fim, "h"):
+            return somar_semana_hora(self.consolidado_hora, inicio, fim)
+        return somar_semana_hora_bateladas(self.periodo(inicio, fim), dividir)
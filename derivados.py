@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Dados derivados das bateladas (tabelas e agregados exibidos nas páginas) como nós
+nomeados de um grafo, calculados sob demanda.
+
+Cada nó declara os nós de que depende e os parâmetros de filtro que usa. Uma página
+pede apenas os nós que exibe com calcular(dataset, nome, **filtro); os resultados
+ficam memorizados no Dataset (uma versão dos dados) por nó e valores do filtro, de modo
+que uma nova execução do script com o mesmo filtro não recalcula nada.
+
+Os resultados memorizados são compartilhados entre execuções: as páginas não devem
+alterá-los (usar assign/copy antes de modificar colunas).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from consolidacao import resumir_bateladas
+from lotes import exportar_parquet, exportar_planilha, somar_produtos_por_lote
+
+MAX_RESULTADOS = 32  # Resultados memorizados por conjunto de dados (os menos usados saem primeiro)
+
+NOS = {}
+
+
+@dataclass(frozen=True)
+class No:
+    nome: str
+    funcao: object
+    depende: tuple  # Nós cujos resultados são passados para a função, na ordem
+    parametros: tuple  # Parâmetros de filtro recebidos pela função
+    filtro: tuple  # Parâmetros do nó e dos nós de que depende (chave da memória)
+
+
+# Registra a função como nó do grafo
+# A função recebe o dataset, os resultados das dependências e os parâmetros próprios do nó
+def no(nome, depende=(), parametros=()):
+    def registrar(funcao):
+        filtro = list(parametros)
+        for dependencia in depende:
+            filtro += [p for p in NOS[dependencia].filtro if p not in filtro]
+        NOS[nome] = No(nome, funcao, tuple(depende), tuple(parametros), tuple(filtro))
+        return funcao
+    return registrar
+
+
+# Resultado do nó para o filtro informado, calculando as dependências que faltarem
+def calcular(dataset, nome, **filtro):
+    definicao = NOS[nome]
+    chave = (nome,) + tuple(filtro[p] for p in definicao.filtro)
+    memoria = dataset.derivados
+    if chave in memoria:
+        memoria.move_to_end(chave)
+        return memoria[chave]
+
+    entradas = [calcular(dataset, dependencia, **filtro) for dependencia in definicao.depende]
+    resultado = definicao.funcao(dataset, *entradas, **{p: filtro[p] for p in definicao.parametros})
+
+    memoria[chave] = resultado
+    if len(memoria) > MAX_RESULTADOS:
+        memoria.popitem(last=False)
+    return resultado
+
+
+# Consumo por produto (L) das bateladas informadas, sem produtos zerados, em ordem crescente
+def _consumo_por_produto(dataset, bateladas=None):
+    if dataset.matrizes.vazia:
+        return pd.DataFrame(columns=["Produto", "Consumo"])
+    df_resultado = dataset.matrizes.somar_por_produto(bateladas)
+    df_resultado = df_resultado.rename(columns={"pv_dos": "Consumo"})[["Produto", "Consumo"]]
+    df_resultado = df_resultado.dropna()
+    df_resultado = df_resultado[df_resultado["Consumo"] != 0]
+    df_resultado["Consumo"] = df_resultado["Consumo"] / 1000
+    return df_resultado.sort_values(by="Consumo", ascending=True)
+
+
+# Consumo
+@no("consumo_por_receita")
+def consumo_por_receita(dataset):
+    df_consumo = dataset.df.groupby("receita", observed=True).agg({"total_consumo": "sum", "pv_bat": "sum"}).reset_index()
+    df_consumo.rename(columns={"receita": "Receita", "total_consumo": "Consumo", "pv_bat": "Produção"}, inplace=True)
+    df_consumo["Consumo"] = df_consumo["Consumo"] / 1000
+    df_consumo["Produção"] = df_consumo["Produção"] / 1000
+    return df_consumo.sort_values(by="Consumo", ascending=False)
+
+
+@no("consumo_por_produto")
+def consumo_por_produto(dataset):
+    return _consumo_por_produto(dataset)
+
+
+# Período e Produção
+@no("bateladas_periodo", parametros=("inicio", "fim"))
+def bateladas_periodo(dataset, inicio, fim):
+    return dataset.periodo(inicio, fim)
+
+
+@no("resumo_periodo", parametros=("inicio", "fim"))
+def resumo_periodo(dataset, inicio, fim):
+    return dataset.resumo_periodo(inicio, fim)
+
+
+@no("consumo_por_produto_periodo", depende=("bateladas_periodo",))
+def consumo_por_produto_periodo(dataset, df_filtrado):
+    return _consumo_por_produto(dataset, df_filtrado.index)
+
+
+# Resumo por lote e receita do período, em ordem cronológica de início
+# Os valores permanecem numéricos (Ton, %) e as horas como datas; a formatação fica para a exibição
+@no("lotes_periodo", depende=("bateladas_periodo",))
+def lotes_periodo(dataset, df_filtrado):
+    df_agrupado = df_filtrado.groupby(["lote", "receita"], observed=True).agg(
+        hora_inicio=("hora_ini", "min"),
+        hora_final=("hora_fim", "max"),
+        sementes_tratadas=("pv_bat", "sum"),
+        num_bateladas=("lote", "size"),
+        qtd_necessaria=("total_sp", "sum"),
+        qtd_dosada=("total_consumo", "sum")
+    ).reset_index()
+
+    # Convertendo as unidades para toneladas (divisão por 1000)
+    df_agrupado["sementes_tratadas"] = df_agrupado["sementes_tratadas"] / 1000
+    df_agrupado["qtd_necessaria"] = df_agrupado["qtd_necessaria"] / 1000
+    df_agrupado["qtd_dosada"] = df_agrupado["qtd_dosada"] / 1000
+
+    # Calculando Variação de Dosagem (%)
+    df_agrupado["variacao_dosagem"] = ((df_agrupado["qtd_dosada"] / df_agrupado["qtd_necessaria"]) - 1) * 100
+
+    # Ordenando pelo início (data e hora, não o texto formatado)
+    df_agrupado = df_agrupado.sort_values(by="hora_inicio", kind="stable", ignore_index=True)
+
+    # Reordenando e renomeando as colunas para exibição
+    return df_agrupado[[
+        "hora_inicio", "hora_final", "lote", "receita",
+        "sementes_tratadas", "num_bateladas",
+        "qtd_necessaria", "qtd_dosada", "variacao_dosagem"
+    ]].rename(columns={
+        "hora_inicio": "Início",
+        "hora_final": "Fim",
+        "lote": "Lote",
+        "receita": "Receita",
+        "sementes_tratadas": "Qtd. Tratada",
+        "num_bateladas": "Núm. Bateladas",
+        "qtd_necessaria": "Qtd. Necessária",
+        "qtd_dosada": "Qtd. Dosada",
+        "variacao_dosagem": "Variação Dosagem"
+    })
+
+
+# Produção (Kg) por combinação das dimensões do período (uma única agregação)
+@no("producao_dimensoes", parametros=("inicio", "fim"))
+def producao_dimensoes(dataset, inicio, fim):
+    return dataset.producao_periodo(inicio, fim)
+
+
+# Produção (Ton) por receita, operador, ensaque, espécie e peneira, somada da tabela acima
+# (valores ausentes formam uma categoria própria, como nas pizzas montadas das bateladas)
+@no("producao_por_dimensao", depende=("producao_dimensoes",))
+def producao_por_dimensao(dataset, df_dimensoes):
+    toneladas = df_dimensoes.assign(pv_bat=df_dimensoes["pv_bat"] / 1000)
+    return {
+        dimensao: toneladas.groupby(dimensao, as_index=False, observed=True, dropna=False)["pv_bat"].sum()
+        for dimensao in df_dimensoes.columns.drop("pv_bat")
+    }
+
+
+# Produção (Ton) por receita, em ordem crescente
+@no("producao_por_receita", depende=("producao_por_dimensao",))
+def producao_por_receita(dataset, producao):
+    return producao["receita"].dropna(subset="receita").sort_values(by="pv_bat", ascending=True)
+
+
+# Produção (Ton) por hora (linhas, da primeira à última hora com bateladas) x dia da semana
+# (colunas, 0 = segunda-feira), com as células sem bateladas zeradas
+def _tabela_semana_hora(producao, bateladas):
+    horas = np.flatnonzero(bateladas.sum(axis=0))
+    horas = np.arange(horas[0], horas[-1] + 1) if len(horas) else horas
+    return pd.DataFrame(
+        producao[:, horas].T / 1000,
+        index=pd.Index(horas, name="hora"),
+        columns=pd.RangeIndex(7, name="dia_semana"),
+    )
+
+
+# Pela hora de término de cada batelada
+@no("producao_semana_hora", parametros=("inicio", "fim"))
+def producao_semana_hora(dataset, inicio, fim):
+    return _tabela_semana_hora(*dataset.producao_semana_hora(inicio, fim))
+
+
+# Repartindo a produção de cada batelada entre as horas do seu intervalo
+@no("producao_semana_hora_intervalos", parametros=("inicio", "fim"))
+def producao_semana_hora_intervalos(dataset, inicio, fim):
+    return _tabela_semana_hora(*dataset.producao_semana_hora(inicio, fim, dividir=True))
+
+
+# Lote
+@no("bateladas_lote", parametros=("lote", "receita"))
+def bateladas_lote(dataset, lote, receita):
+    return dataset.df.take(dataset.indice_lotes.posicoes(lote, receita))
+
+
+# KPIs do lote/receita (mesmas chaves de resumir_bateladas, mais início e fim)
+@no("resumo_lote", depende=("bateladas_lote",))
+def resumo_lote(dataset, df_filtrado):
+    resumo = resumir_bateladas(df_filtrado)
+    resumo["inicio"] = df_filtrado["hora_ini"].min()
+    resumo["fim"] = df_filtrado["hora_fim"].max()
+    return resumo
+
+
+# Necessário e Total Dosado (L), Receita e Dose (ml/100Kg) e Variação (%) por produto do lote/receita
+@no("produtos_lote", depende=("bateladas_lote",))
+def produtos_lote(dataset, df_filtrado):
+    colunas = ["Produto", "Necessário", "Total Dosado", "Receita", "Dose", "Variação"]
+    soma_pv_bat = df_filtrado["pv_bat"].sum()
+    if soma_pv_bat == 0 or dataset.matrizes.vazia:
+        return pd.DataFrame(columns=colunas)
+
+    df_resultado = dataset.matrizes.somar_por_produto(df_filtrado.index)
+    df_resultado = df_resultado.rename(columns={"sp_dos": "Necessário", "pv_dos": "Total Dosado"})
+    df_resultado["Receita"] = (df_resultado["Necessário"] / soma_pv_bat) * 100
+    df_resultado["Dose"] = (df_resultado["Total Dosado"] / soma_pv_bat) * 100
+    df_resultado["Variação"] = ((df_resultado["Total Dosado"] / df_resultado["Necessário"]) - 1) * 100
+
+    df_resultado = df_resultado.dropna()
+    df_resultado = df_resultado[df_resultado["Necessário"] != 0]
+    df_resultado["Necessário"] = df_resultado["Necessário"] / 1000
+    df_resultado["Total Dosado"] = df_resultado["Total Dosado"] / 1000
+    return df_resultado.sort_values(by="Necessário", ascending=True)
+
+
+# Tabela do lote de todos os pares (lote, receita) e arquivos para exportação
+@no("produtos_todos_lotes")
+def produtos_todos_lotes(dataset):
+    return somar_produtos_por_lote(dataset.indice_lotes, dataset.matrizes, dataset.df["pv_bat"].to_numpy(dtype="float64"))
+
+
+@no("planilha_todos_lotes", depende=("produtos_todos_lotes",))
+def planilha_todos_lotes(dataset, tabela):
+    return exportar_planilha(tabela)
+
+
+@no("parquet_todos_lotes", depende=("produtos_todos_lotes",))
+def parquet_todos_lotes(dataset, tabela):
+    return exportar_parquet(tabela)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Tabela de dosagem em formato longo: uma linha por (batelada, dosador).
+
+É uma visão derivada das matrizes de dosagem (matrizes.py), para consultas e
+exportações que esperam uma linha por dosador; os somatórios das páginas
+continuam sendo feitos direto nas matrizes.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_DOSAGEM = ["batelada", "canal", "produto", "sp_dos", "pv_dos", "erro_dos"]
+
+
+# Monta a tabela longa a partir das matrizes de dosagem (matrizes.montar_matrizes),
+# opcionalmente só para algumas bateladas (posições no DataFrame de bateladas)
+# A coluna batelada é a posição da linha no DataFrame de bateladas
+def montar_tabela_dosagem(matrizes, bateladas=None):
+    if matrizes.vazia:
+        return pd.DataFrame({coluna: pd.Series(dtype="float64") for coluna in COLUNAS_DOSAGEM})
+
+    codigos, sp, pv, erro = matrizes.codigos, matrizes.sp, matrizes.pv, matrizes.erro
+    if bateladas is None:
+        bateladas = np.arange(sp.shape[0], dtype=np.int32)
+    else:
+        bateladas = np.asarray(bateladas, dtype=np.int64)
+        codigos, sp, pv, erro = codigos[bateladas], sp[bateladas], pv[bateladas], erro[bateladas]
+
+    # As matrizes guardam cada dosador contíguo: ravel em ordem Fortran já é a ordem canal a canal
+    n, n_canais = sp.shape
+    return pd.DataFrame({
+        "batelada": np.tile(bateladas, n_canais),
+        "canal": pd.Categorical.from_codes(np.repeat(np.arange(n_canais), n), categories=matrizes.canais),
+        "produto": pd.Categorical.from_codes(codigos.ravel(order="F"), categories=matrizes.produtos),
+        "sp_dos": sp.ravel(order="F"),
+        "pv_dos": pv.ravel(order="F"),
+        "erro_dos": erro.ravel(order="F"),
+    })
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Esquema de tipos compacto da tabela de bateladas.
+
+Textos repetitivos (lote, receita, produto...) são armazenados como categorias
+e as colunas numéricas de parâmetros por dosador são reduzidas para float32.
+Quantidades que são somadas nos relatórios (sp_dos, pv_dos, pv_bat, totais)
+permanecem em float64 para não acumular erro de arredondamento.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Colunas de texto com poucos valores distintos
+COLUNAS_CATEGORICAS = [
+    "lote", "especie", "categoria", "cultivar", "peneira",
+    "ensaque", "operador", "observacao", "receita",
+]
+
+# Colunas numéricas que não entram em somatórios
+COLUNAS_FLOAT32 = ["pms"]
+
+# Colunas inteiras pequenas (convertidas somente se os valores couberem no tipo)
+COLUNAS_INT16 = ["num_bat"]
+
+# Colunas por dosador (nome_prod01, sp_rec01, ...): prefixo -> tipo de armazenamento
+TIPOS_POR_DOSADOR = {
+    "nome_prod": "category",
+    "unid_med": "category",
+    "sp_rec": "float32",
+    "erro_dos": "float32",
+    "dens_prod": "float32",
+}
+
+_PADRAO_DOSADOR = re.compile(r"^(" + "|".join(TIPOS_POR_DOSADOR) + r")\d{2,}$")
+
+
+# Tipo de armazenamento de cada coluna presente no DataFrame
+def tipos_esquema(colunas):
+    tipos = {}
+    for coluna in colunas:
+        if coluna in COLUNAS_CATEGORICAS:
+            tipos[coluna] = "category"
+        elif coluna in COLUNAS_FLOAT32:
+            tipos[coluna] = "float32"
+        elif coluna in COLUNAS_INT16:
+            tipos[coluna] = "int16"
+        else:
+            encontrado = _PADRAO_DOSADOR.match(coluna)
+            if encontrado:
+                tipos[coluna] = TIPOS_POR_DOSADOR[encontrado.group(1)]
+    return tipos
+
+
+# Converte as colunas do DataFrame para o esquema compacto
+def aplicar_esquema(df):
+    limites_int16 = np.iinfo(np.int16)
+    for coluna, tipo in tipos_esquema(df.columns).items():
+        serie = df[coluna]
+        if tipo == "category":
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                continue
+        else:
+            # Valores não numéricos (ex.: densidade "1,05") viram NaN em vez de interromper a carga
+            serie = pd.to_numeric(serie, errors="coerce")
+        if tipo == "int16":
+            # Mantém o tipo numérico original se houver valores fora da faixa do int16
+            if serie.isna().any() or serie.min() < limites_int16.min or serie.max() > limites_int16.max:
+                df[coluna] = serie
+                continue
+        df[coluna] = serie.astype(tipo)
+    return df
+
+
+# Memória (bytes) de cada coluna antes e depois da conversão, da maior para a menor economia
+def relatorio_memoria(antes, depois):
+    relatorio = pd.DataFrame({
+        "antes": antes.memory_usage(index=False, deep=True),
+        "depois": depois.memory_usage(index=False, deep=True),
+    })
+    relatorio["tipo_antes"] = antes.dtypes.astype(str)
+    relatorio["tipo_depois"] = depois.dtypes.astype(str)
+    relatorio["economia"] = relatorio["antes"] - relatorio["depois"]
+    relatorio = relatorio.sort_values("economia", ascending=False)
+    relatorio.loc["TOTAL"] = [relatorio["antes"].sum(), relatorio["depois"].sum(), "", "", relatorio["economia"].sum()]
+    return relatorio
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Gráficos Plotly das páginas, montados a partir dos dados derivados (derivados.py).
+
+Usados tanto para exibir as páginas quanto para o relatório em PDF (relatorio.py).
+"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from tabelas import LIMITE_VARIACAO, fora_da_faixa
+
+PONTOS_VARIACAO = 1000  # Pontos no máximo por série do gráfico de variação de dosagem
+
+
+# Consumo por receita (pizza)
+def grafico_consumo_receita(df_consumo):
+    # Criando o gráfico de pizza
+    fig = px.pie(
+        df_consumo,
+        names="Receita",
+        values="Consumo",
+        title="Consumo por Receita",
+        color_discrete_sequence=px.colors.sequential.Oranges,
+        hole=0.3  # Gráfico do tipo donut
+        )
+    # Personalizando o conteúdo exibido ao passar o mouse
+    fig.update_traces(
+        textinfo='label+percent',  # Exibe rótulos e porcentagens
+        textfont_size=10,
+        hovertemplate=(
+            'Receita: %{label}<br>'  # Nome da receita
+            'Consumo: %{value:.2f} L<br>'  # Consumo com 2 casas decimais
+            'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
+        )
+    )
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.4,  # Centraliza o título
+        font=dict(size=14)
+        )
+    return fig
+
+
+# Consumo por produto (barras horizontais)
+def grafico_consumo_produto(df_somatorio):
+    # Criação do gráfico de barras horizontais
+    fig = px.bar(
+        df_somatorio,
+        y="Produto",  # Coluna para o eixo y (nomes dos produtos)
+        x="Consumo",  # Coluna para o eixo x (valores de consumo)
+        title="Consumo por Produto",
+        orientation="h",  # Gráfico de barras horizontais
+        color="Consumo",  # A cor das barras será baseada no consumo
+        color_continuous_scale=px.colors.sequential.Oranges  # Paleta de cores laranja
+    )
+
+    # Adicionando rótulos com valores nas barras
+    fig.update_traces(
+        texttemplate='%{x:.0f}',  # Exibe os valores no final das barras
+        textposition='outside',  # Coloca os valores fora das barras
+        textfont_size=10
+    )
+    # Exibir o valor do consumo com até 2 casas decimais ao passar o mouse sobre a barra
+    fig.update_traces(
+        hovertemplate='Produto: %{y}<br>Consumo: %{x:.2f} L'  # Exibe o valor do consumo com 2 casas decimais
+    )
+
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.4,  # Centraliza o título
+        font=dict(size=14)
+    )
+    return fig
+
+
+# Necessário x Total Dosado por produto do lote
+def grafico_produtos_lote(df_somatorio):
+    # Criando o gráfico de barras verticais
+    fig = px.bar(
+        df_somatorio,
+        x="Produto",  # Coluna para o eixo x
+        y=["Necessário", "Total Dosado"],  # Colunas para o eixo y
+        title="Consumo por Produto",
+        barmode="group",  # Barras agrupadas para comparar as variáveis
+        labels={"value": "Volume (L)", "variable": "Tipo"},  # Personalizar os rótulos dos eixos
+        color_discrete_map={"Total Dosado": "darkorange", "Necessário": "peachpuff"}  # Definir as cores para as categorias
+    )
+
+    # Adicionando rótulos com valores nas barras
+    fig.update_traces(
+        texttemplate='%{y:.3f}',  # Exibe os valores no final das barras
+        textposition='outside',  # Coloca os valores fora das barras
+        textfont_size=10
+    )
+    # Exibir o valor do consumo com até 2 casas decimais ao passar o mouse sobre a barra
+    fig.update_traces(
+        hovertemplate='Produto: %{x}<br>Volume (L): %{y:.3f}'  # Exibe o valor do consumo com 2 casas decimais
+    )
+
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.4,  # Centraliza o título
+        xaxis_title="Produto",  # Rótulo do eixo x
+        yaxis_title="Volume (L)",  # Rótulo do eixo y
+        font=dict(size=14),  # Configuração de fonte
+        legend_title_text="Volume Dosado"  # Título da legenda
+    )
+    return fig
+
+
+# Produção (Ton) por uma dimensão, já somada por categoria (pizza)
+def grafico_pizza_producao(df_producao, coluna, titulo, rotulo):
+    # Criando o gráfico de pizza
+    fig = px.pie(
+        df_producao,
+        names=coluna,
+        values="pv_bat",
+        title=titulo,
+        color_discrete_sequence=px.colors.sequential.Oranges,
+        hole=0.3  # Gráfico do tipo donut
+        )
+    # Personalizando o conteúdo exibido ao passar o mouse
+    fig.update_traces(
+        textinfo='label+percent',  # Exibe rótulos e porcentagens
+        textfont_size=10,
+        hovertemplate=(
+            f'{rotulo}: %{{label}}<br>'  # Nome da receita
+            'Produção: %{value:.2f} Ton<br>'  # Consumo com 2 casas decimais
+            'Percentual: %{percent:.1%}'  # Percentual com 1 casa decimal
+        )
+    )
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.2,  # Centraliza o título
+        font=dict(size=14)
+        )
+    return fig
+
+
+# Produção por receita (barras)
+def grafico_producao_receita(df_filtrado_agrupado):
+    # Criar uma lista de tons de laranja
+    orange_scale = px.colors.sequential.Oranges
+
+    # Mapeando as receitas para tons de laranja
+    unique_receitas = df_filtrado_agrupado["receita"].unique()
+    color_map = {receita: orange_scale[i % len(orange_scale)] for i, receita in enumerate(unique_receitas)}
+
+    # Criação do gráfico de barras verticais com tons de laranja por receita
+    fig = px.bar(
+        df_filtrado_agrupado,
+        x="receita",  # Eixo X será a Receita
+        y="pv_bat",  # Eixo Y será a soma da Produção
+        title="Produção x Receita",
+        color="receita",  # As cores serão baseadas na Receita
+        color_discrete_map=color_map  # Mapeamento de cores sequenciais
+    )
+
+    # Adicionando rótulos com valores nas barras
+    fig.update_traces(
+        texttemplate='%{y:.2f}',  # Exibe os valores com 2 casas decimais no topo das barras
+        textposition='outside',  # Coloca os rótulos fora das barras
+        hovertemplate='Receita: %{x}<br>Produção: %{y:.2f} Ton'  # Personaliza o texto ao passar o mouse
+    )
+
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.3,  # Centraliza o título
+        font=dict(size=14),
+        xaxis_title="receita",  # Título do eixo X
+        yaxis_title="Produção",  # Altera o título do eixo Y
+        margin=dict(t=30)  # Aumenta a margem superior para dar mais espaço para os rótulos
+    )
+    return fig
+
+
+# Produção por hora x dia da semana (mapa de calor)
+# Recebe a tabela de derivados.producao_semana_hora (horas nas linhas, dias da semana nas colunas)
+def grafico_semana_hora(df_semana_hora):
+    horas = list(df_semana_hora.index)
+
+    # Criar o gráfico de heatmap usando Plotly
+    fig = go.Figure(data=go.Heatmap(
+        z=df_semana_hora.to_numpy(),  # Valores de produção
+        x=list(df_semana_hora.columns),  # Dias da semana (0 = segunda-feira, ..., 6 = domingo)
+        y=horas,  # Horas do dia (da primeira à última hora com produção)
+        colorscale='Oranges',  # Escala de cores em tons de laranja
+        hovertemplate='<b>Dia da Semana:</b> %{x}<br><b>Hora:</b> %{y}:00<br><b>Produção:</b> %{z:.2f} Ton<extra></extra>',  # Customizar o texto ao passar o mouse
+        showscale=False  # Remover a barra lateral de graduação de cor
+    ))
+
+    # Ajuste do layout
+    fig.update_layout(
+        xaxis=dict(tickmode='array', tickvals=list(range(7)), ticktext=["Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom"]),  # Marcar os dias da semana
+        yaxis=dict(tickmode='array', tickvals=horas, ticktext=[f"{i}:00" for i in horas]),  # Mostrar apenas as horas no intervalo
+        title="Produção em Horas x Dias da Semana",
+        title_x=0.37,  # Centraliza o título
+        font=dict(size=14),
+        xaxis_title="Dia da Semana",
+        yaxis_title="Hora do Dia",
+        plot_bgcolor='white',  # Fundo branco do gráfico
+        paper_bgcolor='white',  # Fundo branco da área externa do gráfico
+    )
+    return fig
+
+
+# Consumo por produto do período (barras)
+def grafico_consumo_produto_periodo(df_somatorio):
+    # Mapeamento dos produtos para tons de laranja
+    orange_scale = px.colors.sequential.Oranges
+    unique_produtos = df_somatorio["Produto"].unique()
+    color_map1 = {produto: orange_scale[i % len(orange_scale)] for i, produto in enumerate(unique_produtos)}
+
+    # Criação do gráfico de barras verticais
+    fig = px.bar(
+        df_somatorio,
+        x="Produto",  # Eixo X será o nome do Produto
+        y="Consumo",  # Eixo Y será o consumo
+        title="Consumo x Produto",
+        color="Produto",  # A cor será baseada no Produto
+        color_discrete_map=color_map1  # Mapeamento de cores
+    )
+
+    # Adicionando rótulos com valores nas barras
+    fig.update_traces(
+        texttemplate='%{y:.2f}',  # Exibe os valores com 2 casas decimais no topo das barras
+        textposition='outside',  # Coloca os rótulos fora das barras
+        hovertemplate='Receita: %{x}<br>Produção: %{y:.2f} Ton'  # Personaliza o texto ao passar o mouse
+    )
+
+    # Layout do gráfico
+    fig.update_layout(
+        title_x=0.3,  # Centraliza o título
+        font=dict(size=14),
+        xaxis_title="Receita",  # Título do eixo X
+        yaxis_title="Produção",  # Altera o título do eixo Y
+        margin=dict(t=30)  # Aumenta a margem superior para dar mais espaço para os rótulos
+    )
+    return fig
+
+
+# Posições que representam a série com no máximo `pontos` valores: o mínimo e o máximo
+# de cada faixa de posições consecutivas, em ordem (picos e vales são preservados)
+# Valores NaN ficam de fora
+def reduzir_min_max(valores, pontos=PONTOS_VARIACAO):
+    valores = np.asarray(valores, dtype="float64")
+    posicoes = np.flatnonzero(~np.isnan(valores))
+    if len(posicoes) <= pontos:
+        return posicoes
+    faixas = np.arange(len(posicoes)) * (pontos // 2) // len(posicoes)
+    ordem = np.lexsort((valores[posicoes], faixas))  # Por faixa e, dentro da faixa, por valor
+    inicio = np.flatnonzero(np.r_[True, faixas[ordem][1:] != faixas[ordem][:-1]])
+    fim = np.r_[inicio[1:], len(ordem)] - 1
+    return posicoes[np.unique(np.r_[ordem[inicio], ordem[fim]])]
+
+
+# Variação de dosagem por lote ao longo do início dos lotes, com as faixas de ±5% e todos
+# os lotes fora da faixa marcados; em séries longas só a linha é reduzida a PONTOS_VARIACAO pontos
+def grafico_variacao_dosagem(df_agrupado, pontos=PONTOS_VARIACAO):
+    variacao = df_agrupado['Variação Dosagem'].to_numpy(dtype="float64")
+    inicios = df_agrupado['Início'].to_numpy()
+    linha = reduzir_min_max(variacao, pontos)
+    fora = np.flatnonzero(fora_da_faixa(variacao))
+
+    # Lote, receita e início de cada ponto para o texto ao passar o mouse (só dos pontos exibidos)
+    def detalhes(posicoes):
+        linhas = df_agrupado.take(posicoes)
+        return np.column_stack([
+            linhas['Lote'].astype(str),
+            linhas['Receita'].astype(str),
+            linhas['Início'].dt.strftime("%d-%m-%Y %H:%M"),
+        ])
+
+    hovertemplate = 'Lote: %{customdata[0]}<br>Receita: %{customdata[1]}<br>Início: %{customdata[2]}<br>Variação: %{y:.3f} %<extra></extra>'
+
+    fig = go.Figure()
+    # Linha de variação de dosagem com um círculo em cada amostragem
+    fig.add_trace(go.Scatter(
+        x=inicios[linha], y=variacao[linha], customdata=detalhes(linha), mode='lines+markers',
+        line=dict(color='darkorange', width=2), marker=dict(color='darkorange', size=6),
+        hovertemplate=hovertemplate,
+    ))
+    # Lotes com variação fora da faixa
+    fig.add_trace(go.Scatter(
+        x=inicios[fora], y=variacao[fora], customdata=detalhes(fora), mode='markers',
+        marker=dict(color='red', size=9, symbol='circle-open', line=dict(width=2)),
+        hovertemplate=hovertemplate,
+    ))
+
+    # Linhas pivot (±5%) e linha central em 0
+    for y in (LIMITE_VARIACAO, -LIMITE_VARIACAO):
+        fig.add_hline(y=y, line=dict(color='lightcoral', dash='dash', width=1))
+    fig.add_hline(y=0, line=dict(color='lightgrey', width=1))
+
+    # Limites dinâmicos do eixo Y
+    exibidos = variacao[np.r_[linha, fora]]
+    min_dosagem = exibidos.min(initial=0)
+    max_dosagem = exibidos.max(initial=0)
+    y_min = min_dosagem - 3 if min_dosagem < -LIMITE_VARIACAO - 0.5 else -LIMITE_VARIACAO - 0.5
+    y_max = max_dosagem + 3 if max_dosagem > LIMITE_VARIACAO + 0.5 else LIMITE_VARIACAO + 0.5
+
+    fig.update_layout(
+        height=250,
+        showlegend=False,
+        xaxis=dict(showticklabels=False, showgrid=True, griddash='dash', zeroline=False),  # Sem os valores do eixo X
+        yaxis=dict(range=[y_min, y_max], showticklabels=False, showgrid=False, zeroline=False),
+        plot_bgcolor='white',  # Fundo branco do gráfico
+        paper_bgcolor='white',  # Fundo branco da área externa do gráfico
+        margin=dict(t=10, b=10, l=10, r=10),
+    )
+    return fig
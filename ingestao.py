@@ -0,0 +1,436 @@
+# -*- coding: utf-8 -*-
+"""
+Rotinas de ingestão dos registros de bateladas (etapa "Carregar Dados").
+
+As funções deste módulo não dependem do Streamlit e trabalham somente com
+operações vetorizadas do pandas/NumPy.
+"""
+
+import io
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from esquema import aplicar_esquema
+from matrizes import matriz_campo
+from mapeamento import (CAMPOS_DOSADOR, COLUNAS_PADRONIZADAS, TIPOS_CAMPOS, TIPOS_COLUNAS,
+                        localizar_colunas_dosadores)
+
+UM_DIA = pd.Timedelta(days=1)
+
+# Chave natural de uma batelada: a mesma batelada exportada duas vezes tem os mesmos valores
+CHAVE_BATELADA = ["hora_ini", "hora_fim", "lote", "receita", "num_bat"]
+
+# Número de processos usados na leitura dos arquivos (MRB_WORKERS=1 desativa o paralelismo)
+# O pool é compartilhado por todas as sessões do servidor, então o padrão é limitado
+MAX_WORKERS = int(os.environ.get("MRB_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+
+# Envios com menos arquivos que isso são lidos em sequência (iniciar os processos não compensa)
+MIN_ARQUIVOS_PARALELO = 4
+
+# Processos iniciados por forkserver/spawn: fork dentro do servidor multithread do Streamlit
+# pode herdar travas de outras threads e travar o processo filho
+_CONTEXTO = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+_pools = {}  # Pools de leitura criados sob demanda, por número de processos
+_trava_pools = threading.Lock()
+
+
+# Offset da hora do dia (timedelta) a partir de uma coluna de horários
+def hora_do_dia(serie):
+    if pd.api.types.is_timedelta64_dtype(serie):
+        # Duração lida do Excel: descarta dias e frações de segundo
+        return serie.dt.floor("s") % UM_DIA
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        # Texto no formato HH:MM:SS
+        serie = pd.to_datetime(serie.astype("str"), format="%H:%M:%S", errors="coerce")
+    return serie - serie.dt.normalize()
+
+
+# Padroniza os nomes das colunas de um arquivo carregado e os horários
+def normalizar_arquivo(df_load):
+    # Renomear colunas com base no mapeamento
+    df_load = df_load.rename(columns=COLUNAS_PADRONIZADAS)
+
+    # Verificar e converter colunas essenciais para o tipo correto
+    if "data" in df_load.columns:
+        df_load["data"] = pd.to_datetime(df_load["data"], errors="coerce")
+
+    # hora_ini e hora_fim seguem como timedelta até a montagem dos timestamps
+    if "hora_ini" in df_load.columns:
+        df_load["hora_ini"] = hora_do_dia(df_load["hora_ini"])
+    df_load["hora_fim"] = hora_do_dia(df_load["hora_fim"])
+
+    return df_load
+
+
+# Lê e normaliza um arquivo enviado; retorna None se a extensão não for suportada
+def ler_arquivo(nome, conteudo):
+    # Verifica o tipo do arquivo e carrega
+    if nome.endswith(".csv"):
+        df_load = pd.read_csv(io.BytesIO(conteudo))
+    elif nome.endswith(".xlsx"):
+        df_load = pd.read_excel(io.BytesIO(conteudo))
+    else:
+        return None
+    return normalizar_arquivo(df_load)
+
+
+# Mesma leitura, devolvendo a mensagem de erro em vez de propagá-la
+def _ler_arquivo_seguro(nome, conteudo):
+    try:
+        return ler_arquivo(nome, conteudo), None
+    except Exception as e:
+        return None, str(e)
+
+
+# Pool de leitura compartilhado (criado no primeiro uso e mantido entre os envios)
+def _pool_leitura(max_workers):
+    with _trava_pools:
+        if max_workers not in _pools:
+            _pools[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=_CONTEXTO)
+        return _pools[max_workers]
+
+
+# Descarta um pool que deixou de funcionar (ex.: processo filho encerrado); o próximo uso cria outro
+def _descartar_pool(max_workers, pool):
+    with _trava_pools:
+        if _pools.get(max_workers) is pool:
+            del _pools[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Lê vários arquivos (lista de (nome, bytes)), em paralelo no pool de processos compartilhado
+# Retorna (nome, df, erro) na mesma ordem dos arquivos enviados
+def carregar_arquivos(arquivos, max_workers=MAX_WORKERS):
+    max_workers = max_workers or MAX_WORKERS
+    resultados = None
+    if max_workers > 1 and len(arquivos) >= MIN_ARQUIVOS_PARALELO:
+        pool = _pool_leitura(max_workers)
+        try:
+            futuros = [pool.submit(_ler_arquivo_seguro, nome, conteudo) for nome, conteudo in arquivos]
+            resultados = [futuro.result() for futuro in futuros]
+        except BrokenProcessPool:
+            # Este envio é lido em sequência; os seguintes usam um pool novo
+            _descartar_pool(max_workers, pool)
+    if resultados is None:
+        resultados = [_ler_arquivo_seguro(nome, conteudo) for nome, conteudo in arquivos]
+    return [(nome, df_load, erro) for (nome, _), (df_load, erro) in zip(arquivos, resultados)]
+
+
+# Monta os timestamps completos de início e fim de cada batelada
+def montar_timestamps(df):
+    # Data da batelada sem componente de hora
+    df["data"] = pd.to_datetime(df["data"])
+    data = df["data"].dt.normalize()
+
+    # Data + hora do dia, sem passar linha a linha pelo DataFrame
+    hora_ini = data + hora_do_dia(df["hora_ini"])
+    hora_fim = data + hora_do_dia(df["hora_fim"])
+
+    # Batelada que virou a meia-noite: o início pertence ao dia anterior
+    virada = hora_fim < hora_ini
+    hora_ini = hora_ini.mask(virada, hora_ini - UM_DIA)
+
+    df["hora_ini"] = hora_ini
+    df["hora_fim"] = hora_fim
+    return df
+
+
+# Primeiro valor não nulo entre colunas alternativas do mesmo campo
+def _primeiro_valor(df, colunas):
+    if len(colunas) == 1:
+        return df[colunas[0]]
+    return df[colunas].bfill(axis=1).iloc[:, 0]
+
+
+# Identifica os dosadores válidos, renomeia as colunas de cada um (sp_rec01, pv_dos01, ...)
+# e converte as colunas para o tipo correto
+def padronizar_dosadores(df):
+    # Lista para armazenar os dosadores válidos
+    dosadores = []
+
+    # Colunas de cada dosador encontradas no cabeçalho (uma única passagem)
+    renomear = {}
+    coalescer = {}
+    for canal, campos in localizar_colunas_dosadores(df.columns).items():
+        # Dosador válido: possui SP Receita com soma positiva
+        colunas_sp = campos.get("sp_rec", [])
+        if not colunas_sp or not _primeiro_valor(df, colunas_sp).sum() > 0:
+            continue
+        dosadores.append(canal)
+        sufixo = str(len(dosadores)).zfill(2)
+        for campo, colunas in campos.items():
+            if len(colunas) == 1:
+                renomear[colunas[0]] = f"{campo}{sufixo}"
+            else:
+                # Variantes do mesmo campo (arquivos de firmwares diferentes) viram uma só coluna
+                coalescer[f"{campo}{sufixo}"] = colunas
+
+    # Renomear colunas para dosadores válidos
+    for destino, colunas in coalescer.items():
+        df[destino] = _primeiro_valor(df, colunas)
+        df = df.drop(columns=colunas)
+    df = df.rename(columns=renomear)
+
+    # Converter colunas fixas e campos dos dosadores para o tipo correto (uma única conversão)
+    tipos = dict(TIPOS_COLUNAS)
+    for idx in range(1, len(dosadores) + 1):
+        for campo, tipo in TIPOS_CAMPOS.items():
+            coluna = f"{campo}{str(idx).zfill(2)}"
+            if coluna in df.columns:
+                tipos[coluna] = tipo
+    df = df.astype(tipos)
+
+    # Dispor as colunas dos dosadores em blocos contíguos por campo (sp_rec01..NN, sp_dos01..NN, ...)
+    # e desfragmentar o DataFrame, para que o custo por canal não cresça com o número de canais
+    colunas_dosadores = [f"{campo}{str(idx).zfill(2)}" for campo in CAMPOS_DOSADOR
+                         for idx in range(1, len(dosadores) + 1)]
+    colunas_dosadores = [coluna for coluna in colunas_dosadores if coluna in df.columns]
+    demais = df.columns.difference(colunas_dosadores, sort=False).tolist()
+    df = df[demais + colunas_dosadores].copy()
+
+    return df, dosadores
+
+
+# Aplica as correções de dosagem a todos os dosadores com sp_rec, pv_dos e erro_dos, nesta ordem:
+#   1. sp_rec e pv_dos entre 0 e 5 estão em litros: multiplicados por 1000
+#   2. sp_dos ausente é calculado a partir de pv_bat e sp_rec
+#   3. pv_dos fora de 80%-120% de sp_dos é substituído por sp_dos
+#   4. erro_dos não numérico, NaN ou infinito vira 0
+#   5. pv_dos é ajustado por (1 + erro_dos/100) quando erro_dos está entre -20 e 20
+# Os canais são tratados juntos como matrizes (bateladas x dosadores, ver matrizes.py)
+# Retorna (df, contadores) com o número de linhas alteradas por regra: {dosador: {regra: linhas}}
+def corrigir_dosagem(df, dosadores):
+    canais = []
+    for idx, dosador in enumerate(dosadores, start=1):
+        sufixo = str(idx).zfill(2)
+        if all(f"{campo}{sufixo}" in df.columns for campo in ("sp_rec", "pv_dos", "erro_dos")):
+            canais.append((dosador, sufixo))
+    if not canais:
+        return df, {}
+
+    sufixos = [sufixo for _, sufixo in canais]
+    colunas = {campo: [f"{campo}{sufixo}" for sufixo in sufixos] for campo in ("erro_dos", "sp_dos")}
+    sp_rec = matriz_campo(df, "sp_rec", sufixos)
+    pv_dos = matriz_campo(df, "pv_dos", sufixos)
+    erro_dos = matriz_campo(df[colunas["erro_dos"]].apply(pd.to_numeric, errors="coerce"), "erro_dos", sufixos)
+    contadores = {}
+
+    # 1. Valores em litros convertidos para ml
+    for nome, valores in (("sp_rec_em_litros", sp_rec), ("pv_dos_em_litros", pv_dos)):
+        regra = (valores >= 0) & (valores <= 5)
+        contadores[nome] = (regra & (valores != 0)).sum(axis=0)
+        np.multiply(valores, 1000, out=valores, where=regra)
+
+    # 2. sp_dos existente ou calculado (após a conversão de sp_rec)
+    sp_dos = matriz_campo(df, "sp_dos", sufixos)
+    faltantes = [coluna not in df.columns for coluna in colunas["sp_dos"]]
+    if any(faltantes):
+        sp_dos[:, faltantes] = (df["pv_bat"].to_numpy(dtype="float64") / 100)[:, None] * sp_rec[:, faltantes]
+
+    # 3. pv_dos fora da faixa (inclusive NaN) substituído por sp_dos
+    regra = ~((pv_dos >= sp_dos * 0.8) & (pv_dos <= sp_dos * 1.2))
+    contadores["pv_dos_fora_da_faixa"] = regra.sum(axis=0)
+    np.copyto(pv_dos, sp_dos, where=regra)
+
+    # 4. erro_dos inválido zerado
+    regra = ~np.isfinite(erro_dos)
+    contadores["erro_dos_invalido"] = regra.sum(axis=0)
+    erro_dos[regra] = 0
+
+    # 5. Ajuste de pv_dos pelo erro de dosagem
+    regra = (erro_dos >= -20) & (erro_dos <= 20)
+    contadores["pv_dos_ajustado_pelo_erro"] = (regra & (erro_dos != 0)).sum(axis=0)
+    np.multiply(pv_dos, 1 + erro_dos / 100, out=pv_dos, where=regra)
+
+    # Substituir as colunas corrigidas e incluir as sp_dosXX calculadas de uma só vez
+    corrigidas = {}
+    for j, (_, sufixo) in enumerate(canais):
+        corrigidas[f"sp_rec{sufixo}"] = sp_rec[:, j]
+        corrigidas[f"pv_dos{sufixo}"] = pv_dos[:, j]
+        corrigidas[f"erro_dos{sufixo}"] = erro_dos[:, j]
+        if faltantes[j]:
+            corrigidas[f"sp_dos{sufixo}"] = sp_dos[:, j]
+    ordem = list(df.columns) + [coluna for coluna in corrigidas if coluna not in df.columns]
+    df = pd.concat([df.drop(columns=[c for c in corrigidas if c in df.columns]),
+                    pd.DataFrame(corrigidas, index=df.index)], axis=1)[ordem]
+
+    contadores = {dosador: {regra: int(linhas[j]) for regra, linhas in contadores.items()}
+                  for j, (dosador, _) in enumerate(canais)}
+    return df, contadores
+
+
+# Identifica os dosadores, padroniza as colunas e aplica as correções de dosagem
+# Retorna o DataFrame final (sem duplicatas, ordenado por hora_ini) e a lista de dosadores válidos
+def processar_dados(df, deduplicar=True):
+    # Identificar os dosadores e renomear/converter as colunas em uma única passagem
+    df, dosadores = padronizar_dosadores(df)
+
+    # Converter 'data' para datetime e atualizar hora_ini e hora_fim com as respectivas datas
+    # (ajusta hora_ini para o dia anterior se a batelada virou a meia-noite)
+    df = montar_timestamps(df)
+
+    # Correções de dosagem (unidade, faixa de 80%-120%, erro de dosagem) em todos os canais de uma vez
+    df, correcoes = corrigir_dosagem(df, dosadores)
+
+    sufixos = [str(idx).zfill(2) for idx in range(1, len(dosadores)+1)]
+    novas_colunas = {
+        # Criando uma nova coluna com a soma dos consumos (soma entre dosadores da matriz bateladas x dosadores)
+        "total_sp": np.nansum(matriz_campo(df, "sp_dos", sufixos), axis=1),
+        # Criando uma nova coluna com a soma dos consumos
+        "total_consumo": np.nansum(matriz_campo(df, "pv_dos", sufixos), axis=1),
+        # Criando uma nova coluna com o tempo de ciclo
+        "tempo_ciclo": (df['hora_fim'] - df['hora_ini']).dt.total_seconds(),
+    }
+    df = pd.concat([df, pd.DataFrame(novas_colunas, index=df.index)], axis=1)
+
+    # Armazenar textos repetitivos como categorias e reduzir colunas numéricas
+    df = aplicar_esquema(df)
+
+    # Remover duplicatas e ordenar (quem precisa contar duplicatas por arquivo faz essa etapa à parte)
+    if deduplicar:
+        df, _ = remover_duplicatas(df)
+        df = ordenar_por_inicio(df)
+
+    # Contadores das correções ficam nos metadados do DataFrame: {dosador: {regra: linhas}}
+    df.attrs["correcoes"] = correcoes
+    return df, dosadores
+
+
+# Impressão digital (64 bits) de cada batelada a partir da chave natural
+def impressao_digital(df):
+    colunas = [coluna for coluna in CHAVE_BATELADA if coluna in df.columns]
+    return pd.util.hash_pandas_object(df[colunas], index=False).to_numpy()
+
+
+# Marca as bateladas cuja chave já apareceu em uma linha anterior
+def marcar_duplicatas(df):
+    return pd.Series(impressao_digital(df)).duplicated().to_numpy()
+
+
+# Remove as bateladas repetidas (mantém a primeira ocorrência)
+# Retorna (df, número de repetidas por origem); origem é o número do arquivo de cada linha
+def remover_duplicatas(df, origem=None):
+    repetidas = marcar_duplicatas(df)
+    por_origem = np.bincount(origem[repetidas], minlength=origem.max() + 1) if origem is not None else None
+    if repetidas.any():
+        df = df[~repetidas]
+    return df, por_origem
+
+
+# Mantém as bateladas ordenadas pelo início (base das consultas por período)
+def ordenar_por_inicio(df):
+    return df.sort_values("hora_ini", kind="stable").reset_index(drop=True)
+
+
+# Pipeline completo de carga: lista de (nome, bytes) -> (DataFrame, dosadores, avisos)
+# avisos é a lista de mensagens por arquivo, como ("erro" | "aviso" | "info", texto), na ordem de envio
+def carregar_dados(arquivos, max_workers=MAX_WORKERS):
+    dfs = []  # Lista para armazenar os DataFrames carregados
+    avisos = []
+
+    # Ler e normalizar os arquivos (renomeia colunas e converte hora_ini/hora_fim)
+    for nome, df_load, erro in carregar_arquivos(arquivos, max_workers):
+        if erro is not None:
+            avisos.append(("erro", f"Erro ao processar o arquivo {nome}: {erro}"))
+        elif df_load is None:
+            avisos.append(("aviso", f"O arquivo {nome} não é um CSV ou Excel válido."))
+        else:
+            dfs.append((nome, df_load))
+
+    if not dfs:
+        return None, [], avisos
+
+    # Combinar todos os DataFrames e aplicar o processamento dos dosadores
+    df, dosadores = processar_dados(pd.concat([df_load for _, df_load in dfs], ignore_index=True), deduplicar=False)
+
+    # Remover bateladas repetidas (exportações sobrepostas) e informar quantas vieram de cada arquivo
+    origem = np.repeat(np.arange(len(dfs)), [len(df_load) for _, df_load in dfs])
+    df, repetidas = remover_duplicatas(df, origem)
+    for (nome, _), quantidade in zip(dfs, repetidas):
+        if quantidade:
+            avisos.append(("info", f"{quantidade} bateladas repetidas do arquivo {nome} foram descartadas."))
+
+    return ordenar_por_inicio(df), dosadores, avisos
+
+
+_PADRAO_COLUNA_DOSADOR = re.compile(r"^(" + "|".join(CAMPOS_DOSADOR) + r")(\d{2,})$")
+
+
+# Renomeia as colunas por dosador (sp_rec03, pv_dos03, ...) para a numeração de outra lista de dosadores
+def renumerar_dosadores(df, dosadores, dosadores_destino):
+    posicao = {dosador: str(idx).zfill(2) for idx, dosador in enumerate(dosadores_destino, start=1)}
+    renomear = {}
+    for coluna in df.columns:
+        encontrado = _PADRAO_COLUNA_DOSADOR.match(coluna)
+        if encontrado:
+            dosador = dosadores[int(encontrado.group(2)) - 1]
+            renomear[coluna] = encontrado.group(1) + posicao[dosador]
+    return df.rename(columns=renomear)
+
+
+# Põe as colunas categóricas de dois DataFrames nas mesmas categorias (união, em ordem alfabética)
+def unificar_categorias(df, df_novo):
+    df, df_novo = df.copy(deep=False), df_novo.copy(deep=False)
+    for coluna in df.columns.intersection(df_novo.columns):
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype) and isinstance(df_novo[coluna].dtype, pd.CategoricalDtype):
+            if df[coluna].cat.categories.equals(df_novo[coluna].cat.categories):
+                continue
+            uniao = union_categoricals([df[coluna].array, df_novo[coluna].array], sort_categories=True).categories
+            df[coluna] = df[coluna].cat.set_categories(uniao)
+            df_novo[coluna] = df_novo[coluna].cat.set_categories(uniao)
+    return df, df_novo
+
+
+# Acrescenta bateladas já processadas (processar_dados) a um conjunto existente, ordenado por hora_ini
+# Duplicatas têm o mesmo hora_ini (faz parte da chave), então a comparação é feita apenas com as bateladas
+# existentes dentro do intervalo de início das novas
+# Retorna (df, dosadores, bateladas novas incluídas, número de bateladas repetidas descartadas)
+def anexar_dados(df, dosadores, df_novo, dosadores_novos):
+    # Dosadores novos entram no fim da lista; os existentes mantêm a numeração
+    dosadores_uniao = list(dosadores) + [d for d in dosadores_novos if d not in dosadores]
+    df_novo = renumerar_dosadores(df_novo, dosadores_novos, dosadores_uniao)
+    df, df_novo = unificar_categorias(df, df_novo)
+
+    inicios = df["hora_ini"]
+    novos_inicios = df_novo["hora_ini"].dropna()
+    a = inicios.searchsorted(novos_inicios.min(), side="left") if len(novos_inicios) else 0
+    b = inicios.searchsorted(novos_inicios.max(), side="right") if len(novos_inicios) else 0
+    janela = df.iloc[a:b]
+    if len(novos_inicios) < len(df_novo):
+        # Bateladas sem hora_ini ficam no fim do histórico ordenado
+        janela = pd.concat([janela, df.iloc[inicios.count():]])
+
+    chaves = [coluna for coluna in CHAVE_BATELADA if coluna in df.columns and coluna in df_novo.columns]
+    repetidas = marcar_duplicatas(pd.concat([janela[chaves], df_novo[chaves]], ignore_index=True))[len(janela):]
+    df_novo = df_novo[~repetidas].reset_index(drop=True)
+
+    if df_novo.empty:
+        return df, dosadores_uniao, df_novo, int(repetidas.sum())
+
+    # Só as bateladas existentes a partir do início das novas precisam ser reordenadas
+    novos_inicios = df_novo["hora_ini"].dropna()
+    corte = inicios.searchsorted(novos_inicios.min(), side="right") if len(novos_inicios) else len(df)
+    cauda = pd.concat([df.iloc[corte:], df_novo], ignore_index=True)
+    if len(cauda) > len(df_novo):
+        cauda = cauda.sort_values("hora_ini", kind="stable")
+    resultado = pd.concat([df.iloc[:corte], cauda], ignore_index=True)
+    resultado.attrs["correcoes"] = somar_correcoes(df.attrs.get("correcoes", {}), df_novo.attrs.get("correcoes", {}))
+    return resultado, dosadores_uniao, df_novo, int(repetidas.sum())
+
+
+# Soma dois contadores de correções ({dosador: {regra: linhas}})
+def somar_correcoes(correcoes, outras):
+    soma = {dosador: dict(regras) for dosador, regras in correcoes.items()}
+    for dosador, regras in outras.items():
+        for regra, linhas in regras.items():
+            soma.setdefault(dosador, {})[regra] = soma.get(dosador, {}).get(regra, 0) + linhas
+    return soma
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Índice lote -> receita -> posições das bateladas, usado pelos seletores da página Lote.
+
+Montado uma vez por conjunto de dados: depois disso, as receitas de um lote e as
+bateladas de um par (lote, receita) são consultas em dicionário, sem percorrer o DataFrame.
+O código do par de cada batelada também permite montar a tabela de todos os lotes de uma vez.
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True, eq=False)
+class IndiceLotes:
+    lotes: list  # Lotes na ordem em que aparecem nos dados
+    pares: pd.DataFrame  # lote e receita de cada par, na ordem em que aparecem (posição = código do par)
+    codigos: np.ndarray  # Código do par de cada batelada; -1 sem lote ou receita
+    _receitas: dict  # lote -> receitas do lote, na ordem em que aparecem
+    _posicoes: dict  # (lote, receita) -> posições das bateladas (crescentes)
+
+    def receitas(self, lote):
+        return self._receitas.get(lote, [])
+
+    def posicoes(self, lote, receita):
+        return self._posicoes.get((lote, receita), np.empty(0, dtype=np.int64))
+
+
+def montar_indice_lotes(df):
+    # Pares numerados na ordem da primeira batelada de cada um; bateladas sem lote ou receita ficam com -1
+    codigos = df.groupby(["lote", "receita"], sort=False, observed=True).ngroup()
+    codigos = codigos.fillna(-1).to_numpy(dtype=np.int64)
+
+    # Posições de todas as bateladas agrupadas por par (ordenação estável mantém a ordem dentro do par)
+    ordem = np.argsort(codigos, kind="stable")
+    limites = np.cumsum(np.bincount(codigos + 1, minlength=1))
+    grupos = np.split(ordem[limites[0]:], limites[1:-1] - limites[0]) if len(limites) > 1 else []
+
+    primeiras = [grupo[0] for grupo in grupos]
+    pares = df[["lote", "receita"]].iloc[primeiras].reset_index(drop=True)
+
+    receitas, posicoes = {}, {}
+    for lote, receita, grupo in zip(pares["lote"], pares["receita"], grupos):
+        receitas.setdefault(lote, []).append(receita)
+        posicoes[(lote, receita)] = grupo
+    return IndiceLotes(list(receitas), pares, codigos, receitas, posicoes)
+
+
+# Tabela do lote (Necessário, Total Dosado, Receita, Dose e Variação por produto) de todos os
+# pares (lote, receita) em uma única passagem pelas matrizes de dosagem
+# Mesmos critérios da página Lote: pares sem produção ficam de fora, produtos sem quantidade
+# necessária são descartados e as quantidades são convertidas para L
+def somar_produtos_por_lote(indice, matrizes, pv_bat):
+    colunas = ["Lote", "Tratamento", "Produto", "Necessário", "Total Dosado", "Receita", "Dose", "Variação"]
+    n_produtos = len(matrizes.produtos)
+    if matrizes.vazia or not n_produtos or not len(indice.pares):
+        return pd.DataFrame(columns=colunas)
+
+    # Chave (par, produto) de cada célula (batelada x dosador), percorrida dosador a dosador
+    pares = np.broadcast_to(indice.codigos[:, None], matrizes.codigos.shape).ravel(order="F")
+    produtos = matrizes.codigos.ravel(order="F")
+    validas = (pares >= 0) & (produtos >= 0)
+    chaves, grupo = np.unique(pares[validas] * n_produtos + produtos[validas], return_inverse=True)
+    necessario = np.bincount(grupo, weights=np.nan_to_num(matrizes.sp.ravel(order="F")[validas]))
+    dosado = np.bincount(grupo, weights=np.nan_to_num(matrizes.pv.ravel(order="F")[validas]))
+    par, produto = np.divmod(chaves, n_produtos)
+
+    # Sementes tratadas por par
+    com_par = indice.codigos >= 0
+    soma_pv_bat = np.bincount(indice.codigos[com_par], weights=np.nan_to_num(pv_bat[com_par]),
+                              minlength=len(indice.pares))[par]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tabela = pd.DataFrame({
+            "par": par,
+            "Produto": matrizes.produtos[produto].astype(object),
+            "Necessário": necessario,
+            "Total Dosado": dosado,
+            "Receita": necessario / soma_pv_bat * 100,
+            "Dose": dosado / soma_pv_bat * 100,
+            "Variação": (dosado / necessario - 1) * 100,
+        })
+    tabela = tabela[(soma_pv_bat != 0)].dropna()
+    tabela = tabela[tabela["Necessário"] != 0]
+    tabela["Necessário"] = tabela["Necessário"] / 1000
+    tabela["Total Dosado"] = tabela["Total Dosado"] / 1000
+    tabela = tabela.sort_values(["par", "Necessário"], kind="stable")
+
+    nomes = indice.pares.iloc[tabela["par"].to_numpy()].reset_index(drop=True)
+    tabela = tabela.drop(columns="par").reset_index(drop=True)
+    tabela.insert(0, "Lote", nomes["lote"])
+    tabela.insert(1, "Tratamento", nomes["receita"])
+    return tabela
+
+
+# Arquivos para download da tabela de todos os lotes
+def exportar_planilha(tabela):
+    saida = io.BytesIO()
+    with pd.ExcelWriter(saida, engine="openpyxl") as planilha:
+        tabela.to_excel(planilha, sheet_name="Lotes", index=False)
+    return saida.getvalue()
+
+
+def exportar_parquet(tabela):
+    saida = io.BytesIO()
+    tabela.to_parquet(saida, index=False)
+    return saida.getvalue()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Mapeamento declarativo dos nomes de colunas das exportações para os nomes
+padronizados do app.
+
+Novas variantes de firmware são suportadas acrescentando linhas às tabelas
+abaixo, sem alterar o código de ingestão.
+"""
+
+import hashlib
+import json
+import re
+
+# Dicionário de mapeamento para padronização de colunas
+COLUNAS_PADRONIZADAS = {
+    "Date": "data",
+    "Time": "hora_fim",
+    "Hora Inicial": "hora_ini",
+    "Hora Final": "hora_fim",
+    "Lote": "lote",
+    "Espécie": "especie",
+    "Especie": "especie",
+    "Categoria":"categoria",
+    "Cultivar": "cultivar",
+    "Peneira":"peneira",
+    "Ensaque":"ensaque",
+    "Operador":"operador",
+    "Observação": "observacao",
+    "Observacao": "observacao",
+    "Peso_Mil_Sementes": "pms",
+    "Peso de Mil Sementes": "pms",
+    "Qtd Batelada": "num_bat",
+    "Núm. Batelada": "num_bat",
+    "Núm. Bateladas": "num_bat",
+    "Receita": "receita",
+    "Receita Selecionada": "receita",
+    "Tratamento Solicitado (Kg)": "sp_total",
+    "Sementes Tratadas (Kg)": "pv_total",
+    "SP Batelada (Kg)": "sp_bat",
+    "PV Batelada (Kg)": "pv_bat",
+    "Tempo_Ciclo": "tmp_ciclo",
+    "Tempo de Ciclo": "tmp_ciclo",
+    "Tempo_Mistura": "tmp_mist",
+    "Tempo de Mistura": "tmp_mist",
+    "Tempo_Descarga": "tmp_desc",
+    "Tempo de Descarga": "tmp_desc"
+}
+
+# Tipos de dosador: ED (dosador de líquido, em L) e DP (dosador de pó, em Kg)
+# Qualquer número de canal presente no cabeçalho é aceito (ED01..EDnn, DP01..DPnn)
+UNIDADES_CANAL = {"ED": "L", "DP": "Kg"}
+
+# Colunas por dosador: modelo do nome na exportação -> campo padronizado
+# {canal} é o dosador (ED01, DP02, ...) e {unidade} a unidade do tipo de dosador
+MAPEAMENTO_DOSADORES = [
+    ("SP Receita - {canal} ({unidade})", "sp_rec"),
+    ("SP Receita - {canal}", "sp_rec"),
+    ("SP Receita {canal}", "sp_rec"),
+    ("SP Dosagem - {canal} ({unidade})", "sp_dos"),
+    ("SP Dosagem - {canal}", "sp_dos"),
+    ("SP Dosagem {canal}", "sp_dos"),
+    ("PV Dosagem - {canal} ({unidade})", "pv_dos"),
+    ("PV Dosagem - {canal}", "pv_dos"),
+    ("PV Dosagem {canal}", "pv_dos"),
+    ("Erro Dosagem - {canal} (%)", "erro_dos"),
+    ("Erro Dosagem {canal}", "erro_dos"),
+    ("Produto {canal}", "nome_prod"),
+    ("Densidade - {canal}", "dens_prod"),
+    ("Densidade {canal}", "dens_prod"),
+    ("Unid. Medida - {canal}", "unid_med"),
+    ("Unid medida {canal}", "unid_med"),
+    ("Unid_Sementes_{canal}", "unid_med"),
+]
+
+# Tipo de cada coluna padronizada
+TIPOS_COLUNAS = {
+    "lote": "str",
+    "especie": "str",
+    "categoria": "str",
+    "cultivar": "str",
+    "peneira": "str",
+    "ensaque": "str",
+    "operador": "str",
+    "observacao": "str",
+    "receita": "str",
+    "sp_total": "float",
+    "pv_total": "float",
+    "num_bat": "int",
+    "sp_bat": "float",
+    "pv_bat": "float",
+    "pms": "float",
+}
+
+# Tipo de cada campo por dosador após a renomeação
+TIPOS_CAMPOS = {
+    "nome_prod": "str",
+    "sp_rec": "float",
+    "pv_dos": "float",
+    "erro_dos": "float",
+}
+
+
+# Converte um modelo de nome de coluna em expressão regular
+def _compilar_modelo(modelo):
+    padrao = re.escape(modelo)
+    padrao = padrao.replace(re.escape("{canal}"), r"(?P<tipo>" + "|".join(UNIDADES_CANAL) + r")(?P<numero>\d{2,})")
+    padrao = padrao.replace(re.escape("{unidade}"), r"(?P<unidade>" + "|".join(UNIDADES_CANAL.values()) + r")")
+    return re.compile(padrao + r"$")
+
+
+_MODELOS_COMPILADOS = [(_compilar_modelo(modelo), campo) for modelo, campo in MAPEAMENTO_DOSADORES]
+
+# Campos por dosador na ordem em que as colunas são dispostas (sp_rec, sp_dos, pv_dos, ...)
+CAMPOS_DOSADOR = list(dict.fromkeys(campo for _, campo in MAPEAMENTO_DOSADORES))
+
+
+# Identifica a que dosador e campo pertence uma coluna; None se não for coluna de dosador
+def identificar_coluna(coluna):
+    for padrao, campo in _MODELOS_COMPILADOS:
+        encontrado = padrao.match(str(coluna))
+        if encontrado is None:
+            continue
+        tipo = encontrado.group("tipo")
+        unidade = encontrado.groupdict().get("unidade")
+        if unidade is not None and unidade != UNIDADES_CANAL[tipo]:
+            continue
+        return tipo, int(encontrado.group("numero")), campo
+    return None
+
+
+# Percorre o cabeçalho uma vez e agrupa as colunas por dosador e campo
+# Retorna {canal: {campo: [colunas]}} com os canais em ordem (ED antes de DP, por número)
+def localizar_colunas_dosadores(colunas):
+    encontrados = {}
+    for coluna in colunas:
+        identificacao = identificar_coluna(coluna)
+        if identificacao is None:
+            continue
+        tipo, numero, campo = identificacao
+        canal = f"{tipo}{str(numero).zfill(2)}"
+        encontrados.setdefault((tipo, numero, canal), {}).setdefault(campo, []).append(coluna)
+
+    ordem_tipos = list(UNIDADES_CANAL)
+    ordenados = sorted(encontrados, key=lambda chave: (ordem_tipos.index(chave[0]), chave[1]))
+    return {canal: encontrados[(tipo, numero, canal)] for tipo, numero, canal in ordenados}
+
+
+# Identificador das regras de mapeamento (muda sempre que as tabelas mudam)
+def versao_mapeamento():
+    regras = json.dumps([COLUNAS_PADRONIZADAS, UNIDADES_CANAL, MAPEAMENTO_DOSADORES,
+                         TIPOS_COLUNAS, TIPOS_CAMPOS],
+                        sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(regras.encode("utf-8")).hexdigest()[:12]
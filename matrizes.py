@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Dados de dosagem de todos os dosadores como matrizes (bateladas x dosadores).
+
+As matrizes são armazenadas em ordem Fortran: a coluna de cada dosador é
+contígua, de modo que operações por dosador e somas entre dosadores são
+chamadas únicas do NumPy, sem montar sub-DataFrames.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+@dataclass(frozen=True, eq=False)
+class MatrizesDosagem:
+    canais: list  # Nome de cada dosador (ED01, DP01, ...), na ordem das colunas
+    sufixos: list  # Sufixo das colunas de cada dosador no DataFrame (01, 02, ...)
+    sp: np.ndarray  # sp_dos (bateladas x dosadores)
+    pv: np.ndarray  # pv_dos (bateladas x dosadores)
+    erro: np.ndarray  # erro_dos (bateladas x dosadores)
+    produtos: pd.Index  # Nomes dos produtos (ordem alfabética)
+    codigos: np.ndarray  # Código do produto de cada célula em produtos; -1 sem produto
+
+    @property
+    def vazia(self):
+        return not self.canais
+
+    # Soma de todos os dosadores por batelada (valores ausentes contam como zero)
+    def total_sp(self):
+        return np.nansum(self.sp, axis=1)
+
+    def total_pv(self):
+        return np.nansum(self.pv, axis=1)
+
+    # Soma de sp_dos e pv_dos por produto, opcionalmente só para algumas bateladas (posições)
+    # Retorna DataFrame com Produto, sp_dos e pv_dos, em ordem alfabética de produto
+    def somar_por_produto(self, bateladas=None):
+        codigos, sp, pv = self.codigos, self.sp, self.pv
+        if bateladas is not None:
+            bateladas = np.asarray(bateladas, dtype=np.int64)
+            codigos, sp, pv = codigos[bateladas], sp[bateladas], pv[bateladas]
+
+        # Percorre dosador a dosador, como a tabela longa (ravel em ordem Fortran); o código + 1 põe "sem produto" na posição 0
+        posicoes = codigos.ravel(order="F") + 1
+        n = len(self.produtos) + 1
+        presentes = (np.bincount(posicoes, minlength=n) > 0)[1:]
+        somas = {
+            medida: np.bincount(posicoes, weights=np.nan_to_num(valores.ravel(order="F")), minlength=n)[1:][presentes]
+            for medida, valores in (("sp_dos", sp), ("pv_dos", pv))
+        }
+        return pd.DataFrame({"Produto": self.produtos[presentes].astype(object), **somas})
+
+
+# Matriz (bateladas x dosadores) de um campo por dosador; NaN para dosadores sem a coluna
+def matriz_campo(df, campo, sufixos):
+    matriz = np.full((len(df), len(sufixos)), np.nan, order="F")
+    for j, sufixo in enumerate(sufixos):
+        coluna = f"{campo}{sufixo}"
+        if coluna in df.columns:
+            matriz[:, j] = df[coluna].to_numpy(dtype="float64")
+    return matriz
+
+
+# Monta as matrizes a partir das colunas por dosador (nome_prodXX, sp_dosXX, pv_dosXX, erro_dosXX)
+def montar_matrizes(df, dosadores):
+    sufixos = [str(idx).zfill(2) for idx in range(1, len(dosadores) + 1)]
+    n = len(df)
+
+    # Produtos de todos os dosadores nas mesmas categorias (união em ordem alfabética)
+    colunas_produto = [f"nome_prod{sufixo}" for sufixo in sufixos]
+    presentes = [pd.Categorical(df[coluna]) for coluna in colunas_produto if coluna in df.columns]
+    produtos = (union_categoricals(presentes, sort_categories=True).categories if presentes
+                else pd.Index([], dtype=object))
+    codigos = np.full((n, len(sufixos)), -1, dtype=np.int32, order="F")
+    for j, coluna in enumerate(colunas_produto):
+        if coluna in df.columns:
+            codigos[:, j] = pd.Categorical(df[coluna], categories=produtos).codes
+
+    return MatrizesDosagem(
+        canais=list(dosadores),
+        sufixos=sufixos,
+        sp=matriz_campo(df, "sp_dos", sufixos),
+        pv=matriz_campo(df, "pv_dos", sufixos),
+        erro=matriz_campo(df, "erro_dos", sufixos),
+        produtos=produtos,
+        codigos=codigos,
+    )
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Relatório em PDF com os gráficos de todas as páginas, montado inteiramente em memória.
+
+As imagens são geradas por um Kaleido mantido aberto (um navegador com várias abas)
+em uma thread própria do processo: o navegador é iniciado na primeira exportação,
+reaproveitado pelas seguintes (de qualquer sessão) e os gráficos de um relatório são
+renderizados em paralelo nas abas. Nenhum arquivo é gravado em disco.
+
+O Chrome/Chromium vem do sistema (packages.txt); se não for encontrado, uma cópia é
+baixada pelo Kaleido na primeira exportação. Os textos usam a fonte DejaVu Sans
+(fonts-dejavu-core), que cobre acentos e símbolos fora do Latin-1.
+"""
+
+import asyncio
+import io
+import os
+import threading
+
+import kaleido
+import pandas as pd
+from choreographer.browsers.chromium import ChromeNotFoundError
+from fpdf import FPDF
+
+from derivados import calcular
+from graficos import (grafico_consumo_produto, grafico_consumo_produto_periodo, grafico_consumo_receita,
+                      grafico_pizza_producao, grafico_producao_receita, grafico_produtos_lote,
+                      grafico_semana_hora, grafico_variacao_dosagem)
+
+ABAS = 4  # Gráficos renderizados ao mesmo tempo
+LARGURA, ALTURA = 1000, 550  # Tamanho das imagens (px)
+LOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logoMomesso.png")
+PASTA_FONTES = os.environ.get("MRB_FONTES", "/usr/share/fonts/truetype/dejavu")
+FONTES = {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf"}  # Estilo -> arquivo da fonte
+
+
+# Kaleido aberto em um laço de eventos próprio, compartilhado por todas as sessões
+class Renderizador:
+    def __init__(self, abas=ABAS):
+        self.abas = abas
+        self._trava = threading.Lock()
+        self._laco = None
+        self._kaleido = None
+
+    # Laço e navegador abertos (iniciados na primeira chamada)
+    def _iniciar(self):
+        with self._trava:
+            if self._laco is None:
+                laco = asyncio.new_event_loop()
+                threading.Thread(target=laco.run_forever, name="kaleido", daemon=True).start()
+                try:
+                    self._kaleido = asyncio.run_coroutine_threadsafe(self._abrir(), laco).result()
+                except Exception:
+                    laco.call_soon_threadsafe(laco.stop)
+                    raise
+                self._laco = laco
+            return self._laco, self._kaleido
+
+    async def _abrir(self):
+        try:
+            navegador = kaleido.Kaleido(n=self.abas)
+        except ChromeNotFoundError:
+            # Sem Chrome/Chromium no sistema: baixa uma cópia (uma vez por máquina) e tenta de novo
+            await kaleido.get_chrome()
+            navegador = kaleido.Kaleido(n=self.abas)
+        await navegador.open()
+        return navegador
+
+    # Descarta o navegador e o laço que falharam; a próxima chamada abre outros
+    def _reiniciar(self, laco):
+        with self._trava:
+            if self._laco is not laco:
+                return  # Outra sessão já reiniciou
+            navegador, self._laco, self._kaleido = self._kaleido, None, None
+        try:
+            asyncio.run_coroutine_threadsafe(navegador.close(), laco).result(timeout=10)
+        except Exception:
+            pass
+        laco.call_soon_threadsafe(laco.stop)
+
+    async def _renderizar(self, navegador, figuras, opcoes):
+        return await asyncio.gather(*(navegador.calc_fig(fig, opts=opcoes) for fig in figuras))
+
+    # PNG de cada figura, na ordem recebida
+    # Se o navegador falhar (ex.: processo do Chrome encerrado), é reaberto e a renderização repetida uma vez
+    def png(self, figuras, largura=LARGURA, altura=ALTURA):
+        figuras = list(figuras)
+        opcoes = dict(format="png", width=largura, height=altura)
+        for tentativa in range(2):
+            laco, navegador = self._iniciar()
+            try:
+                return asyncio.run_coroutine_threadsafe(self._renderizar(navegador, figuras, opcoes), laco).result()
+            except Exception:
+                self._reiniciar(laco)
+                if tentativa:
+                    raise
+
+
+renderizador = Renderizador()
+
+
+# Seções do relatório (título, figuras) para o período e o lote/receita informados
+# Seções sem dados no filtro ficam de fora
+def secoes_relatorio(dataset, inicio, fim, lote=None, receita=None):
+    periodo = dict(inicio=inicio, fim=fim)
+    secoes = [("Consumo", [
+        grafico_consumo_receita(calcular(dataset, "consumo_por_receita")),
+        grafico_consumo_produto(calcular(dataset, "consumo_por_produto")),
+    ])]
+
+    if lote is not None and receita is not None:
+        selecao = dict(lote=lote, receita=receita)
+        if not calcular(dataset, "bateladas_lote", **selecao).empty:
+            secoes.append((f"Lote {lote} - {receita}", [
+                grafico_produtos_lote(calcular(dataset, "produtos_lote", **selecao)),
+            ]))
+
+    df_filtrado = calcular(dataset, "bateladas_periodo", **periodo)
+    if not df_filtrado.empty:
+        secoes.append(("Período", [
+            grafico_variacao_dosagem(calcular(dataset, "lotes_periodo", **periodo)),
+        ]))
+        producao = calcular(dataset, "producao_por_dimensao", **periodo)
+        secoes.append(("Produção", [
+            grafico_pizza_producao(producao["operador"], "operador", "Produção x Operador", "Operador"),
+            grafico_pizza_producao(producao["ensaque"], "ensaque", "Produção x Ensaque", "Ensaque"),
+            grafico_pizza_producao(producao["especie"], "especie", "Produção x Espécie", "especie"),
+            grafico_pizza_producao(producao["peneira"], "peneira", "Produção x Peneira", "Peneira"),
+            grafico_producao_receita(calcular(dataset, "producao_por_receita", **periodo)),
+            grafico_semana_hora(calcular(dataset, "producao_semana_hora", **periodo)),
+            grafico_consumo_produto_periodo(calcular(dataset, "consumo_por_produto_periodo", **periodo)),
+        ]))
+    return secoes
+
+
+# Registra a fonte Unicode no PDF e retorna o nome a usar; sem os arquivos, usa a Helvetica
+# (somente Latin-1: os demais caracteres são trocados por "?")
+def registrar_fonte(pdf):
+    caminhos = {estilo: os.path.join(PASTA_FONTES, arquivo) for estilo, arquivo in FONTES.items()}
+    if not all(os.path.isfile(caminho) for caminho in caminhos.values()):
+        return "Helvetica"
+    for estilo, caminho in caminhos.items():
+        pdf.add_font("DejaVu", estilo, caminho)
+    return "DejaVu"
+
+
+# Texto restrito ao Latin-1 (fontes padrão do PDF); os demais caracteres viram "?"
+def _latin1(texto):
+    return texto.encode("latin-1", "replace").decode("latin-1")
+
+
+# PDF (bytes) com cada seção em uma nova página, seguida das suas figuras
+def montar_pdf(secoes, titulo="Relatório de Gráficos", subtitulo=""):
+    imagens = iter(renderizador.png([fig for _, figuras in secoes for fig in figuras]))
+
+    pdf = FPDF()
+    fonte = registrar_fonte(pdf)
+    if fonte == "Helvetica":
+        titulo, subtitulo = _latin1(titulo), _latin1(subtitulo)
+        secoes = [(_latin1(titulo_secao), figuras) for titulo_secao, figuras in secoes]
+    pdf.set_auto_page_break(True, margin=15)
+    largura = pdf.epw
+    altura = largura * ALTURA / LARGURA
+    for n, (titulo_secao, figuras) in enumerate(secoes):
+        pdf.add_page()
+        if n == 0:
+            pdf.image(LOGO, w=60)
+            pdf.set_font(fonte, "B", 16)
+            pdf.cell(0, 10, titulo, new_x="LMARGIN", new_y="NEXT", align="C")
+            if subtitulo:
+                pdf.set_font(fonte, size=10)
+                pdf.cell(0, 6, subtitulo, new_x="LMARGIN", new_y="NEXT", align="C")
+            pdf.ln(4)
+        pdf.set_font(fonte, "B", 13)
+        pdf.cell(0, 10, titulo_secao, new_x="LMARGIN", new_y="NEXT")
+        for _ in figuras:
+            if pdf.get_y() + altura > pdf.page_break_trigger:
+                pdf.add_page()
+            pdf.image(io.BytesIO(next(imagens)), w=largura, h=altura)
+    return bytes(pdf.output())
+
+
+# Relatório completo do conjunto de dados
+def gerar_relatorio(dataset, inicio, fim, lote=None, receita=None):
+    subtitulo = f"Período de {pd.Timestamp(inicio):%d-%m-%Y %H:%M} a {pd.Timestamp(fim):%d-%m-%Y %H:%M}"
+    return montar_pdf(secoes_relatorio(dataset, inicio, fim, lote, receita), subtitulo=subtitulo)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Tabelas HTML das páginas, geradas coluna a coluna a partir de DataFrames numéricos.
+
+Substitui o Styler do pandas nas tabelas grandes: a formatação de cada coluna e o
+destaque de linhas são operações sobre a coluna inteira e o HTML é montado de uma vez,
+sem chamar funções Python por linha nem gerar um id e uma regra CSS por célula.
+Os estilos usam o mesmo formato de set_table_styles do Styler.
+
+Tabelas maiores que uma página ficam no servidor: busca, ordenação e paginação são
+feitas sobre o DataFrame e só as linhas da página visível são enviadas ao navegador.
+"""
+
+import html
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Estilo das tabelas Momesso
+ESTILOS = [
+    {"selector": "thead th", "props": [("font-weight", "bold"), ("text-align", "center"), ("font-size", "13px")]},
+    {"selector": "tbody td", "props": [("text-align", "center"), ("font-size", "12px")]},  # Centralizar textos
+    {"selector": "tr:nth-child(even)", "props": [("background-color", "#f9f9f9")]},  # Fundo alternado
+]
+
+# Estilo das tabelas com bordas (Resumo do Período)
+ESTILOS_BORDAS = ESTILOS + [
+    {"selector": "table", "props": [("border-collapse", "collapse"), ("width", "100%")]},  # Colapsar bordas
+    {"selector": "td, th", "props": [("border", "1px solid #ddd"), ("padding", "8px")]},  # Adicionar bordas e padding
+]
+
+COR_DESTAQUE = "lightsalmon"
+LINHAS_POR_PAGINA = 50  # Linhas enviadas ao navegador por tabela
+LIMITE_VARIACAO = 5  # Variação de dosagem tolerada (%)
+
+
+# Linhas com variação de dosagem fora da faixa de ±5% (NaN não é destacado)
+def fora_da_faixa(variacao, limite=LIMITE_VARIACAO):
+    valores = np.asarray(variacao, dtype="float64")
+    with np.errstate(invalid="ignore"):
+        return (valores < -limite) | (valores > limite)
+
+
+# Textos de uma coluna: formato do str.format para números (ex.: "{:.2f} Ton") ou do
+# strftime para datas (ex.: "{:%d-%m-%Y}"); sem formato, o valor como texto
+def _formatar(serie, formato):
+    if formato is None:
+        return serie.astype(str).map(html.escape).to_numpy(dtype=object)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.dt.strftime(formato[2:-1]).to_numpy(dtype=object)
+    return serie.map(formato.format).to_numpy(dtype=object)
+
+
+# HTML da tabela (sem índice) com as linhas marcadas em destaque pintadas de COR_DESTAQUE
+# O id identifica a tabela nos seletores CSS (deve ser único na página)
+def tabela_html(df, id_tabela, formatos=None, estilos=ESTILOS, destaque=None):
+    formatos = formatos or {}
+    seletor = f"#T_{id_tabela}"
+    regras = [
+        f"{seletor} {estilo['selector']} {{ {' '.join(f'{p}: {v};' for p, v in estilo['props'])} }}"
+        for estilo in estilos
+    ]
+    if destaque is not None:
+        regras.append(f"{seletor} tr.destaque td {{ background-color: {COR_DESTAQUE}; }}")
+
+    cabecalho = "".join(f"<th>{html.escape(str(coluna))}</th>" for coluna in df.columns)
+
+    linhas = np.full(len(df), "<tr>", dtype=object)
+    if destaque is not None:
+        linhas[np.asarray(destaque, dtype=bool)] = '<tr class="destaque">'
+    for coluna in df.columns:
+        linhas = linhas + "<td>" + _formatar(df[coluna], formatos.get(coluna)) + "</td>"
+    corpo = "</tr>".join(linhas) + "</tr>" if len(linhas) else ""
+
+    return (
+        f"<style type=\"text/css\">{' '.join(regras)}</style>"
+        f"<table id=\"T_{id_tabela}\"><thead><tr>{cabecalho}</tr></thead><tbody>{corpo}</tbody></table>"
+    )
+
+
+# Posições das linhas com o texto buscado (colunas de texto, sem diferenciar maiúsculas),
+# na ordem da coluna escolhida (estável; sem coluna, na ordem original)
+def posicoes_tabela(df, busca="", ordenar_por=None, crescente=True):
+    posicoes = np.arange(len(df))
+    if busca:
+        mascara = np.zeros(len(df), dtype=bool)
+        for coluna in df.columns:
+            if pd.api.types.is_object_dtype(df[coluna]) or pd.api.types.is_string_dtype(df[coluna]):
+                mascara |= df[coluna].astype(str).str.contains(busca, case=False, regex=False).to_numpy(dtype=bool)
+        posicoes = posicoes[mascara]
+    if ordenar_por is not None:
+        serie = df[ordenar_por].take(posicoes).reset_index(drop=True)
+        posicoes = posicoes[serie.sort_values(ascending=crescente, kind="stable").index.to_numpy()]
+    return posicoes
+
+
+# HTML da página visível da tabela, com os controles de busca, ordenação e página
+# Tabelas de uma página só são exibidas inteiras, sem controles
+def tabela_paginada(df, id_tabela, formatos=None, estilos=ESTILOS, destaque=None, linhas=LINHAS_POR_PAGINA):
+    if len(df) <= linhas:
+        return tabela_html(df, id_tabela, formatos, estilos, destaque)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    busca = col1.text_input("Buscar", key=f"{id_tabela}_busca")
+    ordenar_por = col2.selectbox(
+        "Ordenar por", [None, *df.columns], key=f"{id_tabela}_ordem",
+        format_func=lambda coluna: "Ordem padrão" if coluna is None else coluna,
+    )
+    crescente = col3.radio("Sentido", ["Crescente", "Decrescente"], key=f"{id_tabela}_sentido") == "Crescente"
+    posicoes = posicoes_tabela(df, busca.strip(), ordenar_por, crescente)
+
+    # Página dentro do novo total (a busca pode reduzir o número de páginas)
+    paginas = max(1, math.ceil(len(posicoes) / linhas))
+    chave = f"{id_tabela}_pagina"
+    if st.session_state.get(chave, 1) > paginas:
+        st.session_state[chave] = paginas
+    col1, col2 = st.columns([1, 4], vertical_alignment="bottom")
+    pagina = col1.number_input("Página", min_value=1, max_value=paginas, step=1, key=chave)
+    primeira = (pagina - 1) * linhas
+    total = len(posicoes)
+    posicoes = posicoes[primeira:primeira + linhas]
+    col2.caption(f"Página {pagina} de {paginas} - linhas {min(primeira + 1, total)} a {primeira + len(posicoes)} de {total}")
+
+    return tabela_html(
+        df.take(posicoes),
+        id_tabela,
+        formatos,
+        estilos,
+        None if destaque is None else np.asarray(destaque, dtype=bool)[posicoes],
+    )
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+Configuração dos testes: módulos do app e gerador de dados sintéticos dos benchmarks.
+"""
+
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Correções de dosagem em matrizes (ingestao.corrigir_dosagem) comparadas com o laço
+por dosador original, inclusive nas linhas de borda, e os contadores por regra.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingestao import corrigir_dosagem
+
+
+# Implementação anterior: as mesmas regras aplicadas coluna a coluna, dosador a dosador
+def corrigir_dosagem_lacos(df, dosadores):
+    df = df.copy()
+    contadores = {}
+    for idx, dosador in enumerate(dosadores, start=1):
+        sufixo = str(idx).zfill(2)
+        sp_rec_col, pv_dos_col = f"sp_rec{sufixo}", f"pv_dos{sufixo}"
+        erro_dos_col, sp_dos_col = f"erro_dos{sufixo}", f"sp_dos{sufixo}"
+        if not all(coluna in df.columns for coluna in (sp_rec_col, pv_dos_col, erro_dos_col)):
+            continue
+        contador = contadores[dosador] = {}
+
+        for coluna, regra in ((sp_rec_col, "sp_rec_em_litros"), (pv_dos_col, "pv_dos_em_litros")):
+            em_litros = df[coluna].between(0, 5)
+            contador[regra] = int((em_litros & (df[coluna] != 0)).sum())
+            df.loc[em_litros, coluna] *= 1000
+
+        if sp_dos_col not in df.columns:
+            df[sp_dos_col] = df["pv_bat"] / 100 * df[sp_rec_col]
+
+        fora = ~df[pv_dos_col].between(df[sp_dos_col] * 0.8, df[sp_dos_col] * 1.2)
+        contador["pv_dos_fora_da_faixa"] = int(fora.sum())
+        df.loc[fora, pv_dos_col] = df[sp_dos_col]
+
+        df[erro_dos_col] = pd.to_numeric(df[erro_dos_col], errors="coerce")
+        contador["erro_dos_invalido"] = int((~np.isfinite(df[erro_dos_col])).sum())
+        df[erro_dos_col] = df[erro_dos_col].replace([np.inf, -np.inf, np.nan], 0)
+
+        ajuste = df[erro_dos_col].between(-20, 20)
+        contador["pv_dos_ajustado_pelo_erro"] = int((ajuste & (df[erro_dos_col] != 0)).sum())
+        df.loc[ajuste, pv_dos_col] *= 1 + df.loc[ajuste, erro_dos_col] / 100
+    return df, contadores
+
+
+@pytest.fixture
+def bateladas():
+    rng = np.random.default_rng(8)
+    n = 200
+    pv_bat = rng.normal(500, 20, n)
+    df = pd.DataFrame({"pv_bat": pv_bat})
+    # ED01 e DP01 com sp_dos exportado; ED02 sem sp_dos (calculado a partir de pv_bat)
+    for sufixo in ("01", "02", "03"):
+        sp_rec = rng.uniform(0.05, 1.5, n)
+        sp_dos = pv_bat / 100 * sp_rec * 1000
+        erro = rng.normal(0, 8, n)
+        df[f"sp_rec{sufixo}"] = sp_rec
+        if sufixo != "02":
+            df[f"sp_dos{sufixo}"] = sp_dos
+        df[f"pv_dos{sufixo}"] = sp_dos * rng.uniform(0.7, 1.3, n)
+        df[f"erro_dos{sufixo}"] = erro
+
+    # Linhas de borda em todos os dosadores
+    for sufixo in ("01", "02", "03"):
+        sp_rec, pv_dos, erro_dos = f"sp_rec{sufixo}", f"pv_dos{sufixo}", f"erro_dos{sufixo}"
+        df.loc[0, [sp_rec, pv_dos]] = 0.0                  # Setpoint e dosagem zerados
+        df.loc[1, sp_rec] = 0.0                            # Setpoint zerado com dosagem
+        df.loc[2, erro_dos] = -7.5                         # Erro negativo dentro da faixa
+        df.loc[3, erro_dos] = -35.0                        # Erro negativo fora da faixa
+        df.loc[4, erro_dos] = np.nan                       # Erro ausente
+        df.loc[5, erro_dos] = np.inf
+        df.loc[6, pv_dos] = np.nan                         # Dosagem ausente
+        df.loc[7, sp_rec] = np.nan                         # Setpoint ausente
+        df.loc[8, [sp_rec, pv_dos]] = 5.0                  # Limite da conversão de litros
+        df.loc[9, erro_dos] = 20.0                         # Limite do ajuste pelo erro
+    return df
+
+
+def test_corrigir_dosagem_igual_ao_laco_por_dosador(bateladas):
+    dosadores = ["ED01", "ED02", "DP01"]
+    esperado, contadores_esperados = corrigir_dosagem_lacos(bateladas, dosadores)
+    obtido, contadores = corrigir_dosagem(bateladas.copy(), dosadores)
+
+    assert contadores == contadores_esperados
+    assert sorted(obtido.columns) == sorted(esperado.columns)
+    pd.testing.assert_frame_equal(obtido[esperado.columns], esperado, check_dtype=False)
+
+
+def test_erro_dos_nao_numerico_vira_zero(bateladas):
+    bateladas["erro_dos01"] = bateladas["erro_dos01"].astype(object)
+    bateladas.loc[10, "erro_dos01"] = "n/d"
+    esperado, contadores_esperados = corrigir_dosagem_lacos(bateladas, ["ED01"])
+    obtido, contadores = corrigir_dosagem(bateladas.copy(), ["ED01"])
+
+    assert contadores == contadores_esperados
+    assert contadores["ED01"]["erro_dos_invalido"] == 3  # NaN, inf e "n/d"
+    assert obtido.loc[10, "erro_dos01"] == 0
+    np.testing.assert_allclose(obtido["pv_dos01"], esperado["pv_dos01"])
+
+
+def test_dosador_sem_erro_dos_fica_sem_correcao(bateladas):
+    bateladas = bateladas.drop(columns=["erro_dos02"])
+    obtido, contadores = corrigir_dosagem(bateladas.copy(), ["ED01", "ED02", "DP01"])
+
+    assert list(contadores) == ["ED01", "DP01"]
+    pd.testing.assert_series_equal(obtido["pv_dos02"], bateladas["pv_dos02"])
+    assert "sp_dos02" not in obtido.columns
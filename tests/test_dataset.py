@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+O que as páginas leem (Dataset publicado pela carga e nós de derivados.py) é a saída
+finalizada da ingestão, e os nós batem com um groupby direto sobre as mesmas bateladas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_disco
+from dados_sinteticos import gerar_exportacao
+from dataset import Dataset
+from derivados import calcular
+from ingestao import carregar_dados, impressao_digital
+
+
+# Exportação sintética como CSV (horários em texto HH:MM:SS, como no arquivo do equipamento)
+def arquivo_csv(df, nome):
+    df = df.assign(Time=df["Time"].astype(str).str[-8:], Date=df["Date"].dt.strftime("%Y-%m-%d"))
+    return nome, df.to_csv(index=False).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def carga():
+    primeiro = gerar_exportacao(3000, seed=1)
+    segundo = gerar_exportacao(2000, seed=2)
+    # O segundo arquivo repete parte do primeiro (exportações sobrepostas)
+    segundo = pd.concat([segundo, primeiro.iloc[:300]], ignore_index=True)
+    arquivos = [arquivo_csv(primeiro, "a.csv"), arquivo_csv(segundo, "b.csv")]
+    return carregar_dados(arquivos, max_workers=1)
+
+
+@pytest.fixture(scope="module")
+def dataset(carga):
+    df, dosadores, _ = carga
+    return Dataset(df, dosadores)
+
+
+# Período de dias inteiros (respondido pelo consolidado) e com horas quebradas (pelas bateladas)
+@pytest.fixture(params=["dias", "horas"])
+def periodo(request, dataset):
+    df = dataset.df
+    inicio = df["hora_ini"].min().normalize() + pd.Timedelta(days=10)
+    fim = inicio + pd.Timedelta(days=30) - pd.Timedelta(seconds=1)
+    if request.param == "horas":
+        inicio, fim = inicio + pd.Timedelta(minutes=17), fim - pd.Timedelta(hours=5)
+    return inicio, fim
+
+
+# Bateladas do período por uma máscara simples sobre todo o DataFrame
+def bateladas(df, inicio, fim):
+    return df[(df["hora_ini"] >= inicio) & (df["hora_fim"] <= fim)]
+
+
+def test_dataset_e_a_saida_da_carga(carga, dataset):
+    df, dosadores, avisos = carga
+    assert dataset.df is df
+    assert dataset.dosadores == dosadores
+    assert ("info", "300 bateladas repetidas do arquivo b.csv foram descartadas.") in avisos
+
+    # Finalizado: sem bateladas repetidas, ordenado por início e com as colunas calculadas na carga
+    assert len(dataset) == 5000
+    assert not pd.Series(impressao_digital(dataset.df)).duplicated().any()
+    assert dataset.df["hora_ini"].is_monotonic_increasing
+    assert {"total_consumo", "total_sp", "tempo_ciclo"} <= set(dataset.df.columns)
+
+
+def test_cache_em_disco_devolve_a_mesma_carga(carga, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(cache_disco, "PASTA_CACHE", str(tmp_path))
+    df, dosadores, avisos = carga
+    cache_disco.salvar("chave", df, dosadores, avisos)
+
+    df_cache, dosadores_cache, avisos_cache = cache_disco.ler("chave")
+    pd.testing.assert_frame_equal(df_cache, df)
+    assert dosadores_cache == dosadores
+    assert avisos_cache == avisos
+
+
+def test_resumo_periodo(dataset, periodo):
+    inicio, fim = periodo
+    df = bateladas(dataset.df, inicio, fim)
+    resumo = calcular(dataset, "resumo_periodo", inicio=inicio, fim=fim)
+
+    assert resumo["num_bateladas"] == len(df)
+    assert resumo["producao"] == pytest.approx(df["pv_bat"].sum())
+    assert resumo["tempo_total"] == pytest.approx(df["tempo_ciclo"].sum())
+    assert resumo["media_bat"] == pytest.approx(df["pv_bat"].mean())
+    assert resumo["tempo_med_bat"] == pytest.approx(df["tempo_ciclo"].mean())
+    assert resumo["num_lotes"] == df["lote"].nunique()
+    assert resumo["num_receitas"] == df["receita"].nunique()
+
+
+def test_lotes_periodo(dataset, periodo):
+    inicio, fim = periodo
+    df = bateladas(dataset.df, inicio, fim)
+    esperado = df.groupby(["lote", "receita"], observed=True).agg(
+        inicio=("hora_ini", "min"),
+        fim=("hora_fim", "max"),
+        tratada=("pv_bat", "sum"),
+        bateladas=("pv_bat", "size"),
+        necessaria=("total_sp", "sum"),
+        dosada=("total_consumo", "sum"),
+    )
+    obtido = calcular(dataset, "lotes_periodo", inicio=inicio, fim=fim)
+
+    assert obtido["Início"].is_monotonic_increasing
+    obtido = obtido.set_index(["Lote", "Receita"]).loc[esperado.index]
+    assert len(obtido) == len(esperado)
+    assert (obtido["Início"] == esperado["inicio"]).all()
+    assert (obtido["Fim"] == esperado["fim"]).all()
+    assert (obtido["Núm. Bateladas"] == esperado["bateladas"]).all()
+    np.testing.assert_allclose(obtido["Qtd. Tratada"], esperado["tratada"] / 1000)
+    np.testing.assert_allclose(obtido["Qtd. Necessária"], esperado["necessaria"] / 1000)
+    np.testing.assert_allclose(obtido["Qtd. Dosada"], esperado["dosada"] / 1000)
+    np.testing.assert_allclose(
+        obtido["Variação Dosagem"], (esperado["dosada"] / esperado["necessaria"] - 1) * 100
+    )
+
+
+def test_anexar_so_os_arquivos_novos(carga):
+    primeiro = arquivo_csv(gerar_exportacao(3000, seed=1), "a.csv")
+    segundo = arquivo_csv(pd.concat([gerar_exportacao(2000, seed=2), gerar_exportacao(3000, seed=1).iloc[:300]]), "b.csv")
+    chaves = [cache_disco.chave_arquivo(*arquivo) for arquivo in (primeiro, segundo)]
+
+    df, dosadores, _ = carregar_dados([primeiro], max_workers=1)
+    historico = Dataset(df, dosadores, "a", (chaves[0],))
+    df_novo, dosadores_novos, _ = carregar_dados([segundo], max_workers=1)
+    anexado, repetidas = historico.anexar(df_novo, dosadores_novos, [chaves[1]])
+
+    assert anexado.envios == tuple(chaves)
+    assert repetidas == 300
+    df_completo, _, _ = carga
+    pd.testing.assert_series_equal(anexado.df["hora_ini"], df_completo["hora_ini"])
+    assert anexado.df["pv_bat"].sum() == pytest.approx(df_completo["pv_bat"].sum())
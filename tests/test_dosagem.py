@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+A tabela longa de dosagem é uma visão das matrizes: mesmos valores das colunas por
+dosador e mesmos somatórios por produto.
+"""
+
+import numpy as np
+
+from dados_sinteticos import gerar_exportacao
+from dataset import Dataset
+from dosagem import COLUNAS_DOSAGEM, montar_tabela_dosagem
+from ingestao import normalizar_arquivo, processar_dados
+
+
+def test_tabela_longa_e_vista_das_matrizes():
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(500, n_ed=3, n_dp=2, seed=5)))
+    dataset = Dataset(df, dosadores)
+    tabela = dataset.dosagem
+
+    assert list(tabela.columns) == COLUNAS_DOSAGEM
+    assert len(tabela) == len(df) * len(dosadores)
+    for idx, dosador in enumerate(dosadores, start=1):
+        linhas = tabela[tabela["canal"] == dosador]
+        sufixo = str(idx).zfill(2)
+        assert (linhas["batelada"].to_numpy() == np.arange(len(df))).all()
+        assert np.allclose(linhas["pv_dos"], df[f"pv_dos{sufixo}"])
+        assert (linhas["produto"].astype(str).to_numpy() == df[f"nome_prod{sufixo}"].astype(str).to_numpy()).all()
+
+    bateladas = np.arange(0, len(df), 7)
+    parcial = montar_tabela_dosagem(dataset.matrizes, bateladas)
+    somas = parcial.groupby("produto", observed=True)[["sp_dos", "pv_dos"]].sum().reset_index()
+    esperado = dataset.matrizes.somar_por_produto(bateladas)
+    assert list(somas["produto"].astype(str)) == list(esperado["Produto"].astype(str))
+    assert np.allclose(somas[["sp_dos", "pv_dos"]], esperado[["sp_dos", "pv_dos"]])
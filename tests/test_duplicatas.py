@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Bateladas repetidas (mesma chave natural) dentro de um arquivo, entre arquivos do mesmo
+envio e entre um envio anexado e o histórico: quantas são descartadas por arquivo e
+qual linha permanece (a primeira ocorrência).
+"""
+
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao
+from dataset import Dataset
+from ingestao import carregar_dados
+from test_dataset import arquivo_csv
+
+
+# Cópia de algumas bateladas com a mesma chave e outro operador (identifica a linha que ficou)
+def repetir(df, linhas):
+    return df.iloc[linhas].assign(Operador="REPETIDA")
+
+
+def operadores(df):
+    return set(df["operador"].astype(str))
+
+
+def test_repetidas_no_mesmo_arquivo():
+    df = gerar_exportacao(400, seed=6)
+    arquivo = arquivo_csv(pd.concat([df, repetir(df, slice(0, 20))], ignore_index=True), "a.csv")
+
+    carregado, _, avisos = carregar_dados([arquivo], max_workers=1)
+
+    assert len(carregado) == 400
+    assert ("info", "20 bateladas repetidas do arquivo a.csv foram descartadas.") in avisos
+    assert "REPETIDA" not in operadores(carregado)
+
+
+def test_repetidas_entre_arquivos_contadas_por_arquivo():
+    primeiro = gerar_exportacao(400, seed=6)
+    segundo = gerar_exportacao(300, seed=7)
+    # O segundo arquivo repete 30 bateladas do primeiro e 5 de si mesmo
+    segundo = pd.concat([segundo, repetir(primeiro, slice(100, 130)), repetir(segundo, slice(0, 5))],
+                        ignore_index=True)
+    arquivos = [arquivo_csv(primeiro, "a.csv"), arquivo_csv(segundo, "b.csv")]
+
+    carregado, _, avisos = carregar_dados(arquivos, max_workers=1)
+
+    assert len(carregado) == 700
+    assert [aviso for aviso in avisos if aviso[0] == "info"] == [
+        ("info", "35 bateladas repetidas do arquivo b.csv foram descartadas.")]
+    assert "REPETIDA" not in operadores(carregado)
+
+    # Na ordem inversa, as bateladas do arquivo enviado primeiro é que permanecem
+    carregado, _, avisos = carregar_dados(arquivos[::-1], max_workers=1)
+    assert len(carregado) == 700
+    assert ("info", "5 bateladas repetidas do arquivo b.csv foram descartadas.") in avisos
+    assert ("info", "30 bateladas repetidas do arquivo a.csv foram descartadas.") in avisos
+    assert (carregado["operador"] == "REPETIDA").sum() == 30
+
+
+def test_repetidas_ao_anexar_mantem_o_historico():
+    primeiro = gerar_exportacao(400, seed=6)
+    segundo = pd.concat([gerar_exportacao(300, seed=7), repetir(primeiro, slice(200, 240))], ignore_index=True)
+
+    df, dosadores, _ = carregar_dados([arquivo_csv(primeiro, "a.csv")], max_workers=1)
+    historico = Dataset(df, dosadores, "a")
+    df_novo, dosadores_novos, _ = carregar_dados([arquivo_csv(segundo, "b.csv")], max_workers=1)
+    anexado, repetidas = historico.anexar(df_novo, dosadores_novos, ["b"])
+
+    assert repetidas == 40
+    assert len(anexado) == 700
+    assert "REPETIDA" not in operadores(anexado.df)
+    assert anexado.df["hora_ini"].is_monotonic_increasing
+
+    # Reenviar o mesmo arquivo não acrescenta nada
+    reenviado, repetidas = anexado.anexar(df_novo, dosadores_novos, ["b"])
+    assert repetidas == len(df_novo)
+    assert len(reenviado) == 700
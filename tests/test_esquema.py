@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Colunas numéricas do esquema compacto com valores em texto não interrompem a carga.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dados_sinteticos import gerar_exportacao
+from esquema import aplicar_esquema
+from ingestao import carregar_dados
+from test_dataset import arquivo_csv
+
+
+def test_densidade_com_virgula_decimal_vira_nan():
+    df = gerar_exportacao(200, seed=3)
+    df["Densidade ED01"] = df["Densidade ED01"].astype(object)
+    df.loc[:9, "Densidade ED01"] = "1,05"
+    df_carregado, _, avisos = carregar_dados([arquivo_csv(df, "densidade.csv")], max_workers=1)
+
+    assert not [aviso for aviso in avisos if aviso[0] == "error"]
+    densidade = df_carregado["dens_prod01"]
+    assert densidade.dtype == np.float32
+    assert densidade.isna().sum() == 10
+    assert np.allclose(densidade.dropna(), df.loc[10:, "Densidade ED01"].astype(float))
+
+
+def test_esquema_converte_texto_numerico():
+    df = pd.DataFrame({"pms": ["150.5", "x"], "num_bat": ["1", "2"], "sp_rec01": [1.5, None]})
+    df = aplicar_esquema(df)
+    assert df["pms"].dtype == np.float32 and np.isnan(df["pms"].iloc[1])
+    assert df["num_bat"].dtype == np.int16 and df["num_bat"].tolist() == [1, 2]
+    assert df["sp_rec01"].dtype == np.float32
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Gráfico de variação de dosagem: a linha de séries longas é reduzida, mas todos os
+lotes fora da faixa continuam marcados, no início de cada lote.
+"""
+
+import numpy as np
+import pandas as pd
+
+from graficos import grafico_variacao_dosagem, reduzir_min_max
+from tabelas import fora_da_faixa
+
+
+def lotes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # Inícios irregulares: a posição do lote não é proporcional ao tempo
+    inicios = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.cumsum(rng.integers(1, 600, n)), unit="min")
+    return pd.DataFrame({
+        "Início": inicios,
+        "Lote": [f"L{i:05d}" for i in range(n)],
+        "Receita": "REC 01",
+        "Variação Dosagem": rng.normal(0, 4, n),
+    })
+
+
+def test_todos_os_lotes_fora_da_faixa_sao_marcados():
+    df = lotes(20_000)
+    fig = grafico_variacao_dosagem(df, pontos=200)
+    linha, fora = fig.data
+
+    assert len(linha.x) <= 200
+    esperado = df[fora_da_faixa(df["Variação Dosagem"].to_numpy())]
+    assert len(esperado) > 200
+    assert (pd.to_datetime(fora.x) == esperado["Início"].to_numpy()).all()
+    np.testing.assert_allclose(fora.y, esperado["Variação Dosagem"])
+    assert list(fora.customdata[:, 0]) == list(esperado["Lote"])
+
+
+def test_linha_no_inicio_de_cada_lote():
+    df = lotes(5000, seed=1)
+    fig = grafico_variacao_dosagem(df, pontos=100)
+    linha = fig.data[0]
+
+    posicoes = reduzir_min_max(df["Variação Dosagem"], 100)
+    assert (pd.to_datetime(linha.x) == df["Início"].to_numpy()[posicoes]).all()
+    assert linha.y.max() == df["Variação Dosagem"].max()
+    assert linha.y.min() == df["Variação Dosagem"].min()
+    assert fig.layout.yaxis.range[0] < df["Variação Dosagem"].min()
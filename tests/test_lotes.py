@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+Tabela do lote de todos os pares (lote, receita) em uma passagem agrupada comparada
+com o cálculo da página Lote par a par.
+"""
+
+from bench_todos_lotes import conferir, lote_a_lote
+from dados_sinteticos import gerar_exportacao
+from dataset import Dataset
+from derivados import calcular
+from ingestao import normalizar_arquivo, processar_dados
+
+
+def test_todos_os_lotes_igual_ao_lote_a_lote():
+    df, dosadores = processar_dados(normalizar_arquivo(gerar_exportacao(2000, seed=9, lotes_sequenciais=True)))
+    # Par sem produção e produto sem quantidade necessária ficam de fora nos dois cálculos
+    df.loc[df["lote"] == df["lote"].iloc[0], "pv_bat"] = 0
+    df.loc[df["lote"] == df["lote"].iloc[-1], "sp_dos01"] = 0
+    dataset = Dataset(df, dosadores)
+
+    tabela = calcular(dataset, "produtos_todos_lotes")
+
+    assert len(tabela)
+    conferir(lote_a_lote(dataset), tabela)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Variantes de cabeçalho das exportações: canais de três dígitos, ordem ED/DP, unidades
+e colunas de um dosador ausentes no arquivo.
+"""
+
+import numpy as np
+import pytest
+
+from dados_sinteticos import gerar_exportacao
+from ingestao import normalizar_arquivo, processar_dados
+from mapeamento import identificar_coluna, localizar_colunas_dosadores
+
+
+@pytest.mark.parametrize("coluna, esperado", [
+    ("SP Receita - ED01 (L)", ("ED", 1, "sp_rec")),
+    ("SP Receita ED01", ("ED", 1, "sp_rec")),
+    ("SP Receita - ED100 (L)", ("ED", 100, "sp_rec")),
+    ("PV Dosagem - DP03 (Kg)", ("DP", 3, "pv_dos")),
+    ("Erro Dosagem - DP12 (%)", ("DP", 12, "erro_dos")),
+    ("Unid_Sementes_ED02", ("ED", 2, "unid_med")),
+    ("Produto ED1", None),               # Número do canal com menos de dois dígitos
+    ("SP Receita - ED01 (Kg)", None),    # Unidade de outro tipo de dosador
+    ("SP Receita - XX01 (L)", None),
+    ("Lote", None),
+])
+def test_identificar_coluna(coluna, esperado):
+    assert identificar_coluna(coluna) == esperado
+
+
+def test_localizar_colunas_ordena_ed_antes_de_dp_por_numero():
+    colunas = ["Produto DP02", "SP Receita - DP01 (Kg)", "SP Receita - ED100 (L)", "Lote",
+               "SP Receita ED02", "SP Receita - ED02 (L)", "Produto ED100"]
+    encontrados = localizar_colunas_dosadores(colunas)
+    assert list(encontrados) == ["ED02", "ED100", "DP01", "DP02"]
+    assert encontrados["ED02"] == {"sp_rec": ["SP Receita ED02", "SP Receita - ED02 (L)"]}
+    assert encontrados["ED100"] == {"sp_rec": ["SP Receita - ED100 (L)"], "nome_prod": ["Produto ED100"]}
+    assert encontrados["DP02"] == {"nome_prod": ["Produto DP02"]}
+
+
+def test_processar_dados_com_variantes_de_cabecalho():
+    df = gerar_exportacao(300, n_ed=3, n_dp=2, seed=4)
+    # Canal de três dígitos, variante sem unidade e colunas ausentes de alguns dosadores
+    df = df.rename(columns=lambda coluna: coluna.replace("ED03", "ED100"))
+    df = df.rename(columns={"SP Receita - ED01 (L)": "SP Receita ED01"})
+    df = df.drop(columns=["Erro Dosagem - ED02 (%)", "SP Dosagem - DP01 (Kg)"])
+    # Canal só com o nome do produto e canal sem SP Receita positivo não são dosadores
+    df["Produto ED07"] = "PRODUTO 99"
+    df["SP Receita - DP09 (Kg)"] = 0.0
+    # Colunas DP antes das ED no cabeçalho
+    dp = [coluna for coluna in df.columns if "DP" in coluna]
+    df = df[dp + [coluna for coluna in df.columns if coluna not in dp]]
+    original = df.copy()
+
+    df, dosadores = processar_dados(normalizar_arquivo(df), deduplicar=False)
+
+    assert dosadores == ["ED01", "ED02", "ED100", "DP01", "DP02"]
+    assert np.allclose(df["sp_rec01"], original["SP Receita ED01"] * 1000)
+    assert (df["nome_prod03"] == original["Produto ED100"]).all()
+    assert (df["nome_prod04"] == original["Produto DP01"]).all()
+    assert not any(coluna.endswith("06") for coluna in df.columns)
+    # ED02 sem erro de dosagem fica fora das correções; o sp_dos ausente do DP01 é calculado
+    assert "erro_dos02" not in df.columns
+    assert list(df.attrs["correcoes"]) == ["ED01", "ED100", "DP01", "DP02"]
+    assert np.allclose(df["sp_dos04"], original["PV Batelada (Kg)"] / 100 * original["SP Receita - DP01 (Kg)"] * 1000)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Montagem do PDF (fonte Unicode e alternativa Latin-1) e reabertura do navegador do
+Kaleido após uma falha. As imagens vêm de um renderizador de teste, sem Chrome.
+"""
+
+import asyncio
+
+import plotly.graph_objects as go
+import pytest
+
+import relatorio
+
+with open(relatorio.LOGO, "rb") as arquivo:
+    PNG = arquivo.read()
+
+TITULO = "Lote L–01 ≥ ±5% — Produção"
+
+
+class RenderizadorFixo:
+    def png(self, figuras):
+        return [PNG for _ in figuras]
+
+
+@pytest.fixture
+def secoes(monkeypatch):
+    monkeypatch.setattr(relatorio, "renderizador", RenderizadorFixo())
+    return [(TITULO, [go.Figure(), go.Figure()]), ("Período", [go.Figure()])]
+
+
+def test_pdf_com_fonte_unicode(secoes):
+    if relatorio.registrar_fonte(relatorio.FPDF()) != "DejaVu":
+        pytest.skip("fonte DejaVu Sans não instalada")
+    pdf = relatorio.montar_pdf(secoes, subtitulo="Período de 01-01-2024 a 31-01-2024")
+    assert pdf.startswith(b"%PDF")
+    assert b"DejaVu" in pdf
+
+
+def test_pdf_sem_a_fonte_usa_latin1(secoes, monkeypatch, tmp_path):
+    monkeypatch.setattr(relatorio, "PASTA_FONTES", str(tmp_path))
+    pdf = relatorio.montar_pdf(secoes)
+    assert pdf.startswith(b"%PDF")
+    assert b"Helvetica" in pdf
+
+
+# Navegador de teste: a primeira renderização falha como um Chrome encerrado
+class NavegadorFalho:
+    abertos = 0
+
+    def __init__(self):
+        NavegadorFalho.abertos += 1
+        self.fechado = False
+
+    async def calc_fig(self, fig, opts):
+        if NavegadorFalho.abertos == 1:
+            raise RuntimeError("navegador encerrado")
+        return PNG
+
+    async def close(self):
+        self.fechado = True
+
+
+class RenderizadorTeste(relatorio.Renderizador):
+    async def _abrir(self):
+        return NavegadorFalho()
+
+
+def test_renderizador_reabre_o_navegador_apos_falha():
+    renderizador = RenderizadorTeste()
+    assert renderizador.png([go.Figure(), go.Figure()]) == [PNG, PNG]
+    assert NavegadorFalho.abertos == 2
+
+    # O navegador reaberto continua em uso nas chamadas seguintes
+    laco, navegador = renderizador._iniciar()
+    assert renderizador.png([go.Figure()]) == [PNG]
+    assert renderizador._iniciar() == (laco, navegador)
+    asyncio.run_coroutine_threadsafe(navegador.close(), laco).result()
+    laco.call_soon_threadsafe(laco.stop)